@@ -0,0 +1,224 @@
+import copy
+import datetime
+import json
+import platform
+import random
+import statistics
+import subprocess
+import time
+
+import click
+from src.core.logic.batch_selector import selection_rule_first, selection_rule_long, selection_rule_sav, selection_rule_short
+from src.core.logic.batch_tour_length_calculator import calculate_tour_length_s_shape_routing, sort_and_transform_batch_s_shape_routing
+from src.core.logic.batch_tour_length_minimizer import create_start_batches, iterated_local_search, local_search_shift, local_search_swap, perturbation_phase
+from src.core.logic.join_item_information import load_item_location_index
+from src.core.logic.local_search_control import create_local_search_settings
+from src.vars import shared_variables
+
+
+def parse_integer_list(ctx, param, value):
+    '''
+    Parse a comma separated list of integers given as a command line option
+
+    :param ctx: Click context
+    :param param: Click parameter
+    :param value: Comma separated list
+    :return: List of integers
+    '''
+    return [int(element) for element in value.split(',') if element]
+
+
+def create_instance(warehouse_layout_path, seed, open_orders, items_per_order, aisle_share):
+    '''
+    Create a reproducible benchmark instance out of the items of a warehouse layout
+
+    :param warehouse_layout_path: Path to the warehouse layout
+    :param seed: Seed of the random number generator
+    :param open_orders: Amount of orders
+    :param items_per_order: Maximum amount of items per order, every order gets between one and this amount of items
+    :param aisle_share: Share of the warehouse layout in x direction the items are taken from, to vary the layout size
+    :return: The orders and the warehouse layout of the instance
+    '''
+    item_location_index = load_item_location_index(warehouse_layout_path)
+    # Restrict the layout to the given share of its x positions
+    max_x_position = round(item_location_index['max_x_position'] * aisle_share)
+    positions = sorted((item_id, position) for item_id, position in item_location_index['positions'].items() if position[0] <= max_x_position)
+    generator = random.Random(seed)
+    orders = []
+    for order_index in range(open_orders):
+        items = []
+        for item_id, (abs_x_position, abs_y_position, abs_z_position) in generator.sample(positions, generator.randint(1, items_per_order)):
+            items.append({'item_id': item_id, 'abs_x_position': abs_x_position, 'abs_y_position': abs_y_position, 'abs_z_position': abs_z_position})
+        orders.append({'order_id': f'order-{order_index}', 'arrival_time': float(order_index), 'items': items})
+    warehouse_layout = {
+        'max_x_position': max(position[0] for _, position in positions),
+        'max_y_position': item_location_index['max_y_position'],
+        'max_z_position': item_location_index['max_z_position'],
+    }
+    return orders, warehouse_layout
+
+
+def measure(function, repeats):
+    '''
+    Measure the runtime of a function
+
+    :param function: Function without arguments to measure, it returns the solution quality or None
+    :param repeats: Amount of measurements
+    :return: Dictionary containing the median and the minimum runtime in seconds and the solution quality of the last run
+    '''
+    runtimes = []
+    quality = None
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        quality = function()
+        runtimes.append(time.perf_counter() - start_time)
+    return {'median_seconds': statistics.median(runtimes), 'min_seconds': min(runtimes), 'quality': quality}
+
+
+def total_tour_length(batches, warehouse_layout):
+    '''
+    Calculate the total tour length of a list of batches
+
+    :param batches: List of batches
+    :param warehouse_layout: Dictionary containing the warehouse layout information
+    :return: Total tour length
+    '''
+    return sum(calculate_tour_length_s_shape_routing(batch, warehouse_layout)[0] for batch in batches)
+
+
+def benchmark_instance(orders, warehouse_layout, max_batch_size, repeats, time_limit, local_search_max_orders, neighborhood_size):
+    '''
+    Run all benchmarks on one instance
+
+    :param orders: List of orders
+    :param warehouse_layout: Dictionary containing the warehouse layout information
+    :param max_batch_size: Maximum batch size
+    :param repeats: Amount of measurements per benchmark
+    :param time_limit: Time limit of the iterated local search
+    :param local_search_max_orders: Largest amount of orders the local searches and the iterated local search are measured for, None to measure them for every amount
+    :param neighborhood_size: Partner batches per order of the local searches with candidate lists
+    :return: Dictionary containing the results per benchmark
+    '''
+    results = {}
+    batches = create_start_batches(orders, max_batch_size)
+    largest_batch = max(batches, key=lambda batch: sum(len(order['items']) for order in batch['orders']))
+
+    # Routing of a single batch and of all batches
+    results['calculate_tour_length_s_shape_routing'] = measure(lambda: total_tour_length(batches, warehouse_layout), repeats)
+    results['calculate_tour_length_s_shape_routing_aisle_summary'] = measure(lambda: sum(calculate_tour_length_s_shape_routing(batch, warehouse_layout, return_sorted_batch=False)[0] for batch in batches), repeats)
+    results['sort_and_transform_batch_s_shape_routing'] = measure(lambda: len(sort_and_transform_batch_s_shape_routing(largest_batch)), repeats)
+
+    # Operators of the iterated local search, all of them start from the same seed and need at least two batches
+    if (local_search_max_orders is None or len(orders) <= local_search_max_orders) and len(batches) > 1:
+        results['local_search_swap'] = measure(lambda: total_tour_length(local_search_swap(copy.deepcopy(batches), max_batch_size, warehouse_layout), warehouse_layout), repeats)
+        results['local_search_shift'] = measure(lambda: total_tour_length(local_search_shift(copy.deepcopy(batches), max_batch_size, warehouse_layout), warehouse_layout), repeats)
+        # The same operators restricted to the candidate lists, their quality is compared with the full scan above
+        local_search_settings = create_local_search_settings({'neighborhood_size': neighborhood_size})
+        results['local_search_swap_candidates'] = measure(lambda: total_tour_length(local_search_swap(copy.deepcopy(batches), max_batch_size, warehouse_layout, local_search_settings), warehouse_layout), repeats)
+        results['local_search_shift_candidates'] = measure(lambda: total_tour_length(local_search_shift(copy.deepcopy(batches), max_batch_size, warehouse_layout, local_search_settings), warehouse_layout), repeats)
+        random.seed(0)
+        results['perturbation_phase'] = measure(lambda: total_tour_length(perturbation_phase(batches, max_batch_size, 0.5), warehouse_layout), repeats)
+        random.seed(0)
+        results['iterated_local_search'] = measure(lambda: total_tour_length(iterated_local_search(copy.deepcopy(batches), max_batch_size, warehouse_layout, None, 0.5, 0.5, time_limit, time.time() + time_limit), warehouse_layout), 1)
+
+    # Selection rules
+    results['selection_rule_first'] = measure(lambda: len(selection_rule_first(copy.deepcopy(batches))), repeats)
+    results['selection_rule_short'] = measure(lambda: len(selection_rule_short(copy.deepcopy(batches), warehouse_layout)), repeats)
+    results['selection_rule_long'] = measure(lambda: len(selection_rule_long(copy.deepcopy(batches), warehouse_layout)), repeats)
+    results['selection_rule_sav'] = measure(lambda: len(selection_rule_sav(copy.deepcopy(batches), warehouse_layout)), repeats)
+    return results
+
+
+def get_git_commit():
+    '''
+    Get the current git commit, so that results of different commits can be compared
+
+    :return: Commit hash or None if git is not available
+    '''
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare_results(results, baseline, tolerance):
+    '''
+    Compare the results with the results of a former run and list all regressions
+
+    :param results: Results of the current run
+    :param baseline: Results of the former run
+    :param tolerance: Allowed relative increase of runtime and tour length
+    :return: List of regressions as strings
+    '''
+    regressions = []
+    baseline_cases = {json.dumps(case['parameters'], sort_keys=True): case['benchmarks'] for case in baseline['cases']}
+    for case in results['cases']:
+        baseline_benchmarks = baseline_cases.get(json.dumps(case['parameters'], sort_keys=True))
+        if baseline_benchmarks is None:
+            continue
+        for name, result in case['benchmarks'].items():
+            baseline_result = baseline_benchmarks.get(name)
+            if baseline_result is None:
+                continue
+            if result['median_seconds'] > baseline_result['median_seconds'] * (1 + tolerance):
+                regressions.append(f"{name} {case['parameters']}: runtime {baseline_result['median_seconds']:.6f}s -> {result['median_seconds']:.6f}s")
+            if name in ('local_search_swap', 'local_search_shift', 'local_search_swap_candidates', 'local_search_shift_candidates', 'iterated_local_search') and result['quality'] > baseline_result['quality'] * (1 + tolerance):
+                regressions.append(f"{name} {case['parameters']}: tour length {baseline_result['quality']} -> {result['quality']}")
+    return regressions
+
+
+@click.command()
+@click.option('--warehouse-layout-path', default='tests/data/warehouse_positions.csv', help='Path to the warehouse layout [.csv].')
+@click.option('--output', default='benchmark_results.json', help='Path of the JSON file the results are written to.')
+@click.option('--open-orders', default='10,50,100,1000', callback=parse_integer_list, help='Comma separated amounts of open orders.')
+@click.option('--items-per-order', default='3,5', callback=parse_integer_list, help='Comma separated maximum amounts of items per order.')
+@click.option('--max-batch-sizes', default='15,30', callback=parse_integer_list, help='Comma separated maximum batch sizes.')
+@click.option('--aisle-shares', default='0.5,1.0', help='Comma separated shares of the layout in x direction.')
+@click.option('--seed', default=42, help='Seed of the generated instances.')
+@click.option('--repeats', default=3, help='Measurements per benchmark.')
+@click.option('--time-limit', default=0.5, help='Time limit of the iterated local search.')
+@click.option('--local-search-max-orders', type=int, default=None, help='Largest amount of open orders the local searches are measured for, every amount of the sweep if not given.')
+@click.option('--neighborhood-size', default=3, help='Partner batches per order of the local searches with candidate lists.')
+@click.option('--compare', 'baseline_path', default=None, help='Results of a former run to compare with.')
+@click.option('--tolerance', default=0.1, help='Allowed relative regression when comparing.')
+def main(warehouse_layout_path, output, open_orders, items_per_order, max_batch_sizes, aisle_shares, seed, repeats, time_limit, local_search_max_orders, neighborhood_size, baseline_path, tolerance):
+    '''
+    Run the benchmark suite and write the results to a JSON file
+    '''
+    # The selection rule SAV and the release formula read the tour length units per second from the shared variables
+    shared_variables.variables.setdefault('tour_length_units_per_second', 20)
+    results = {
+        'commit': get_git_commit(),
+        'created': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'cases': [],
+    }
+    for amount_of_orders in open_orders:
+        for maximum_items in items_per_order:
+            for max_batch_size in max_batch_sizes:
+                for aisle_share in [float(share) for share in aisle_shares.split(',') if share]:
+                    parameters = {'open_orders': amount_of_orders, 'items_per_order': maximum_items, 'max_batch_size': max_batch_size, 'aisle_share': aisle_share, 'seed': seed}
+                    click.echo(f'Running {parameters}')
+                    orders, warehouse_layout = create_instance(warehouse_layout_path, seed, amount_of_orders, min(maximum_items, max_batch_size), aisle_share)
+                    benchmarks = benchmark_instance(orders, warehouse_layout, max_batch_size, repeats, time_limit, local_search_max_orders, neighborhood_size)
+                    results['cases'].append({'parameters': parameters, 'benchmarks': benchmarks})
+
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=2)
+    click.echo(f'Results written to {output}')
+
+    # Compare the results with a former run
+    if baseline_path:
+        with open(baseline_path, 'r') as file:
+            baseline = json.load(file)
+        regressions = compare_results(results, baseline, tolerance)
+        for regression in regressions:
+            click.secho(regression, fg='red')
+        if regressions:
+            raise SystemExit(1)
+        click.secho('No regressions found.', fg='green')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+
+import click
+from benchmarks.benchmark_suite import get_git_commit
+
+# Modules which are only imported on demand, they must not show up while importing an entry point
+lazy_modules = ['pandas', 'InquirerPy', 'keyboard', 'tabulate']
+
+
+def parse_import_time(stderr):
+    '''
+    Parse the output of python -X importtime
+
+    :param stderr: Standard error of the interpreter run with -X importtime
+    :return: Dictionary containing the cumulative import time in microseconds per module
+    '''
+    import_times = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        _, cumulative_time, module = line.split('|')
+        import_times[module.strip()] = int(cumulative_time)
+    return import_times
+
+
+def measure_import_time(module):
+    '''
+    Import a module in a fresh interpreter and record the import times of all modules it pulls in
+
+    :param module: Name of the module to import
+    :return: Dictionary containing the cumulative import time in microseconds per module
+    '''
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'], capture_output=True, text=True)
+    if process.returncode != 0:
+        raise click.ClickException(f'Importing {module} failed:\n{process.stderr.strip().splitlines()[-1]}')
+    return parse_import_time(process.stderr)
+
+
+def benchmark_module(module, repeats, top):
+    '''
+    Measure the import time of a module several times
+
+    :param module: Name of the module to import
+    :param repeats: Amount of measurements
+    :param top: Amount of the slowest imported modules to report
+    :return: Dictionary containing the median and the minimum import time in seconds, the slowest imported modules and the lazy modules which were imported anyway
+    '''
+    runtimes = []
+    import_times = {}
+    for _ in range(repeats):
+        import_times = measure_import_time(module)
+        runtimes.append(import_times.get(module, 0) / 1e6)
+    # The slowest modules of the last run, without the module itself
+    slowest_modules = sorted(((name, time) for name, time in import_times.items() if name != module), key=lambda entry: entry[1], reverse=True)[:top]
+    return {
+        'median_seconds': statistics.median(runtimes),
+        'min_seconds': min(runtimes),
+        'slowest_modules': {name: time / 1e6 for name, time in slowest_modules},
+        'eagerly_imported_lazy_modules': [name for name in lazy_modules if name in import_times],
+    }
+
+
+def compare_results(results, baseline, tolerance):
+    '''
+    Compare the results with the results of a former run and list all regressions
+
+    :param results: Results of the current run
+    :param baseline: Results of the former run
+    :param tolerance: Allowed relative increase of the import time
+    :return: List of regressions as strings
+    '''
+    regressions = []
+    for module, result in results['modules'].items():
+        if result['eagerly_imported_lazy_modules']:
+            regressions.append(f"{module}: imports {', '.join(result['eagerly_imported_lazy_modules'])} at startup")
+        baseline_result = baseline['modules'].get(module)
+        if baseline_result is None:
+            continue
+        if result['median_seconds'] > baseline_result['median_seconds'] * (1 + tolerance):
+            regressions.append(f"{module}: import time {baseline_result['median_seconds']:.4f}s -> {result['median_seconds']:.4f}s")
+    return regressions
+
+
+@click.command()
+@click.option('--modules', default='src.main,src.headless,src.core.simulator', help='Comma separated entry points to import.')
+@click.option('--output', default='startup_results.json', help='Path of the JSON file the results are written to.')
+@click.option('--repeats', default=5, help='Measurements per entry point.')
+@click.option('--top', default=10, help='Amount of the slowest imported modules to report per entry point.')
+@click.option('--compare', 'baseline_path', default=None, help='Results of a former run to compare with.')
+@click.option('--tolerance', default=0.2, help='Allowed relative regression when comparing.')
+def main(modules, output, repeats, top, baseline_path, tolerance):
+    '''
+    Measure the startup time of the entry points with python -X importtime and write the results to a JSON file
+    '''
+    results = {
+        'commit': get_git_commit(),
+        'created': datetime.datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'modules': {},
+    }
+    for module in [module for module in modules.split(',') if module]:
+        result = benchmark_module(module, repeats, top)
+        results['modules'][module] = result
+        click.echo(f"{module}: {result['median_seconds'] * 1000:.1f} ms")
+
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=2)
+    click.echo(f'Results written to {output}')
+
+    # Compare the results with a former run, an eagerly imported lazy module is always a regression
+    baseline = {'modules': {}}
+    if baseline_path:
+        with open(baseline_path, 'r') as file:
+            baseline = json.load(file)
+    regressions = compare_results(results, baseline, tolerance)
+    for regression in regressions:
+        click.secho(regression, fg='red')
+    if regressions:
+        raise SystemExit(1)
+    if baseline_path:
+        click.secho('No regressions found.', fg='green')
+
+
+if __name__ == '__main__':
+    main()
@@ -11,7 +11,7 @@ setup(
     install_requires=[
         'click==8.1.7',
         'inquirerpy==0.3.4',
-        'pandas==2.2.2',
+        'numpy==1.26.4',
         'tabulate==0.9.0',
         'keyboard==0.13.5',
     ],
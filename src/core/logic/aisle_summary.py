@@ -0,0 +1,83 @@
+import heapq
+import math
+
+from src.core.logic.routing_strategies import calculate_tour_length_from_aisle_summary
+
+
+def create_order_aisle_summary(order, item_aisles=None):
+    '''
+    This function creates the aisle summary of an order, which is everything the routing needs to know about its items.
+    The x-coordinates are transformed into aisles the same way as in the S-Shape routing.
+
+    :param order: An order containing a list of items with their absolute positions.
+    :param item_aisles: The aisles of the items in the order of the items, e.g. from a compiled layout, None to transform the x-coordinates.
+    :return: A tuple of (aisle, lowest y-coordinate, highest y-coordinate) entries sorted by the aisle.
+    '''
+    aisles = {}
+    for index, item in enumerate(order['items']):
+        # Divide the x-coordinate by 2 and round up to the nearest integer to transform the x-coordinate into corresponding aisles
+        aisle = item_aisles[index] if item_aisles is not None else math.ceil(item['abs_x_position'] / 2)
+        y_position = item['abs_y_position']
+        if aisle in aisles:
+            min_y, max_y = aisles[aisle]
+            aisles[aisle] = (min(min_y, y_position), max(max_y, y_position))
+        else:
+            aisles[aisle] = (y_position, y_position)
+    return tuple((aisle, min_y, max_y) for aisle, (min_y, max_y) in sorted(aisles.items()))
+
+
+def get_order_aisle_summary(order):
+    '''
+    This function returns the aisle summary attached to an order and attaches it first, if the order has been enriched without it.
+
+    :param order: An order containing a list of items with their absolute positions.
+    :return: The aisle summary of the order.
+    '''
+    aisle_summary = order.get('aisle_summary')
+    if aisle_summary is None:
+        aisle_summary = order['aisle_summary'] = create_order_aisle_summary(order)
+    return aisle_summary
+
+
+def merge_aisle_summaries(aisle_summaries):
+    '''
+    This function merges the aisle summaries of several orders into the aisle summary of their batch.
+    As every summary is sorted by the aisle, the merge only walks once over all summary entries.
+
+    :param aisle_summaries: A list of aisle summaries.
+    :return: The merged aisle summary as a list of (aisle, lowest y-coordinate, highest y-coordinate) entries sorted by the aisle.
+    '''
+    merged_summary = []
+    for aisle, min_y, max_y in heapq.merge(*aisle_summaries):
+        if merged_summary and merged_summary[-1][0] == aisle:
+            _, merged_min_y, merged_max_y = merged_summary[-1]
+            merged_summary[-1] = (aisle, min(merged_min_y, min_y), max(merged_max_y, max_y))
+        else:
+            merged_summary.append((aisle, min_y, max_y))
+    return merged_summary
+
+
+def create_batch_aisle_summary(batch):
+    '''
+    This function creates the aisle summary of a batch out of the aisle summaries of its orders.
+
+    :param batch: A dictionary containing the orders of the batch.
+    :return: The aisle summary of the batch.
+    '''
+    return merge_aisle_summaries([get_order_aisle_summary(order) for order in batch['orders']])
+
+
+def get_single_order_tour_length(order, warehouse_layout):
+    '''
+    This function returns the tour length of an order picked on its own, its single service time in warehouse units.
+    The tour length is stored with the order together with the layout it was calculated for, so it is only calculated again if the layout or the routing strategy changes.
+
+    :param order: An order containing a list of items with their absolute positions.
+    :param warehouse_layout: A dictionary containing the warehouse layout information and optionally the routing strategy.
+    :return: The tour length of the order.
+    '''
+    layout = tuple(sorted(warehouse_layout.items()))
+    if order.get('single_order_tour_length') is None or order.get('single_order_tour_length_layout') != layout:
+        order['single_order_tour_length'] = calculate_tour_length_from_aisle_summary(get_order_aisle_summary(order), warehouse_layout)
+        order['single_order_tour_length_layout'] = layout
+    return order['single_order_tour_length']
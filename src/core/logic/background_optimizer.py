@@ -0,0 +1,109 @@
+import copy
+import threading
+
+import click
+from src.core.logic.batch_tour_length_minimizer import local_search_phase, perturbation_phase
+from src.core.logic.batch_tour_length_vectorized import calculate_tour_lengths_batched
+
+
+class BackgroundOptimizer(threading.Thread):
+    '''
+    Class for an anytime optimizer, which improves the open batches in the background while the picker is on tour.
+    It runs the perturbation and local search phase of the iterated local search without a time limit, until it is asked to stop.
+    The best solution found so far can be read at any time.
+    '''
+    def __init__(self, batches, max_batch_size, warehouse_layout, rearrangement_parameter, threshold_parameter, local_search_settings=None):
+        '''
+        Constructor of the background optimizer
+
+        :param batches: A list of batches to optimize.
+        :param max_batch_size: The maximum size of orders a batch can contain.
+        :param warehouse_layout: A dictionary containing the warehouse layout information.
+        :param rearrangement_parameter: A constant between [0;1] which determines the amount of perturbation.
+        :param threshold_parameter: A constant between [0;1] which determines the threshold to accept a worse solution as the new incumbent.
+        :param local_search_settings: A dictionary containing the local search settings, None for the full scan.
+        '''
+        # Call the constructor of the parent class, the thread must not keep the program alive
+        super().__init__(daemon=True)
+        # Set the parameters
+        self.max_batch_size = max_batch_size
+        self.warehouse_layout = warehouse_layout
+        self.rearrangement_parameter = rearrangement_parameter
+        self.threshold_parameter = threshold_parameter
+        self.local_search_settings = local_search_settings
+        # Initialize the best solution with the given batches
+        self.best_batches = copy.deepcopy([batch for batch in batches if batch['orders']])
+        self.best_tour_length = sum(calculate_tour_lengths_batched(self.best_batches, warehouse_layout))
+        self.initial_tour_length = self.best_tour_length
+        # Initialize the statistics
+        self.iterations = 0
+        # Event to stop the optimizer cooperatively
+        self.stop_event = threading.Event()
+        # Lock to read the best solution while the optimizer is running
+        self.lock = threading.Lock()
+
+
+    def run(self):
+        '''
+        Run method of the background optimizer
+        '''
+        try:
+            # Start from a local optimum of the given batches
+            s_incumbent = local_search_phase(copy.deepcopy(self.best_batches), self.max_batch_size, self.warehouse_layout, stop_event=self.stop_event, local_search_settings=self.local_search_settings)
+            # The shift operator can empty batches, which the perturbation phase can not handle
+            s_incumbent = [batch for batch in s_incumbent if batch['orders']]
+            d_s_incumbent = self.update_best_solution(s_incumbent)
+
+            # Improve the solution until the optimizer is asked to stop
+            while not self.stop_event.is_set() and len(s_incumbent) > 1:
+                # Apply the perturbation phase and the local search phase
+                s = perturbation_phase(s_incumbent, self.max_batch_size, self.rearrangement_parameter)
+                s = local_search_phase(s, self.max_batch_size, self.warehouse_layout, stop_event=self.stop_event, local_search_settings=self.local_search_settings)
+                s = [batch for batch in s if batch['orders']]
+                d_s = self.update_best_solution(s)
+                self.iterations += 1
+                # Accept the new solution as incumbent if it is not worse than the threshold, so that the search does not get stuck
+                if d_s - d_s_incumbent < self.threshold_parameter * d_s_incumbent:
+                    s_incumbent = s
+                    d_s_incumbent = d_s
+        # Catch exceptions, the best solution found so far stays valid
+        except Exception as e:
+            click.secho(f'BackgroundOptimizer encountered an error: {e}', fg='red')
+
+
+    def update_best_solution(self, batches):
+        '''
+        Store the batches as the best solution if they are shorter than the best solution found so far
+
+        :param batches: A list of batches.
+        :return: The total tour length of the batches.
+        '''
+        tour_length = sum(calculate_tour_lengths_batched(batches, self.warehouse_layout))
+        if tour_length < self.best_tour_length:
+            best_batches = copy.deepcopy(batches)
+            with self.lock:
+                self.best_batches = best_batches
+                self.best_tour_length = tour_length
+        return tour_length
+
+
+    def get_best_solution(self):
+        '''
+        Get the best solution found so far, without waiting for the optimizer
+
+        :return: A copy of the best batches and their total tour length.
+        '''
+        with self.lock:
+            return copy.deepcopy(self.best_batches), self.best_tour_length
+
+
+    def stop(self):
+        '''
+        Ask the optimizer to stop and wait for it, the local search checks the stop event after every evaluated move
+
+        :return: A copy of the best batches and their total tour length.
+        '''
+        self.stop_event.set()
+        if self.is_alive():
+            self.join()
+        return self.get_best_solution()
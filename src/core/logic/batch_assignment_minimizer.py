@@ -0,0 +1,600 @@
+import random
+import time
+from collections import Counter
+
+from src.core.logic import instrumentation
+from src.core.logic.batch_tour_length_minimizer import generate_unique_id
+from src.core.logic.candidate_lists import create_candidate_lists
+from src.core.logic.local_search_control import create_search_budget, default_local_search_settings, get_candidate_scan_order, get_earliest_deadline, get_scan_order
+from src.core.logic.move_evaluator import (
+    add_order_to_batch_profile, calculate_tour_length_of_batch_profile, create_batch_profile, create_order_profile,
+    evaluate_shift, evaluate_swap, remove_order_from_batch_profile
+)
+from src.core.logic.routing_strategies import get_routing_strategy
+
+
+class AssignmentSolution:
+    '''
+    Class for a batching solution of the adapted Iterated Local Search Algorithm by Henn, stored as an order to batch assignment vector.
+    Every batch keeps its order indices, item count, aisle profile and tour length. Copying a solution only copies these lists,
+    the per batch structures are shared until one of the solutions changes the batch (copy on write).
+    '''
+    def __init__(self, problem, assignment, batch_orders, batch_sizes, batch_profiles, batch_tour_lengths, batch_ids):
+        '''
+        Constructor of the assignment solution
+
+        :param problem: Dictionary containing the orders, their sizes and profiles, the maximum batch size and the maximum y-coordinate.
+        :param assignment: List containing the batch index of every order.
+        :param batch_orders: List containing the order indices of every batch.
+        :param batch_sizes: List containing the amount of items of every batch.
+        :param batch_profiles: List containing the aisle profile of every batch.
+        :param batch_tour_lengths: List containing the tour length of every batch.
+        :param batch_ids: List containing the batch id of every batch.
+        '''
+        self.problem = problem
+        self.assignment = assignment
+        self.batch_orders = batch_orders
+        self.batch_sizes = batch_sizes
+        self.batch_profiles = batch_profiles
+        self.batch_tour_lengths = batch_tour_lengths
+        self.batch_ids = batch_ids
+        # Batches whose order list and profile are not shared with another solution
+        self.owned_batches = set(range(len(batch_orders)))
+
+
+    @classmethod
+    def from_batches(cls, batches, max_batch_size, warehouse_layout):
+        '''
+        Create an assignment solution from a list of batch dictionaries
+
+        :param batches: A list of batches containing their orders.
+        :param max_batch_size: The maximum size of orders a batch can contain.
+        :param warehouse_layout: A dictionary containing the warehouse layout information.
+        :return: The assignment solution.
+        '''
+        orders = [order for batch in batches for order in batch['orders']]
+        max_y_position = warehouse_layout['max_y_position']
+        routing_strategy = get_routing_strategy(warehouse_layout)
+        problem = {
+            'orders': orders,
+            'order_sizes': [len(order['items']) for order in orders],
+            'order_profiles': [create_order_profile(order, routing_strategy) for order in orders],
+            'max_batch_size': max_batch_size,
+            'max_y_position': max_y_position,
+            'routing_strategy': routing_strategy,
+        }
+        assignment = []
+        batch_orders = []
+        for batch_index, batch in enumerate(batches):
+            first_order_index = len(assignment)
+            assignment.extend([batch_index] * len(batch['orders']))
+            batch_orders.append(list(range(first_order_index, len(assignment))))
+        batch_sizes = [sum(problem['order_sizes'][order_index] for order_index in order_indices) for order_indices in batch_orders]
+        batch_profiles = [create_batch_profile([problem['order_profiles'][order_index] for order_index in order_indices]) for order_indices in batch_orders]
+        batch_tour_lengths = [calculate_tour_length_of_batch_profile(batch_profile, max_y_position, routing_strategy) for batch_profile in batch_profiles]
+        batch_ids = [batch.get('batch_id') or generate_unique_id() for batch in batches]
+        return cls(problem, assignment, batch_orders, batch_sizes, batch_profiles, batch_tour_lengths, batch_ids)
+
+
+    def copy(self):
+        '''
+        Copy the solution. Only the lists are copied, the per batch structures are shared with the copy.
+
+        :return: The copied solution.
+        '''
+        # After copying, no solution owns its batches anymore
+        self.owned_batches = set()
+        solution = AssignmentSolution(self.problem, self.assignment.copy(), self.batch_orders.copy(), self.batch_sizes.copy(), self.batch_profiles.copy(), self.batch_tour_lengths.copy(), self.batch_ids.copy())
+        solution.owned_batches = set()
+        return solution
+
+
+    def own_batch(self, batch_index):
+        '''
+        Copy the order list and the profile of a batch before changing it, if they are shared with another solution
+
+        :param batch_index: Index of the batch to change.
+        '''
+        if batch_index not in self.owned_batches:
+            self.batch_orders[batch_index] = list(self.batch_orders[batch_index])
+            self.batch_profiles[batch_index] = {aisle: Counter(aisle_counter) for aisle, aisle_counter in self.batch_profiles[batch_index].items()}
+            self.owned_batches.add(batch_index)
+
+
+    def add_batch(self):
+        '''
+        Add an empty batch to the solution
+
+        :return: Index of the new batch.
+        '''
+        self.batch_orders.append([])
+        self.batch_sizes.append(0)
+        self.batch_profiles.append({})
+        self.batch_tour_lengths.append(0)
+        self.batch_ids.append(generate_unique_id())
+        self.owned_batches.add(len(self.batch_orders) - 1)
+        return len(self.batch_orders) - 1
+
+
+    def remove_order(self, batch_index, order_index):
+        '''
+        Remove an order from its batch without updating the tour length
+
+        :param batch_index: Index of the batch containing the order.
+        :param order_index: Index of the order.
+        '''
+        self.own_batch(batch_index)
+        self.batch_orders[batch_index].remove(order_index)
+        self.batch_sizes[batch_index] -= self.problem['order_sizes'][order_index]
+        remove_order_from_batch_profile(self.batch_profiles[batch_index], self.problem['order_profiles'][order_index])
+
+
+    def insert_order(self, batch_index, order_index, position=None):
+        '''
+        Insert an order into a batch without updating the tour length
+
+        :param batch_index: Index of the batch to insert the order into.
+        :param order_index: Index of the order.
+        :param position: Position of the order inside the batch, the order is appended if no position is given.
+        '''
+        self.own_batch(batch_index)
+        if position is None:
+            self.batch_orders[batch_index].append(order_index)
+        else:
+            self.batch_orders[batch_index].insert(position, order_index)
+        self.batch_sizes[batch_index] += self.problem['order_sizes'][order_index]
+        add_order_to_batch_profile(self.batch_profiles[batch_index], self.problem['order_profiles'][order_index])
+        self.assignment[order_index] = batch_index
+
+
+    def update_tour_length(self, batch_index):
+        '''
+        Recalculate the tour length of a batch from its profile
+
+        :param batch_index: Index of the batch.
+        '''
+        self.batch_tour_lengths[batch_index] = calculate_tour_length_of_batch_profile(self.batch_profiles[batch_index], self.problem['max_y_position'], self.problem['routing_strategy'])
+
+
+    def shift_order(self, order_index, batch_index):
+        '''
+        Shift an order to the end of another batch
+
+        :param order_index: Index of the order.
+        :param batch_index: Index of the batch to shift the order to.
+        '''
+        source_batch_index = self.assignment[order_index]
+        self.remove_order(source_batch_index, order_index)
+        self.insert_order(batch_index, order_index)
+        self.update_tour_length(source_batch_index)
+        self.update_tour_length(batch_index)
+
+
+    def swap_orders(self, incumbent_batch_index, incumbent_position, neighbor_batch_index, neighbor_position):
+        '''
+        Swap two orders of different batches in their exact positions
+
+        :param incumbent_batch_index: Index of the first batch.
+        :param incumbent_position: Position of the order inside the first batch.
+        :param neighbor_batch_index: Index of the second batch.
+        :param neighbor_position: Position of the order inside the second batch.
+        '''
+        incumbent_order_index = self.batch_orders[incumbent_batch_index][incumbent_position]
+        neighbor_order_index = self.batch_orders[neighbor_batch_index][neighbor_position]
+        self.remove_order(incumbent_batch_index, incumbent_order_index)
+        self.remove_order(neighbor_batch_index, neighbor_order_index)
+        self.insert_order(incumbent_batch_index, neighbor_order_index, incumbent_position)
+        self.insert_order(neighbor_batch_index, incumbent_order_index, neighbor_position)
+        self.update_tour_length(incumbent_batch_index)
+        self.update_tour_length(neighbor_batch_index)
+
+
+    def remove_empty_batches(self):
+        '''
+        Remove all batches without orders and renumber the remaining batches
+        '''
+        remaining_batches = [batch_index for batch_index, order_indices in enumerate(self.batch_orders) if order_indices]
+        if len(remaining_batches) == len(self.batch_orders):
+            return
+        self.owned_batches = {new_index for new_index, batch_index in enumerate(remaining_batches) if batch_index in self.owned_batches}
+        self.batch_orders = [self.batch_orders[batch_index] for batch_index in remaining_batches]
+        self.batch_sizes = [self.batch_sizes[batch_index] for batch_index in remaining_batches]
+        self.batch_profiles = [self.batch_profiles[batch_index] for batch_index in remaining_batches]
+        self.batch_tour_lengths = [self.batch_tour_lengths[batch_index] for batch_index in remaining_batches]
+        self.batch_ids = [self.batch_ids[batch_index] for batch_index in remaining_batches]
+        for batch_index, order_indices in enumerate(self.batch_orders):
+            for order_index in order_indices:
+                self.assignment[order_index] = batch_index
+
+
+    def get_total_tour_length(self):
+        '''
+        Get the total tour length of all batches
+
+        :return: Total tour length
+        '''
+        return sum(self.batch_tour_lengths)
+
+
+    def to_batches(self):
+        '''
+        Convert the solution back into a list of batch dictionaries
+
+        :return: A list of batches containing their orders.
+        '''
+        return [{
+            'batch_id': self.batch_ids[batch_index],
+            'orders': [self.problem['orders'][order_index] for order_index in order_indices]
+        } for batch_index, order_indices in enumerate(self.batch_orders) if order_indices]
+
+
+@instrumentation.timed('iterated_local_search_array')
+def iterated_local_search_array(s_start, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, deadline=None, local_search_settings=None):
+    """
+    This function is the adapted Iterated Local Search Algorithm by Henn working on assignment solutions instead of batch dictionaries.
+    It takes and returns the same batch dictionaries as iterated_local_search.
+
+    :param s_start: A list of batches to optimize.
+    :param max_batch_size: The maximum size of orders a batch can contain.
+    :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :param rearrangement_parameter: A constant between [0;1] which determines the amount of perturbation.
+    :param threshold_parameter: A constant between [0;1] which determines the threshold to choose a solution.
+    :param time_limit: The maximum time in seconds the algorithm is allowed to run without improvement, every local search phase ends with the current time window at the latest.
+    :param deadline: Optional point in time after which the algorithm stops, even if it is still improving.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan without a budget.
+    :return: A list of optimized batches.
+    """
+    # Initialize the variables
+    ils_running = True
+    improvement_found = False
+    # The time window starts before the first local search phase, so that even a single phase on many open orders keeps the time limit
+    start_time = time.time()
+    ils_start_time = start_time
+    # Get the first solution by applying the local search phase
+    s_asterisk = local_search_phase_array(AssignmentSolution.from_batches(s_start, max_batch_size, warehouse_layout), get_earliest_deadline(deadline, start_time + time_limit), local_search_settings)
+    s_incumbent = s_asterisk.copy()
+
+    # Start the loop
+    time_to_best = 0.0
+    while ils_running:
+        iteration_start_time = time.perf_counter() if instrumentation.enabled else None
+        # Apply the perturbation phase and the local search phase
+        s = local_search_phase_array(perturbation_phase_array(s_incumbent.copy(), rearrangement_parameter), get_earliest_deadline(deadline, start_time + time_limit), local_search_settings)
+        # Get the tour lengths of the new and the asterisk solution
+        d_s = s.get_total_tour_length()
+        d_s_asterisk = s_asterisk.get_total_tour_length()
+
+        # Check if the new solution is better than the asterisk solution
+        if d_s < d_s_asterisk:
+            # Update the asterisk and the incumbent solution
+            s_asterisk = s
+            s_incumbent = s.copy()
+            # Set the flag that an improvement was found
+            improvement_found = True
+            time_to_best = time.time() - ils_start_time
+            if instrumentation.enabled:
+                instrumentation.count('ils_improvements_accepted')
+
+        # Check if any improvement during the time limit was found
+        if time.time() - start_time > time_limit:
+            if improvement_found:
+                # If an improvement was found, continue the loop
+                improvement_found = False
+                # Set the start time to the current time
+                start_time = time.time()
+            else:
+                # If no improvement was found, exit the loop
+                ils_running = False
+
+        # Exit the loop if the deadline is reached
+        if deadline is not None and time.time() >= deadline:
+            ils_running = False
+
+        # Record the iteration
+        if iteration_start_time is not None:
+            instrumentation.add_time('iterated_local_search_array.iteration', time.perf_counter() - iteration_start_time)
+
+    # Record the time until the best solution was found
+    if instrumentation.enabled:
+        instrumentation.add_time('iterated_local_search_array.time_to_best', time_to_best)
+
+    return s_asterisk.to_batches()
+
+
+@instrumentation.timed('local_search_phase_array')
+def local_search_phase_array(solution, deadline=None, local_search_settings=None):
+    """
+    This function is the local search phase of the adapted Iterated Local Search Algorithm by Henn for assignment solutions.
+    The swap and shift operators share the budget of the phase, which is checked after every evaluated move.
+
+    :param solution: The assignment solution to optimize, it is changed in place.
+    :param deadline: Optional point in time after which no further move is evaluated.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan without a budget.
+    :return: The optimized assignment solution.
+    """
+    local_search_settings = local_search_settings or default_local_search_settings
+    budget = create_search_budget(local_search_settings, deadline)
+    # Calculate the tour length of the initial solution
+    initial_tour_length = solution.get_total_tour_length()
+    improved_tour_length = 0
+
+    # Improve the solution using the local search algorithm, with the same termination rule as local_search_phase
+    while improved_tour_length < initial_tour_length:
+        # Improve the solution using the local search swap algorithm and set it as the new start solution
+        local_search_swap_array(solution, local_search_settings, budget)
+        improved_tour_length = solution.get_total_tour_length()
+        initial_tour_length = improved_tour_length
+        # Improve the solution using the local search shift algorithm and set it as the new start solution
+        local_search_shift_array(solution, local_search_settings, budget)
+        improved_tour_length = solution.get_total_tour_length()
+        initial_tour_length = improved_tour_length
+        # Stop improving if the budget of the phase is exhausted
+        if budget.is_exhausted():
+            if instrumentation.enabled:
+                instrumentation.count('local_search_budget_exhausted')
+            break
+
+    return solution
+
+
+def iterate_swap_moves_array(solution, candidate_lists, scan_order):
+    """
+    This function iterates over the feasible swaps of the neighborhood of an assignment solution in scan order.
+
+    :param solution: The assignment solution.
+    :param candidate_lists: The candidate lists of the orders, None to try all batches.
+    :param scan_order: The scan order of the batches and orders, 'FIXED' or 'RANDOM'.
+    :return: A generator of (incumbent batch index, neighbor batch index, incumbent order position, neighbor order position) tuples.
+    """
+    order_profiles = solution.problem['order_profiles']
+    # With candidate lists, only the candidate batches of every order are scanned instead of filtering all pairs of batches
+    if candidate_lists is not None:
+        for i in get_scan_order(len(solution.batch_orders), scan_order):
+            for incumbent_position in get_scan_order(len(solution.batch_orders[i]), scan_order):
+                incumbent_order_index = solution.batch_orders[i][incumbent_position]
+                for j in get_candidate_scan_order(candidate_lists.get_candidate_batches(incumbent_order_index, order_profiles[incumbent_order_index], i), scan_order):
+                    yield from iterate_swap_partners_array(solution, i, j, incumbent_position, scan_order)
+        return
+    # Iterate over all pairs of batches
+    for i in get_scan_order(len(solution.batch_orders), scan_order):
+        for j in get_scan_order(len(solution.batch_orders), scan_order):
+            # Skip the same batch
+            if i == j:
+                continue
+            # Iterate over all pairs of orders by position
+            for incumbent_position in get_scan_order(len(solution.batch_orders[i]), scan_order):
+                yield from iterate_swap_partners_array(solution, i, j, incumbent_position, scan_order)
+
+
+def iterate_swap_partners_array(solution, i, j, incumbent_position, scan_order):
+    """
+    This function iterates over the feasible swaps of an order with the orders of a neighbor batch of an assignment solution in scan order.
+
+    :param solution: The assignment solution.
+    :param i: The index of the incumbent batch.
+    :param j: The index of the neighbor batch.
+    :param incumbent_position: The position of the order in the incumbent batch.
+    :param scan_order: The scan order of the orders, 'FIXED' or 'RANDOM'.
+    :return: A generator of (incumbent batch index, neighbor batch index, incumbent order position, neighbor order position) tuples.
+    """
+    order_sizes = solution.problem['order_sizes']
+    max_batch_size = solution.problem['max_batch_size']
+    incumbent_size = order_sizes[solution.batch_orders[i][incumbent_position]]
+    for neighbor_position in get_scan_order(len(solution.batch_orders[j]), scan_order):
+        # Ensure the batch sizes are within the maximum limit
+        size_difference = order_sizes[solution.batch_orders[j][neighbor_position]] - incumbent_size
+        if solution.batch_sizes[i] + size_difference > max_batch_size or solution.batch_sizes[j] - size_difference > max_batch_size:
+            continue
+        yield i, j, incumbent_position, neighbor_position
+
+
+def iterate_shift_moves_array(solution, candidate_lists, scan_order):
+    """
+    This function iterates over the feasible shifts of the neighborhood of an assignment solution in scan order.
+
+    :param solution: The assignment solution.
+    :param candidate_lists: The candidate lists of the orders, None to try all batches.
+    :param scan_order: The scan order of the batches and orders, 'FIXED' or 'RANDOM'.
+    :return: A generator of (incumbent batch index, neighbor batch index, order index) tuples.
+    """
+    order_sizes = solution.problem['order_sizes']
+    order_profiles = solution.problem['order_profiles']
+    max_batch_size = solution.problem['max_batch_size']
+    # With candidate lists, only the candidate batches of every order are scanned instead of filtering all pairs of batches
+    if candidate_lists is not None:
+        for i in get_scan_order(len(solution.batch_orders), scan_order):
+            for position in get_scan_order(len(solution.batch_orders[i]), scan_order):
+                order_index = solution.batch_orders[i][position]
+                for j in get_candidate_scan_order(candidate_lists.get_candidate_batches(order_index, order_profiles[order_index], i), scan_order):
+                    # Ensure the batch size of the neighbor batch is within the maximum limit
+                    if solution.batch_sizes[j] + order_sizes[order_index] <= max_batch_size:
+                        yield i, j, order_index
+        return
+    # Iterate over all pairs of batches
+    for i in get_scan_order(len(solution.batch_orders), scan_order):
+        for j in get_scan_order(len(solution.batch_orders), scan_order):
+            # Skip the same batch
+            if i == j:
+                continue
+            # Iterate over all orders of the incumbent batch
+            for position in get_scan_order(len(solution.batch_orders[i]), scan_order):
+                order_index = solution.batch_orders[i][position]
+                # Ensure the batch size of the neighbor batch is within the maximum limit
+                if solution.batch_sizes[j] + order_sizes[order_index] > max_batch_size:
+                    continue
+                yield i, j, order_index
+
+
+@instrumentation.timed('local_search_swap_array')
+def local_search_swap_array(solution, local_search_settings=None, budget=None):
+    """
+    This function is the swap operator of the local search phase of the adapted Iterated Local Search Algorithm by Henn for assignment solutions.
+    The settings select if the first or the best improving swap of a scan is applied, the scan order and the candidate lists of the orders.
+
+    :param solution: The assignment solution to optimize, it is changed in place.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan.
+    :param budget: Optional search budget, the operator stops once it is exhausted.
+    :return: The optimized assignment solution.
+    """
+    local_search_settings = local_search_settings or default_local_search_settings
+    first_improvement = local_search_settings['improvement_policy'] == 'FIRST'
+    problem = solution.problem
+    order_profiles = problem['order_profiles']
+    max_y_position = problem['max_y_position']
+    routing_strategy = problem['routing_strategy']
+    # Restrict the partner batches of every order to its candidate list, None for the full scan
+    candidate_lists = create_candidate_lists(solution.batch_profiles, local_search_settings['neighborhood_size'])
+    budget_exhausted = budget is not None and budget.is_exhausted()
+    # Initialize the counters of the instrumentation
+    moves_evaluated = 0
+    moves_accepted = 0
+
+    # Continue until no improvement is found or the budget is exhausted
+    while not budget_exhausted:
+        # Scan the neighborhood for the first or the best improving swap
+        best_move = None
+        for i, j, incumbent_position, neighbor_position in iterate_swap_moves_array(solution, candidate_lists, local_search_settings['scan_order']):
+            # Calculate the change of the tour length caused by the swap
+            incumbent_order_index = solution.batch_orders[i][incumbent_position]
+            neighbor_order_index = solution.batch_orders[j][neighbor_position]
+            delta, _, _ = evaluate_swap(solution.batch_profiles[i], solution.batch_profiles[j], order_profiles[incumbent_order_index], order_profiles[neighbor_order_index], solution.batch_tour_lengths[i], solution.batch_tour_lengths[j], max_y_position, routing_strategy)
+            moves_evaluated += 1
+            budget_exhausted = budget is not None and budget.spend()
+            # Remember the swap if it is an improvement and better than the improvements found before
+            if delta < 0 and (best_move is None or delta < best_move[0]):
+                best_move = (delta, i, incumbent_position, j, neighbor_position)
+                if first_improvement:
+                    break
+            if budget_exhausted:
+                break
+
+        # Exit the loop as no improvement was found
+        if best_move is None:
+            break
+        # Apply the swap
+        _, i, incumbent_position, j, neighbor_position = best_move
+        solution.swap_orders(i, incumbent_position, j, neighbor_position)
+        if candidate_lists is not None:
+            candidate_lists.update_batches(i, j)
+        moves_accepted += 1
+
+    # Record the evaluated and accepted moves
+    if instrumentation.enabled:
+        instrumentation.count('moves_evaluated', moves_evaluated)
+        instrumentation.count('moves_accepted', moves_accepted)
+
+    return solution
+
+
+@instrumentation.timed('local_search_shift_array')
+def local_search_shift_array(solution, local_search_settings=None, budget=None):
+    """
+    This function is the shift operator of the local search phase of the adapted Iterated Local Search Algorithm by Henn for assignment solutions.
+    The settings select if the first or the best improving shift of a scan is applied, the scan order and the candidate lists of the orders.
+
+    :param solution: The assignment solution to optimize, it is changed in place.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan.
+    :param budget: Optional search budget, the operator stops once it is exhausted.
+    :return: The optimized assignment solution.
+    """
+    local_search_settings = local_search_settings or default_local_search_settings
+    first_improvement = local_search_settings['improvement_policy'] == 'FIRST'
+    problem = solution.problem
+    order_profiles = problem['order_profiles']
+    max_y_position = problem['max_y_position']
+    routing_strategy = problem['routing_strategy']
+    # Restrict the partner batches of every order to its candidate list, None for the full scan
+    candidate_lists = create_candidate_lists(solution.batch_profiles, local_search_settings['neighborhood_size'])
+    budget_exhausted = budget is not None and budget.is_exhausted()
+    # Initialize the counters of the instrumentation
+    moves_evaluated = 0
+    moves_accepted = 0
+
+    # Continue until no improvement is found or the budget is exhausted
+    while not budget_exhausted:
+        # Scan the neighborhood for the first or the best improving shift
+        best_move = None
+        for i, j, order_index in iterate_shift_moves_array(solution, candidate_lists, local_search_settings['scan_order']):
+            # Calculate the change of the tour length caused by the shift
+            delta, _, _ = evaluate_shift(solution.batch_profiles[i], solution.batch_profiles[j], order_profiles[order_index], solution.batch_tour_lengths[i], solution.batch_tour_lengths[j], max_y_position, routing_strategy)
+            moves_evaluated += 1
+            budget_exhausted = budget is not None and budget.spend()
+            # Remember the shift if it is an improvement and better than the improvements found before
+            if delta < 0 and (best_move is None or delta < best_move[0]):
+                best_move = (delta, i, j, order_index)
+                if first_improvement:
+                    break
+            if budget_exhausted:
+                break
+
+        # Exit the loop as no improvement was found
+        if best_move is None:
+            break
+        # Apply the shift
+        _, i, j, order_index = best_move
+        solution.shift_order(order_index, j)
+        if candidate_lists is not None:
+            candidate_lists.update_batches(i, j)
+        moves_accepted += 1
+
+    # Record the evaluated and accepted moves
+    if instrumentation.enabled:
+        instrumentation.count('moves_evaluated', moves_evaluated)
+        instrumentation.count('moves_accepted', moves_accepted)
+
+    # Delete empty batches
+    solution.remove_empty_batches()
+    return solution
+
+
+@instrumentation.timed('perturbation_phase_array')
+def perturbation_phase_array(solution, rearrangement_parameter):
+    """
+    This function is the perturbation phase of the adapted Iterated Local Search Algorithm by Henn for assignment solutions.
+
+    :param solution: The assignment solution to perturb, it is changed in place.
+    :param rearrangement_parameter: A constant between [0;1] which determines the amount of perturbation.
+    :return: The perturbed assignment solution.
+    """
+    order_sizes = solution.problem['order_sizes']
+    max_batch_size = solution.problem['max_batch_size']
+    # The perturbation needs at least two batches
+    if len(solution.batch_orders) < 2:
+        return solution
+    # Calculate the amount of iterations for the perturbation phase
+    iterations = int(len(solution.batch_orders) * rearrangement_parameter + 1)
+
+    for _ in range(iterations):
+        # Select two different random batches
+        k = random.randrange(len(solution.batch_orders))
+        l = random.randrange(len(solution.batch_orders))
+        while k == l:
+            l = random.randrange(len(solution.batch_orders))
+        # Skip batches which were emptied by a former iteration
+        if not solution.batch_orders[k] or not solution.batch_orders[l]:
+            continue
+
+        # Get random number of orders q and select the first q orders from both batches
+        q = random.randint(1, min(len(solution.batch_orders[k]), len(solution.batch_orders[l])))
+        selected_orders_k = solution.batch_orders[k][:q]
+        selected_orders_l = solution.batch_orders[l][:q]
+        selected_size_k = sum(order_sizes[order_index] for order_index in selected_orders_k)
+        selected_size_l = sum(order_sizes[order_index] for order_index in selected_orders_l)
+
+        # Check in constant time if the selected orders fit into the other batch
+        fits_into_l = solution.batch_sizes[l] - selected_size_l + selected_size_k <= max_batch_size
+        fits_into_k = solution.batch_sizes[k] - selected_size_k + selected_size_l <= max_batch_size
+        new_batch_index = None
+
+        # Move the selected orders of batch k to batch l or to a new batch
+        if not fits_into_l:
+            new_batch_index = solution.add_batch()
+        for order_index in selected_orders_k:
+            solution.shift_order(order_index, l if fits_into_l else new_batch_index)
+        # Move the selected orders of batch l to batch k or to a new batch
+        if not fits_into_k and new_batch_index is None:
+            new_batch_index = solution.add_batch()
+        for order_index in selected_orders_l:
+            solution.shift_order(order_index, k if fits_into_k else new_batch_index)
+
+    return solution
@@ -4,12 +4,19 @@ import time
 import traceback
 
 import click
-from src.core.logic.batch_tour_length_calculator import calculate_tour_length_s_shape_routing
-from src.core.logic.batch_tour_length_minimizer import create_start_batches, generate_unique_id, iterated_local_search
+from src.core.logic import instrumentation
+from src.core.logic.aisle_summary import get_single_order_tour_length
+from src.core.logic.batch_assignment_minimizer import iterated_local_search_array
+from src.core.logic.batch_tour_length_calculator import calculate_tour_length
+from src.core.logic.batch_tour_length_minimizer import create_start_batches, insert_order_at_cheapest_position, iterated_local_search, local_search_phase
+from src.core.logic.batch_tour_length_vectorized import calculate_tour_lengths_batched
+from src.core.logic.clock import get_clock
+from src.core.logic.local_search_control import create_local_search_settings
+from src.core.logic.parallel_iterated_local_search import parallel_iterated_local_search
 from src.vars import shared_variables
-from tabulate import tabulate
 
 
+@instrumentation.timed('order_picking_decision_point_ab')
 def order_picking_decision_point_ab(orders, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule):
     '''
     This function is called when the order picking decision point A or B is reached.
@@ -32,7 +39,7 @@ def order_picking_decision_point_ab(orders, max_batch_size, warehouse_layout, wa
         batches = copy.deepcopy(create_start_batches(orders, max_batch_size))
         # Apply the iterated local search algorithm to the batches when more than one batch is available
         if len(batches) > 1:
-            batches = iterated_local_search(copy.deepcopy(batches), max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit)
+            batches = run_iterated_local_search(copy.deepcopy(batches), max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit)
         # When only one batch is available, the batch won't be released immediately, in order to prevent the case that a new order arrives, which could be added to the batch.
         if len(batches) == 1:
             # Calculate the delayed release time of the batch
@@ -45,7 +52,7 @@ def order_picking_decision_point_ab(orders, max_batch_size, warehouse_layout, wa
             # Apply the selection rules
             ordered_for_picking_batches = copy.deepcopy(sort_batches_by_selection_rules(copy.deepcopy(batches), warehouse_layout, selection_rule))
             # Set the release time to the current time
-            release_time = time.time()
+            release_time = get_clock().time()
 
             # Add the release time to the batches
             for batch in ordered_for_picking_batches:
@@ -57,6 +64,88 @@ def order_picking_decision_point_ab(orders, max_batch_size, warehouse_layout, wa
         click.secho(f'Error in order_picking_decision_point_ab: {e}', fg='red')
         return batches
 
+@instrumentation.timed('order_picking_decision_point_ab_warm_start')
+def order_picking_decision_point_ab_warm_start(order, current_batches, max_batch_size, warehouse_layout, warehouse_layout_path, time_limit, release_parameter, selection_rule):
+    '''
+    This function is called instead of order_picking_decision_point_ab when a new order arrives and warm start is enabled.
+    Instead of building the batches from scratch, the new order is inserted into the current batches at its cheapest feasible position,
+    followed by a local search phase which is bounded by the time limit.
+
+    :param order: new customer order
+    :param current_batches: list of the current batches, which do not contain the new order yet
+    :param max_batch_size: maximum batch size
+    :param warehouse_layout: dictionary containing the warehouse layout information
+    :param time_limit: maximum time of the local search phase
+    :param release_parameter: parameter for the release time of the batch [0;1]
+    :param selection_rule: selection rule to be applied
+    :return: list of batches, release time
+    '''
+    # Initialize variables
+    batches = []
+    try:
+        # Insert the new order at its cheapest position
+        batches = insert_order_at_cheapest_position(current_batches, order, max_batch_size, warehouse_layout)
+        # Improve the batches by a short local search phase when more than one batch is available
+        if len(batches) > 1:
+            batches = local_search_phase(batches, max_batch_size, warehouse_layout, time.time() + time_limit, local_search_settings=create_local_search_settings(shared_variables.variables))
+        # When only one batch is available, the batch won't be released immediately, in order to prevent the case that a new order arrives, which could be added to the batch.
+        if len(batches) == 1:
+            # Calculate the delayed release time of the batch
+            batches[0] = calculate_delay_single_batch(batches[0], warehouse_layout, release_parameter)
+            return batches
+
+        else:
+            # Apply the selection rules
+            ordered_for_picking_batches = sort_batches_by_selection_rules(batches, warehouse_layout, selection_rule)
+            # Set the release time to the current time
+            release_time = get_clock().time()
+
+            # Add the release time to the batches
+            for batch in ordered_for_picking_batches:
+                batch['release_time'] = release_time
+            return ordered_for_picking_batches
+
+    # Catch any exception that might occur
+    except Exception as e:
+        click.secho(f'Error in order_picking_decision_point_ab_warm_start: {e}', fg='red')
+        return batches
+
+@instrumentation.timed('order_picking_decision_point_background')
+def order_picking_decision_point_background(batches, warehouse_layout, release_parameter, selection_rule):
+    '''
+    This function is called when the background optimization during a tour ends with a better solution.
+    The batches are already optimized, so only the selection rules and the release times are applied.
+
+    :param batches: list of optimized batches
+    :param warehouse_layout: dictionary containing the warehouse layout information
+    :param release_parameter: parameter for the release time of the batch [0;1]
+    :param selection_rule: selection rule to be applied
+    :return: list of batches, release time
+    '''
+    try:
+        # When only one batch is available, the batch won't be released immediately, in order to prevent the case that a new order arrives, which could be added to the batch.
+        if len(batches) == 1:
+            # Calculate the delayed release time of the batch
+            batches[0] = calculate_delay_single_batch(batches[0], warehouse_layout, release_parameter)
+            return batches
+
+        else:
+            # Apply the selection rules
+            ordered_for_picking_batches = sort_batches_by_selection_rules(batches, warehouse_layout, selection_rule)
+            # Set the release time to the current time
+            release_time = get_clock().time()
+
+            # Add the release time to the batches
+            for batch in ordered_for_picking_batches:
+                batch['release_time'] = release_time
+            return ordered_for_picking_batches
+
+    # Catch any exception that might occur
+    except Exception as e:
+        click.secho(f'Error in order_picking_decision_point_background: {e}', fg='red')
+        return batches
+
+@instrumentation.timed('order_picking_decision_point_c')
 def order_picking_decision_point_c(orders, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, selection_rule, time_limit):
     '''
     This function is called when the order picking decision point C is reached.
@@ -78,17 +167,42 @@ def order_picking_decision_point_c(orders, max_batch_size, warehouse_layout, war
     # As the iterated local search algorithm is only applicable to more than one batch
     if len(batches) > 1:
         # Apply the iterated local search algorithm to the batches
-        batches = iterated_local_search(copied_batches, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit)
+        batches = run_iterated_local_search(copied_batches, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit)
     # Apply the selection rules
     ordered_for_picking_batches = sort_batches_by_selection_rules(batches, warehouse_layout, selection_rule)
     # Add the release time to the batches
     for batch in ordered_for_picking_batches:
         # Set the release time to the current time
-        batch['release_time'] = time.time()
+        batch['release_time'] = get_clock().time()
 
     return ordered_for_picking_batches
 
 
+def run_iterated_local_search(batches, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit):
+    '''
+    This function applies the iterated local search algorithm with the engine given in the shared variables.
+    The engine 'ARRAY' works on assignment solutions, every other value uses the batch dictionaries directly.
+    With more than one worker in 'ils_workers', independent chains run in a process pool within the same time limit.
+    The local search settings, e.g. the candidate lists, the improvement policy and the budget of every local search phase, are read from the shared variables as well.
+
+    :param batches: list of batches
+    :param max_batch_size: maximum batch size
+    :param warehouse_layout: dictionary containing the warehouse layout information
+    :param rearrangement_parameter: parameter for the rearrangement of the batches
+    :param threshold_parameter: parameter for the threshold of the batches
+    :param time_limit: time limit for the iterated local search algorithm
+    :return: list of batches
+    '''
+    ils_engine = shared_variables.variables.get('ils_engine', 'DICT')
+    ils_workers = shared_variables.variables.get('ils_workers', 1)
+    local_search_settings = create_local_search_settings(shared_variables.variables)
+    if ils_workers > 1:
+        return parallel_iterated_local_search(batches, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, ils_workers, shared_variables.variables.get('ils_exchange_rounds', 1), ils_engine, local_search_settings)
+    if ils_engine == 'ARRAY':
+        return iterated_local_search_array(batches, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, local_search_settings=local_search_settings)
+    return iterated_local_search(batches, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, local_search_settings=local_search_settings)
+
+
 def sort_batches_by_selection_rules(batches, warehouse_layout, selection_rule):
     '''
     This function sorts the batches according to the selection rule.
@@ -133,10 +247,12 @@ def selection_rule_short(batches, warehouse_layout):
     sorted_batches = []
 
     try:
+        # Calculate the tour lengths of all batches in one vectorized pass
+        tour_lengths = calculate_tour_lengths_batched(batches, warehouse_layout)
         # For every batch in the list of batches
-        for batch in batches:
+        for batch, tour_length in zip(batches, tour_lengths):
             # Create the key 'tour_length' in the batch dictionary and assign the tour length of the batch to it
-            batch['tour_length'] = calculate_tour_length_s_shape_routing(batch, warehouse_layout)[0]
+            batch['tour_length'] = tour_length
 
         # Sort the batches by the tour length ascending
         sorted_batches = sorted(batches, key=lambda x: x['tour_length'])
@@ -158,10 +274,12 @@ def selection_rule_long(batches, warehouse_layout):
     sorted_batches = []
 
     try:
+        # Calculate the tour lengths of all batches in one vectorized pass
+        tour_lengths = calculate_tour_lengths_batched(batches, warehouse_layout)
         # For every batch in the list of batches
-        for batch in batches:
+        for batch, tour_length in zip(batches, tour_lengths):
             # Create the key 'tour_length' in the batch dictionary and assign the tour length of the batch to it
-            batch['tour_length'] = calculate_tour_length_s_shape_routing(batch, warehouse_layout)[0]
+            batch['tour_length'] = tour_length
 
         # Sort the batches by the tour length descending
         sorted_batches = sorted(batches, key=lambda x: x['tour_length'], reverse=True)
@@ -183,20 +301,16 @@ def selection_rule_sav(batches, warehouse_layout):
     sorted_batches = []
 
     try:
-        # For every batch in the list of batches
-        for batch in batches:
-            # Initialize the sum of the single service times
-            single_service_time = 0
+        # Calculate the tour lengths of all batches in one vectorized pass, the single service times of the orders are stored with the orders
+        batch_tour_lengths = calculate_tour_lengths_batched(batches, warehouse_layout)
 
-            # For every order in the batch
-            for order in batch['orders']:
-                # Create for every order a batch with only the order
-                order_batch = {'batch_id': generate_unique_id(), 'orders': [order]}
-                # Calculate the single service time of the order
-                single_service_time += calculate_tour_length_s_shape_routing(order_batch, warehouse_layout)[0]
+        # For every batch in the list of batches
+        for batch, batch_tour_length in zip(batches, batch_tour_lengths):
+            # Sum up the single service times of the orders in the batch
+            single_service_time = sum(get_single_order_tour_length(order, warehouse_layout) for order in batch['orders'])
 
             # Calculate the savings of the batch
-            batch['savings'] = single_service_time - calculate_tour_length_s_shape_routing(batch, warehouse_layout)[0]
+            batch['savings'] = single_service_time - batch_tour_length
 
         # Sort the batches by the savings descending
         sorted_batches = sorted(batches, key=lambda x: x['savings'], reverse=True)
@@ -223,26 +337,16 @@ def calculate_delay_single_batch(batch, warehouse_layout, release_parameter_alph
     st_j_service_time_batch = 0.0 # Service time of the batch in seconds
     st_i_longest_sst_order = 0.0 # Service time of the order with the longest single service time in seconds
     ri_arrival_time_longest_order = 0.0 # Arrival time of the order with the longest single service time in milliseconds
-    t_current_time = time.time() # Current time in milliseconds
-
+    t_current_time = get_clock().time() # Current time in milliseconds
 
-    # Calculate the tour length of the batch
-    tour_length_j_batch, _ = calculate_tour_length_s_shape_routing(batch, warehouse_layout)
-    # Calculate the service time of the batch
-    st_j_service_time_batch = tour_length_j_batch
 
-    # Add every order of the batch to new distinct batches
-    new_batches = []
-    for order in batch['orders']:
-        new_batches.append({
-            'batch_id': generate_unique_id(),
-            'orders': [order]
-        })
+    # Calculate the service time of the batch from the aisle summaries of its orders
+    st_j_service_time_batch = calculate_tour_length(batch, warehouse_layout)
 
     # Get the service time and the arrival time of the longest taking order
-    for i in range(len(new_batches)):
-        # Calculate the tour length of the current order
-        batch_sst, _ = calculate_tour_length_s_shape_routing(new_batches[i], warehouse_layout)
+    for order in batch['orders']:
+        # Get the stored tour length of the current order
+        batch_sst = get_single_order_tour_length(order, warehouse_layout)
         # Transform the tour length according to the predefined units per second
         batch_sst = batch_sst
         # Check if the tour length of the current order is bigger than the smallest tour length found so far
@@ -250,7 +354,7 @@ def calculate_delay_single_batch(batch, warehouse_layout, release_parameter_alph
             # Update the biggest tour length found so far 
             st_i_longest_sst_order = float(batch_sst)
             # Set the arrival time of the order with the longest single service time
-            ri_arrival_time_longest_order_temp = new_batches[i]['orders'][0]['arrival_time']
+            ri_arrival_time_longest_order_temp = order['arrival_time']
             # Calculate the difference between the arrival time of the order with the longest single service time and the current time
             ri_arrival_time_longest_order = abs(ri_arrival_time_longest_order_temp - t_current_time)
 
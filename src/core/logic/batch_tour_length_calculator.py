@@ -3,24 +3,56 @@ import traceback
 
 import click
 
+from src.core.logic import instrumentation
+from src.core.logic.aisle_summary import create_batch_aisle_summary
+from src.core.logic.routing_strategies import calculate_largest_gap_aisle_length, calculate_tour_length_from_aisle_summary, calculate_tour_length_s_shape_routing_from_aisle_summary, get_routing_strategy
 from src.vars import shared_variables
 
 
-# Initialize the direction of the tour. It can be either True (upwards) or False (downwards).
-direction = True
+class RoutingContext:
+    '''
+    Class for the traversal state of one S-Shape routing. Every routing uses its own context, so that several threads or processes can route at the same time.
+    '''
+    def __init__(self, starting_position=(0, -1)):
+        '''
+        Constructor of the routing context
+
+        :param starting_position: The starting position of the tour, one unit below the first aisle.
+        '''
+        # The starting position of the tour
+        self.starting_position = starting_position
+        # The direction of the tour. It can be either True (upwards) or False (downwards).
+        self.direction = True
+
 
-def calculate_tour_length_s_shape_routing(batch, warehouse_layout):
+@instrumentation.timed('calculate_tour_length')
+def calculate_tour_length(batch, warehouse_layout):
+    '''
+    This function calculates the tour length of a batch with the routing strategy selected in the warehouse layout, using the aisle summaries of its orders.
+
+    :param batch: A dictionary containing the orders of the batch.
+    :param warehouse_layout: A dictionary containing the warehouse layout information and optionally the routing strategy.
+    :return: The tour length of the batch.
+    '''
+    return calculate_tour_length_from_aisle_summary(create_batch_aisle_summary(batch), warehouse_layout)
+
+
+@instrumentation.timed('calculate_tour_length_s_shape_routing')
+def calculate_tour_length_s_shape_routing(batch, warehouse_layout, return_sorted_batch=True):
     '''
     This function calculates the total tour length of the batch using the S-Shape routing algorithm.
 
     :param batch: A list of dictionaries, each containing 'id', 'abs_x_position', 'abs_y_position', and 'abs_z_position'.
     :param warehouse_layout: A dictionary containing the warehouse layout information.
-    :return: The total tour length of the batch, and the sorted batch.
+    :param return_sorted_batch: If False, the pick sequence is not built and the tour length is calculated from the aisle summaries of the orders.
+    :return: The total tour length of the batch, and the sorted batch or None if it is not requested.
 
     '''
-    global direction
-    direction = True
     try:
+        # Without the pick sequence, the tour length only depends on the visited aisles
+        if not return_sorted_batch:
+            return calculate_tour_length_s_shape_routing_from_aisle_summary(create_batch_aisle_summary(batch), warehouse_layout['max_y_position']), None
+
         # Sort the batch by the x-coordinate, y-coordinate, and z-coordinate
         sorted_batch = sort_and_transform_batch_s_shape_routing(batch)
         #Store the warehouse layout information as a maximum y position and the maximum x position transformed. z position is not needed for the S-Shape routing
@@ -30,8 +62,9 @@ def calculate_tour_length_s_shape_routing(batch, warehouse_layout):
 
         # Initialize the total tour length
         total_tour_length = 0
-        # Initialize the current position	
-        starting_position = (0, -1) # The starting position is one unit below the first aisle
+        # Initialize the routing context and the current position
+        routing_context = RoutingContext()
+        starting_position = routing_context.starting_position # The starting position is one unit below the first aisle
         current_position = starting_position
 
         for i, item in enumerate(sorted_batch):
@@ -44,7 +77,7 @@ def calculate_tour_length_s_shape_routing(batch, warehouse_layout):
                 distance=0
             else:
                 # Calculate the distance between the current position and the item position
-                distance = calculate_distance_to_next_item(current_position, starting_position, item_position, max_y_position)
+                distance = calculate_distance_to_next_item(current_position, starting_position, item_position, max_y_position, routing_context)
             # Update the current position
             current_position = item_position
             # Update the total tour length
@@ -116,20 +149,116 @@ def sort_and_transform_batch_s_shape_routing(unsorted_batch):
     return final_sorted_batch
 
 
+def group_batch_items_by_aisle(unsorted_batch):
+    """
+    This function transforms the x-coordinates of the items of a batch into aisles the same way as the S-Shape routing and groups the items by their aisle.
+
+    :param unsorted_batch: A dictionary containing the orders of the batch.
+    :return: A list of (aisle, items) entries sorted by the aisle, the items of every aisle are sorted ascending by the y-coordinate and the z-coordinate.
+    """
+    grouped_batch = {}
+    for item in sort_and_transform_batch_s_shape_routing(unsorted_batch):
+        grouped_batch.setdefault(item['abs_x_position'], []).append(item)
+    return [(aisle, sorted(items, key=lambda x: (x['abs_y_position'], x['abs_z_position']))) for aisle, items in sorted(grouped_batch.items())]
+
+
+def sort_and_transform_batch_return_routing(unsorted_batch, max_y_position):
+    """
+    This function sorts the batch in the pick sequence of the Return routing: the aisles ascending, every aisle from the front up to its highest item.
+
+    :param unsorted_batch: A dictionary containing the orders of the batch.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: The sorted batch.
+    """
+    return [item for _, items in group_batch_items_by_aisle(unsorted_batch) for item in items]
+
+
+def sort_and_transform_batch_with_traversed_outer_aisles(unsorted_batch, max_y_position, is_picked_from_back):
+    """
+    This function sorts the batch in the pick sequence of the routings which traverse the first and the last visited aisle completely, see calculate_tour_length_with_traversed_outer_aisles.
+    The first aisle is picked upwards, then the back parts of the aisles in between from the back on the way to the last aisle, the last aisle downwards
+    and the front parts of the aisles in between from the front on the way back to the start.
+
+    :param unsorted_batch: A dictionary containing the orders of the batch.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :param is_picked_from_back: Function returning if an item of an aisle in between is picked from the back out of the item, the items of its aisle and the maximum y-coordinate.
+    :return: The sorted batch.
+    """
+    grouped_batch = group_batch_items_by_aisle(unsorted_batch)
+    # A single aisle is entered from the front and left at the front again
+    if len(grouped_batch) == 1:
+        return list(grouped_batch[0][1])
+    # Up the first aisle
+    sorted_batch = list(grouped_batch[0][1])
+    # Along the back, every aisle in between is entered from the back down to its lowest item picked from the back
+    for _, items in grouped_batch[1:-1]:
+        sorted_batch.extend(reversed([item for item in items if is_picked_from_back(item, items, max_y_position)]))
+    # Down the last aisle
+    sorted_batch.extend(reversed(grouped_batch[-1][1]))
+    # Along the front back to the start, every aisle in between is entered from the front up to its highest item picked from the front
+    for _, items in reversed(grouped_batch[1:-1]):
+        sorted_batch.extend(item for item in items if not is_picked_from_back(item, items, max_y_position))
+    return sorted_batch
+
 
-def calculate_distance_to_next_item(current_position, starting_position, item_position, max_y_position):
+def is_picked_from_back_midpoint_routing(item, items, max_y_position):
+    """
+    This function checks if an item of an aisle in between is picked from the back by the Midpoint routing, which is the case for the items in the back half.
+
+    :param item: The item.
+    :param items: The items of the aisle.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: True if the item is picked from the back, False if it is picked from the front.
+    """
+    return item['abs_y_position'] > max_y_position / 2
+
+
+def is_picked_from_back_largest_gap_routing(item, items, max_y_position):
+    """
+    This function checks if an item of an aisle in between is picked from the back by the Largest Gap routing,
+    which is the case for all items of the aisle if entering from the back is shorter, see calculate_largest_gap_aisle_length.
+
+    :param item: The item.
+    :param items: The items of the aisle, sorted ascending by the y-coordinate.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: True if the item is picked from the back, False if it is picked from the front.
+    """
+    min_y, max_y = items[0]['abs_y_position'], items[-1]['abs_y_position']
+    return calculate_largest_gap_aisle_length(min_y, max_y, max_y_position) < 2 * (max_y + 1)
+
+
+# Functions returning the pick sequence of a batch out of the batch and the maximum y-coordinate by the name of the routing strategy
+pick_sequences = {
+    'S_SHAPE': lambda unsorted_batch, max_y_position: sort_and_transform_batch_s_shape_routing(unsorted_batch),
+    'RETURN': sort_and_transform_batch_return_routing,
+    'MIDPOINT': lambda unsorted_batch, max_y_position: sort_and_transform_batch_with_traversed_outer_aisles(unsorted_batch, max_y_position, is_picked_from_back_midpoint_routing),
+    'LARGEST_GAP': lambda unsorted_batch, max_y_position: sort_and_transform_batch_with_traversed_outer_aisles(unsorted_batch, max_y_position, is_picked_from_back_largest_gap_routing),
+}
+
+
+def sort_and_transform_batch(unsorted_batch, warehouse_layout):
+    """
+    This function sorts the batch in the pick sequence of the routing strategy selected in the warehouse layout, so that the picker walks the tour its tour length is calculated for.
+
+    :param unsorted_batch: A dictionary containing the orders of the batch.
+    :param warehouse_layout: A dictionary containing the warehouse layout information and optionally the routing strategy.
+    :return: The sorted batch with the x-coordinates transformed into aisles.
+    """
+    return pick_sequences[get_routing_strategy(warehouse_layout)](unsorted_batch, warehouse_layout['max_y_position'])
+
+
+
+def calculate_distance_to_next_item(current_position, starting_position, item_position, max_y_position, routing_context):
     """
     This function calculates the distance between the current position and the item position in the warehouse.
 
     :param current_position: A tuple containing the current x-coordinate, y-coordinate, and z-coordinate.
     :param item_position: A tuple containing the item's x-coordinate (transformed), y-coordinate, and z-coordinate.
     :param max_y_position: The maximum y-coordinate in the warehouse.
+    :param routing_context: The routing context holding the walking direction of the current tour, it is updated when the aisle changes.
     :return: The distance between the current position and the item position.
     """
     
-    # Declare the global variables
-    global direction
-    
     if(current_position==starting_position):
         #If the current position is the starting position
         distance=abs(current_position[0]-item_position[0])+abs(current_position[1]-item_position[1])
@@ -142,7 +271,7 @@ def calculate_distance_to_next_item(current_position, starting_position, item_po
                 distance=abs(current_position[1]-item_position[1]) #Calculate the y-distance to the item
         else:
                 #If the item is on a different aisle than the current position
-                if(direction):
+                if(routing_context.direction):
                     #If the direction is upwards
                     #Calculate the y-distance to the end of the aisle. As the y-coordinate starts at 0, we have to do one more step to get to the end of the aisle
                     distance=abs(current_position[1]-(max_y_position))
@@ -151,7 +280,7 @@ def calculate_distance_to_next_item(current_position, starting_position, item_po
                     #Calculate the y-distance to the item from the end of the aisle.
                     distance+=abs((max_y_position)-item_position[1])
                     #Change the direction
-                    direction=False
+                    routing_context.direction=False
                 else:
                     #If the direction is downwards
                     #Calculate the y-distance to the end of the aisle. As the y-coordinate starts at 0, we have to do one more step to get to the end of the aisle
@@ -161,7 +290,7 @@ def calculate_distance_to_next_item(current_position, starting_position, item_po
                     #Calculate the y-distance to the item from the end of the aisle.
                     distance+=abs(starting_position[1]-item_position[1])
                     #Change the direction
-                    direction=True
+                    routing_context.direction=True
 
     return distance
 
@@ -5,8 +5,17 @@ import traceback
 import uuid
 
 import click
+from src.core.logic import instrumentation
 from src.core.logic.batch_tour_length_calculator import calculate_tour_length_s_shape_routing
+from src.core.logic.candidate_lists import create_candidate_lists
 from src.core.logic.join_item_information import join_item_id_and_position_csv
+from src.core.logic.local_search_control import create_search_budget, default_local_search_settings, get_candidate_scan_order, get_earliest_deadline, get_scan_order
+from src.core.logic.move_evaluator import (
+    add_order_to_batch_profile, calculate_tour_length_after_move, calculate_tour_length_of_batch_profile, create_batch_profile, 
+    create_order_profile, evaluate_shift, evaluate_swap, remove_order_from_batch_profile
+)
+from src.core.logic.routing_strategies import default_routing_strategy, get_routing_strategy
+from src.core.logic.tour_length_cache import calculate_tour_length_cached
 from src.vars import shared_variables
 
 
@@ -54,7 +63,45 @@ def create_start_batches(orders, max_batch_size):
     return batches
 
 
-def iterated_local_search(s_start, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit):
+def insert_order_at_cheapest_position(batches, order, max_batch_size, warehouse_layout):
+    """
+    This function inserts a new order into the batch where it increases the tour length the least without exceeding the maximum batch size.
+    If no batch has enough capacity left or a new batch is cheaper, the order gets its own batch.
+
+    :param batches: A list of batches the order is inserted into.
+    :param order: The new order.
+    :param max_batch_size: The maximum size of orders a batch can contain.
+    :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :return: A new list of batches containing the order.
+    """
+    max_y_position = warehouse_layout['max_y_position']
+    routing_strategy = get_routing_strategy(warehouse_layout)
+    order_profile = create_order_profile(order, routing_strategy)
+    # A new batch only containing the order is always feasible
+    cheapest_delta = calculate_tour_length_of_batch_profile(create_batch_profile([order_profile]), max_y_position, routing_strategy)
+    cheapest_batch_index = None
+    for batch_index, batch in enumerate(batches):
+        # Skip batches without enough capacity left
+        if sum(len(batch_order['items']) for batch_order in batch['orders']) + len(order['items']) > max_batch_size:
+            continue
+        # Calculate the increase of the tour length caused by the insertion
+        batch_profile = create_batch_profile([create_order_profile(batch_order, routing_strategy) for batch_order in batch['orders']])
+        delta = calculate_tour_length_after_move(batch_profile, [], [order_profile], max_y_position, routing_strategy) - calculate_tour_length_of_batch_profile(batch_profile, max_y_position, routing_strategy)
+        if delta < cheapest_delta:
+            cheapest_delta = delta
+            cheapest_batch_index = batch_index
+
+    # Insert the order without changing the other batches
+    batches = [{'batch_id': batch['batch_id'], 'orders': list(batch['orders'])} for batch in batches]
+    if cheapest_batch_index is None:
+        batches.append({'batch_id': generate_unique_id(), 'orders': [order]})
+    else:
+        batches[cheapest_batch_index]['orders'].append(order)
+    return batches
+
+
+@instrumentation.timed('iterated_local_search')
+def iterated_local_search(s_start, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, deadline=None, local_search_settings=None):
     """
     This function is the main function of the adapted Iterated Local Search Algorithm by Henn. The naming of the variables is based on another paper by Henn.
 
@@ -63,7 +110,9 @@ def iterated_local_search(s_start, max_batch_size, warehouse_layout, warehouse_l
     :param warehouse_layout: A dictionary containing the warehouse layout information.
     :param rearrangement_parameter: A constant between [0;1] which determines the amount of perturbation.
     :param threshold_parameter: A constant between [0;1] which determines the threshold to choose a solution.
-    :param time_limit: The maximum time in seconds the algorithm is allowed to run.
+    :param time_limit: The maximum time in seconds the algorithm is allowed to run without improvement, every local search phase ends with the current time window at the latest.
+    :param deadline: Optional point in time after which the algorithm stops, even if it is still improving.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan without a budget.
     """
     # Initialize the variables
     s = []
@@ -71,25 +120,29 @@ def iterated_local_search(s_start, max_batch_size, warehouse_layout, warehouse_l
     improvement_found = False
     # Get the initial batches and copy them to avoid changing the original batches
     s_initial = copy.deepcopy(s_start)
+    # The time window starts before the first local search phase, so that even a single phase on many open orders keeps the time limit
+    start_time = time.time()
+    ils_start_time = start_time
     # Get the first solution by applying the local search phase
-    s_asterisk = local_search_phase(s_initial, max_batch_size, warehouse_layout)
+    s_asterisk = local_search_phase(s_initial, max_batch_size, warehouse_layout, get_earliest_deadline(deadline, start_time + time_limit), local_search_settings=local_search_settings)
     s_incumbent = copy.deepcopy(s_asterisk)
 
     # Start the loop
-    start_time = time.time()
+    time_to_best = 0.0
     while ils_running:
+        iteration_start_time = time.perf_counter() if instrumentation.enabled else None
         # Apply the perturbation phase
         s = copy.deepcopy(perturbation_phase(copy.deepcopy(s_incumbent), max_batch_size, rearrangement_parameter))
         # Apply the local search phase
-        s = local_search_phase(copy.deepcopy(s), max_batch_size, warehouse_layout)
+        s = local_search_phase(copy.deepcopy(s), max_batch_size, warehouse_layout, get_earliest_deadline(deadline, start_time + time_limit), local_search_settings=local_search_settings)
         # Calculate the tour length of the new solution
         d_s = 0
-        for batch in copy.deepcopy(s):
-            d_s += calculate_tour_length_s_shape_routing(batch, warehouse_layout)[0]
+        for batch in s:
+            d_s += calculate_tour_length_cached(batch, warehouse_layout)
         # Calculate the tour length of the asterisk solution
         d_s_asterisk = 0
-        for batch in copy.deepcopy(s_asterisk):
-            d_s_asterisk += calculate_tour_length_s_shape_routing(batch, warehouse_layout)[0]
+        for batch in s_asterisk:
+            d_s_asterisk += calculate_tour_length_cached(batch, warehouse_layout)
         
         # Check if the new solution is better than the asterisk solution
         if d_s < d_s_asterisk:
@@ -99,6 +152,9 @@ def iterated_local_search(s_start, max_batch_size, warehouse_layout, warehouse_l
             s_incumbent = copy.deepcopy(s)
             # Set the flag that an improvement was found
             improvement_found = True
+            time_to_best = time.time() - ils_start_time
+            if instrumentation.enabled:
+                instrumentation.count('ils_improvements_accepted')
 
         # Check if any improvement during the time limit was found
         if time.time() - start_time > time_limit:
@@ -115,185 +171,352 @@ def iterated_local_search(s_start, max_batch_size, warehouse_layout, warehouse_l
                 # If no improvement was found, exit the loop
                 ils_running = False
 
+        # Exit the loop if the deadline is reached
+        if deadline is not None and time.time() >= deadline:
+            ils_running = False
+
+        # Record the iteration
+        if iteration_start_time is not None:
+            instrumentation.add_time('iterated_local_search.iteration', time.perf_counter() - iteration_start_time)
+
+    # Record the time until the best solution was found
+    if instrumentation.enabled:
+        instrumentation.add_time('iterated_local_search.time_to_best', time_to_best)
+
     return s_asterisk
 
 
-def local_search_phase(initial_batches, max_batch_size, warehouse_layout):
+@instrumentation.timed('local_search_phase')
+def local_search_phase(initial_batches, max_batch_size, warehouse_layout, deadline=None, stop_event=None, local_search_settings=None):
     """
     This function is the local search phase of the adapted Iterated Local Search Algorithm by Henn.
+    The swap and shift operators share the budget of the phase, which is checked after every evaluated move.
 
     :param batches: A list of batches to optimize.
     :param max_batch_size: The maximum size of orders a batch can contain.
     :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :param deadline: Optional point in time after which no further move is evaluated.
+    :param stop_event: Optional threading event, no further move is evaluated once it is set.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan without a budget.
     :return: A list of optimized batches.
     """
+    local_search_settings = local_search_settings or default_local_search_settings
+    budget = create_search_budget(local_search_settings, deadline, stop_event)
     # Calculate the tour length of the initial batches
-    initial_batches_tour_length = sum(calculate_tour_length_s_shape_routing(batch, warehouse_layout)[0] for batch in initial_batches)
+    initial_batches_tour_length = sum(calculate_tour_length_cached(batch, warehouse_layout) for batch in initial_batches)
     # Initialize the variables
+    improved_batches = initial_batches
     improved_batches_tour_length = 0
 
     # Improve the batches using the local search algorithm
     while improved_batches_tour_length < initial_batches_tour_length:
         # Improve the batches using the local search swap algorithm
-        improved_batches = local_search_swap(initial_batches,max_batch_size, warehouse_layout)
+        improved_batches = local_search_swap(initial_batches, max_batch_size, warehouse_layout, local_search_settings, budget)
         # Calculate the total tour length of the improved batches after a swap
-        improved_batches_tour_length = sum(calculate_tour_length_s_shape_routing(batch, warehouse_layout)[0] for batch in improved_batches)
+        improved_batches_tour_length = sum(calculate_tour_length_cached(batch, warehouse_layout) for batch in improved_batches)
         # Set the improved batches as the new start batches 
         initial_batches = improved_batches
         initial_batches_tour_length = improved_batches_tour_length
         # Improve the batches using the local search shift algorithm
-        improved_batches = local_search_shift(initial_batches, max_batch_size, warehouse_layout)
+        improved_batches = local_search_shift(initial_batches, max_batch_size, warehouse_layout, local_search_settings, budget)
         # Calculate the total tour length of the improved batches after a shift
-        improved_batches_tour_length = sum(calculate_tour_length_s_shape_routing(batch, warehouse_layout)[0] for batch in improved_batches)
+        improved_batches_tour_length = sum(calculate_tour_length_cached(batch, warehouse_layout) for batch in improved_batches)
         # Set the improved batches as the new start batches
         initial_batches = improved_batches
         initial_batches_tour_length = improved_batches_tour_length
+        # Stop improving if the budget of the phase is exhausted
+        if budget.is_exhausted():
+            if instrumentation.enabled:
+                instrumentation.count('local_search_budget_exhausted')
+            break
 
     return improved_batches
 
 
-def local_search_swap(batches, max_batch_size, warehouse_layout):
+def iterate_swap_moves(batches, batch_sizes, max_batch_size, order_profiles, candidate_lists, scan_order):
+    """
+    This function iterates over the feasible swaps of the neighborhood in scan order.
+
+    :param batches: A list of batches.
+    :param batch_sizes: A list containing the amount of items of every batch.
+    :param max_batch_size: The maximum size of orders a batch can contain.
+    :param order_profiles: A dictionary containing the order profiles by the id of the order object.
+    :param candidate_lists: The candidate lists of the orders, None to try all batches.
+    :param scan_order: The scan order of the batches and orders, 'FIXED' or 'RANDOM'.
+    :return: A generator of (incumbent batch index, neighbor batch index, incumbent order position, neighbor order position) tuples.
+    """
+    # With candidate lists, only the candidate batches of every order are scanned instead of filtering all pairs of batches
+    if candidate_lists is not None:
+        for i in get_scan_order(len(batches), scan_order):
+            for incumbent_index in get_scan_order(len(batches[i]['orders']), scan_order):
+                incumbent_order = batches[i]['orders'][incumbent_index]
+                for j in get_candidate_scan_order(candidate_lists.get_candidate_batches(id(incumbent_order), order_profiles[id(incumbent_order)], i), scan_order):
+                    yield from iterate_swap_partners(batches, batch_sizes, max_batch_size, i, j, incumbent_index, scan_order)
+        return
+    # Iterate over all pairs of batches
+    for i in get_scan_order(len(batches), scan_order):
+        for j in get_scan_order(len(batches), scan_order):
+            # Skip the same batch
+            if i == j:
+                continue
+            # Iterate over all pairs of orders by index
+            for incumbent_index in get_scan_order(len(batches[i]['orders']), scan_order):
+                yield from iterate_swap_partners(batches, batch_sizes, max_batch_size, i, j, incumbent_index, scan_order)
+
+
+def iterate_swap_partners(batches, batch_sizes, max_batch_size, i, j, incumbent_index, scan_order):
+    """
+    This function iterates over the feasible swaps of an order with the orders of a neighbor batch in scan order.
+
+    :param batches: A list of batches.
+    :param batch_sizes: A list containing the amount of items of every batch.
+    :param max_batch_size: The maximum size of orders a batch can contain.
+    :param i: The index of the incumbent batch.
+    :param j: The index of the neighbor batch.
+    :param incumbent_index: The position of the order in the incumbent batch.
+    :param scan_order: The scan order of the orders, 'FIXED' or 'RANDOM'.
+    :return: A generator of (incumbent batch index, neighbor batch index, incumbent order position, neighbor order position) tuples.
+    """
+    incumbent_size = len(batches[i]['orders'][incumbent_index]['items'])
+    for neighbor_index in get_scan_order(len(batches[j]['orders']), scan_order):
+        # Ensure the batch sizes are within the maximum limit
+        size_difference = len(batches[j]['orders'][neighbor_index]['items']) - incumbent_size
+        if batch_sizes[i] + size_difference > max_batch_size or batch_sizes[j] - size_difference > max_batch_size:
+            continue
+        yield i, j, incumbent_index, neighbor_index
+
+
+def iterate_shift_moves(batches, batch_sizes, max_batch_size, order_profiles, candidate_lists, scan_order):
+    """
+    This function iterates over the feasible shifts of the neighborhood in scan order.
+
+    :param batches: A list of batches.
+    :param batch_sizes: A list containing the amount of items of every batch.
+    :param max_batch_size: The maximum size of orders a batch can contain.
+    :param order_profiles: A dictionary containing the order profiles by the id of the order object.
+    :param candidate_lists: The candidate lists of the orders, None to try all batches.
+    :param scan_order: The scan order of the batches and orders, 'FIXED' or 'RANDOM'.
+    :return: A generator of (incumbent batch index, neighbor batch index, order position) tuples.
+    """
+    # With candidate lists, only the candidate batches of every order are scanned instead of filtering all pairs of batches
+    if candidate_lists is not None:
+        for i in get_scan_order(len(batches), scan_order):
+            for position in get_scan_order(len(batches[i]['orders']), scan_order):
+                order = batches[i]['orders'][position]
+                for j in get_candidate_scan_order(candidate_lists.get_candidate_batches(id(order), order_profiles[id(order)], i), scan_order):
+                    # Ensure the batch size of the neighbor batch is within the maximum limit
+                    if batch_sizes[j] + len(order['items']) <= max_batch_size:
+                        yield i, j, position
+        return
+    # Iterate over all pairs of batches
+    for i in get_scan_order(len(batches), scan_order):
+        for j in get_scan_order(len(batches), scan_order):
+            # Skip the same batch
+            if i == j:
+                continue
+            # Iterate over all orders of the incumbent batch
+            for position in get_scan_order(len(batches[i]['orders']), scan_order):
+                order = batches[i]['orders'][position]
+                # Ensure the batch size of the neighbor batch is within the maximum limit
+                if batch_sizes[j] + len(order['items']) > max_batch_size:
+                    continue
+                yield i, j, position
+
+
+@instrumentation.timed('local_search_swap')
+def local_search_swap(batches, max_batch_size, warehouse_layout, local_search_settings=None, budget=None):
     """
     This function is the swap operator of the local search phase of the adapted Iterated Local Search Algorithm by Henn.
+    Every candidate swap is evaluated by its change of the tour length using the aisle profiles of the batches, only accepted swaps are applied to the batches.
+    The settings select if the first or the best improving swap of a scan is applied, the scan order and the candidate lists of the orders.
 
     :param batches: A list of batches to optimize.
     :param max_batch_size: The maximum size of orders a batch can contain.
     :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan.
+    :param budget: Optional search budget, the batches improved so far are returned once it is exhausted.
     :return: A list of optimized batches.
     """
     # Initialize the variables
-    is_optimal = False
-
-    # Continue until no improvement is found
-    while not is_optimal:
-        # Initialize the flag
-        improvement_found = False
-        # Iterate over all pairs of batches
-        for i, incumbent_batch in enumerate(batches):
-            for j, neighbor_batch in enumerate(batches):
-                # Skip the same batch
-                if i != j:
-                    # Calculate the tour length of the incumbent and neighbor batch before the swap
-                    incumbent_batch_tour_length, _ = calculate_tour_length_s_shape_routing(incumbent_batch, warehouse_layout)
-                    neighbor_batch_tour_length, _ = calculate_tour_length_s_shape_routing(neighbor_batch, warehouse_layout)
-
-                    # Iterate over all pairs of orders by index
-                    for incumbent_index, incumbent_order in enumerate(incumbent_batch['orders']):
-                        for neighbor_index, neighbor_order in enumerate(neighbor_batch['orders']):
-                            # Create a copy of the batches to test the swap
-                            temp_incumbent_batch = copy.deepcopy(incumbent_batch)
-                            temp_neighbor_batch = copy.deepcopy(neighbor_batch)
-
-                            # Swap orders in their exact positions
-                            temp_incumbent_batch['orders'][incumbent_index] = neighbor_order
-                            temp_neighbor_batch['orders'][neighbor_index] = incumbent_order
-
-                            # Ensure the batch sizes are within the maximum limit
-                            if sum(len(order['items']) for order in temp_incumbent_batch['orders']) > max_batch_size or \
-                               sum(len(order['items']) for order in temp_neighbor_batch['orders']) > max_batch_size:
-                                # Skip the swap
-                                continue
-                            
-                            # Calculate the tour length of the incumbent and neighbor batch after the swap
-                            temp_incumbent_batch_tour_length, _ = calculate_tour_length_s_shape_routing(temp_incumbent_batch, warehouse_layout)
-                            temp_neighbor_batch_tour_length, _ = calculate_tour_length_s_shape_routing(temp_neighbor_batch, warehouse_layout)
-
-                            # Check if the swap is an improvement
-                            if temp_incumbent_batch_tour_length + temp_neighbor_batch_tour_length < incumbent_batch_tour_length + neighbor_batch_tour_length:
-
-                                # Update the batches
-                                batches[i] = temp_incumbent_batch
-                                batches[j] = temp_neighbor_batch
-                                # Update the flag
-                                improvement_found = True
-                                # Break the loop
-                                break
-                        if improvement_found:
-                            break
-                if improvement_found:
+    local_search_settings = local_search_settings or default_local_search_settings
+    first_improvement = local_search_settings['improvement_policy'] == 'FIRST'
+    max_y_position = warehouse_layout['max_y_position']
+    routing_strategy = get_routing_strategy(warehouse_layout)
+    # Create the aisle profiles, sizes and tour lengths of the batches once
+    order_profiles = {}
+    batch_profiles = [create_batch_profile(get_order_profiles(batch['orders'], order_profiles, routing_strategy)) for batch in batches]
+    batch_sizes = [sum(len(order['items']) for order in batch['orders']) for batch in batches]
+    batch_tour_lengths = [calculate_tour_length_of_batch_profile(batch_profile, max_y_position, routing_strategy) for batch_profile in batch_profiles]
+    # Restrict the partner batches of every order to its candidate list, None for the full scan
+    candidate_lists = create_candidate_lists(batch_profiles, local_search_settings['neighborhood_size'])
+
+    # Initialize the counters of the instrumentation
+    moves_evaluated = 0
+    moves_accepted = 0
+    budget_exhausted = budget is not None and budget.is_exhausted()
+
+    # Continue until no improvement is found or the budget is exhausted
+    while not budget_exhausted:
+        # Scan the neighborhood for the first or the best improving swap
+        best_move = None
+        for i, j, incumbent_index, neighbor_index in iterate_swap_moves(batches, batch_sizes, max_batch_size, order_profiles, candidate_lists, local_search_settings['scan_order']):
+            # Calculate the change of the tour length caused by the swap
+            incumbent_order_profile = order_profiles[id(batches[i]['orders'][incumbent_index])]
+            neighbor_order_profile = order_profiles[id(batches[j]['orders'][neighbor_index])]
+            delta, incumbent_batch_tour_length, neighbor_batch_tour_length = evaluate_swap(batch_profiles[i], batch_profiles[j], incumbent_order_profile, neighbor_order_profile, batch_tour_lengths[i], batch_tour_lengths[j], max_y_position, routing_strategy)
+            moves_evaluated += 1
+            budget_exhausted = budget is not None and budget.spend()
+
+            # Remember the swap if it is an improvement and better than the improvements found before
+            if delta < 0 and (best_move is None or delta < best_move[0]):
+                best_move = (delta, i, j, incumbent_index, neighbor_index, incumbent_batch_tour_length, neighbor_batch_tour_length)
+                if first_improvement:
                     break
-            if improvement_found:
+            if budget_exhausted:
                 break
-                
-        if not improvement_found:
-            # Exit the loop as no improvement was found
-            is_optimal = True
+
+        # Exit the loop as no improvement was found
+        if best_move is None:
+            break
+
+        # Swap orders in their exact positions
+        _, i, j, incumbent_index, neighbor_index, incumbent_batch_tour_length, neighbor_batch_tour_length = best_move
+        incumbent_orders = list(batches[i]['orders'])
+        neighbor_orders = list(batches[j]['orders'])
+        incumbent_order = incumbent_orders[incumbent_index]
+        neighbor_order = neighbor_orders[neighbor_index]
+        incumbent_orders[incumbent_index] = neighbor_order
+        neighbor_orders[neighbor_index] = incumbent_order
+        # Update the batches
+        batches[i] = {**batches[i], 'orders': incumbent_orders}
+        batches[j] = {**batches[j], 'orders': neighbor_orders}
+        # Update the aisle profiles, sizes and tour lengths of the batches
+        incumbent_order_profile = order_profiles[id(incumbent_order)]
+        neighbor_order_profile = order_profiles[id(neighbor_order)]
+        remove_order_from_batch_profile(batch_profiles[i], incumbent_order_profile)
+        add_order_to_batch_profile(batch_profiles[i], neighbor_order_profile)
+        remove_order_from_batch_profile(batch_profiles[j], neighbor_order_profile)
+        add_order_to_batch_profile(batch_profiles[j], incumbent_order_profile)
+        size_difference = len(neighbor_order['items']) - len(incumbent_order['items'])
+        batch_sizes[i] += size_difference
+        batch_sizes[j] -= size_difference
+        batch_tour_lengths[i] = incumbent_batch_tour_length
+        batch_tour_lengths[j] = neighbor_batch_tour_length
+        if candidate_lists is not None:
+            candidate_lists.update_batches(i, j)
+        moves_accepted += 1
+
+    # Record the evaluated and accepted moves
+    if instrumentation.enabled:
+        instrumentation.count('moves_evaluated', moves_evaluated)
+        instrumentation.count('moves_accepted', moves_accepted)
 
     return batches
 
     
 
-def local_search_shift(batches, max_batch_size, warehouse_layout):
+@instrumentation.timed('local_search_shift')
+def local_search_shift(batches, max_batch_size, warehouse_layout, local_search_settings=None, budget=None):
     """
     This function is the shift operator of the local search phase of the adapted Iterated Local Search Algorithm by Henn.
+    Every candidate shift is evaluated by its change of the tour length using the aisle profiles of the batches, only accepted shifts are applied to the batches.
+    The settings select if the first or the best improving shift of a scan is applied, the scan order and the candidate lists of the orders.
 
     :param batches: A list of batches to optimize.
     :param max_batch_size: The maximum size of orders a batch can contain.
     :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan.
+    :param budget: Optional search budget, the batches improved so far are returned once it is exhausted.
     :return: A list of optimized batches.
     """
     # Initialize the variables
-    is_optimal = False
-    # Continue until no improvement is found
-    while not is_optimal:
-        # Initialize the flag
-        improvement_found = False
-        # Iterate over all pairs of batches
-        for i, incumbent_batch in enumerate(batches):
-            for j, neighbor_batch in enumerate(batches):
-                # Skip the same batch
-                if i != j:
-                    # Calculate the tour length of the incumbent and neighbor batch before the swap
-                    incumbent_batch_tour_length, _ = calculate_tour_length_s_shape_routing(incumbent_batch, warehouse_layout)
-                    neighbor_batch_tour_length, _ = calculate_tour_length_s_shape_routing(neighbor_batch, warehouse_layout)
-
-                    # Iterate over all pairs of orders
-                    for incumbent_order in list(incumbent_batch['orders']):
-                        # Create a copy of the batches to test the swap
-                        temp_incumbent_batch = copy.deepcopy(incumbent_batch)
-                        temp_neighbor_batch = copy.deepcopy(neighbor_batch)
-
-                        # Shift the order to the neighbor batch
-                        temp_incumbent_batch['orders'].remove(incumbent_order)
-                        temp_neighbor_batch['orders'].append(incumbent_order)
-
-                        # Ensure the batch sizes are within the maximum limit
-                        if sum(len(order['items']) for order in temp_incumbent_batch['orders']) > max_batch_size or \
-                               sum(len(order['items']) for order in temp_neighbor_batch['orders']) > max_batch_size:
-
-                            # Skip the shift
-                            continue
-
-                        # Calculate the tour length of the incumbent and neighbor batch after the shift
-                        temp_incumbent_batch_tour_length, _ = calculate_tour_length_s_shape_routing(temp_incumbent_batch, warehouse_layout)
-                        temp_neighbor_batch_tour_length, _ = calculate_tour_length_s_shape_routing(temp_neighbor_batch, warehouse_layout)
-
-                        # Check if the shift is an improvement
-                        if temp_incumbent_batch_tour_length + temp_neighbor_batch_tour_length < incumbent_batch_tour_length + neighbor_batch_tour_length:
-                        
-                            # Update the batches
-                            batches[i] = temp_incumbent_batch
-                            batches[j] = temp_neighbor_batch
-                            # Update the flag
-                            improvement_found = True
-                            # Break the loop
-                            break
-                    if improvement_found:
-                        break
-            if improvement_found:
+    local_search_settings = local_search_settings or default_local_search_settings
+    first_improvement = local_search_settings['improvement_policy'] == 'FIRST'
+    max_y_position = warehouse_layout['max_y_position']
+    routing_strategy = get_routing_strategy(warehouse_layout)
+    # Create the aisle profiles, sizes and tour lengths of the batches once
+    order_profiles = {}
+    batch_profiles = [create_batch_profile(get_order_profiles(batch['orders'], order_profiles, routing_strategy)) for batch in batches]
+    batch_sizes = [sum(len(order['items']) for order in batch['orders']) for batch in batches]
+    batch_tour_lengths = [calculate_tour_length_of_batch_profile(batch_profile, max_y_position, routing_strategy) for batch_profile in batch_profiles]
+    # Restrict the partner batches of every order to its candidate list, None for the full scan
+    candidate_lists = create_candidate_lists(batch_profiles, local_search_settings['neighborhood_size'])
+
+    # Initialize the counters of the instrumentation
+    moves_evaluated = 0
+    moves_accepted = 0
+    budget_exhausted = budget is not None and budget.is_exhausted()
+
+    # Continue until no improvement is found or the budget is exhausted
+    while not budget_exhausted:
+        # Scan the neighborhood for the first or the best improving shift
+        best_move = None
+        for i, j, position in iterate_shift_moves(batches, batch_sizes, max_batch_size, order_profiles, candidate_lists, local_search_settings['scan_order']):
+            # Calculate the change of the tour length caused by the shift
+            order_profile = order_profiles[id(batches[i]['orders'][position])]
+            delta, incumbent_batch_tour_length, neighbor_batch_tour_length = evaluate_shift(batch_profiles[i], batch_profiles[j], order_profile, batch_tour_lengths[i], batch_tour_lengths[j], max_y_position, routing_strategy)
+            moves_evaluated += 1
+            budget_exhausted = budget is not None and budget.spend()
+
+            # Remember the shift if it is an improvement and better than the improvements found before
+            if delta < 0 and (best_move is None or delta < best_move[0]):
+                best_move = (delta, i, j, position, incumbent_batch_tour_length, neighbor_batch_tour_length)
+                if first_improvement:
+                    break
+            if budget_exhausted:
                 break
-        
-        if not improvement_found:
-            # Exit the loop as no improvement was found
-            is_optimal = True
 
-            # Delete empty batches
-            batches = [batch for batch in batches if batch['orders']]
+        # Exit the loop as no improvement was found
+        if best_move is None:
+            break
+
+        # Shift the order to the neighbor batch
+        _, i, j, position, incumbent_batch_tour_length, neighbor_batch_tour_length = best_move
+        incumbent_orders = list(batches[i]['orders'])
+        order = incumbent_orders.pop(position)
+        # Update the batches
+        batches[i] = {**batches[i], 'orders': incumbent_orders}
+        batches[j] = {**batches[j], 'orders': batches[j]['orders'] + [order]}
+        # Update the aisle profiles, sizes and tour lengths of the batches
+        order_profile = order_profiles[id(order)]
+        remove_order_from_batch_profile(batch_profiles[i], order_profile)
+        add_order_to_batch_profile(batch_profiles[j], order_profile)
+        batch_sizes[i] -= len(order['items'])
+        batch_sizes[j] += len(order['items'])
+        batch_tour_lengths[i] = incumbent_batch_tour_length
+        batch_tour_lengths[j] = neighbor_batch_tour_length
+        if candidate_lists is not None:
+            candidate_lists.update_batches(i, j)
+        moves_accepted += 1
+
+    # Delete empty batches
+    batches = [batch for batch in batches if batch['orders']]
+
+    # Record the evaluated and accepted moves
+    if instrumentation.enabled:
+        instrumentation.count('moves_evaluated', moves_evaluated)
+        instrumentation.count('moves_accepted', moves_accepted)
 
     return batches
 
 
+def get_order_profiles(orders, order_profiles, routing_strategy=default_routing_strategy):
+    """
+    This function returns the aisle profiles of the orders and stores newly created profiles by the id of the order object.
 
+    :param orders: A list of orders.
+    :param order_profiles: A dictionary containing the already created order profiles.
+    :param routing_strategy: The name of the routing strategy the profiles are created for.
+    :return: A list of the order profiles.
+    """
+    for order in orders:
+        if id(order) not in order_profiles:
+            order_profiles[id(order)] = create_order_profile(order, routing_strategy)
+    return [order_profiles[id(order)] for order in orders]
+
+
+
+@instrumentation.timed('perturbation_phase')
 def perturbation_phase(batches, max_batch_size, rearrangement_parameter):
     """
     This function is the perturbation phase of the adapted Iterated Local Search Algorithm by Henn.
@@ -310,13 +533,18 @@ def perturbation_phase(batches, max_batch_size, rearrangement_parameter):
 
     # Perform the perturbation phase
     for _ in range(iterations):
+        # Only batches with orders can exchange orders, a former iteration can have emptied a batch
+        non_empty_batches = [batch for batch in batches_copy if batch['orders']]
+        if len(non_empty_batches) < 2:
+            break
+
         # Select two random batches
-        batch_k = random.choice(batches_copy)
-        batch_l = random.choice(batches_copy)
+        batch_k = random.choice(non_empty_batches)
+        batch_l = random.choice(non_empty_batches)
         
         # Ensure that the two batches are different
         while batch_k == batch_l:
-            batch_l = random.choice(batches_copy)
+            batch_l = random.choice(non_empty_batches)
 
         # Get random number of orders q
         q = random.randint(1, min(len(batch_k['orders']), len(batch_l['orders'])))
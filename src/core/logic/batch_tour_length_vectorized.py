@@ -0,0 +1,119 @@
+import numpy as np
+from src.core.logic import instrumentation
+from src.core.logic.aisle_summary import create_batch_aisle_summary
+from src.core.logic.routing_strategies import calculate_tour_length_from_aisle_summary, default_routing_strategy, get_routing_strategy
+
+
+def create_routing_arrays(batches):
+    '''
+    This function converts a list of batches into the compact arrays used by the vectorized S-Shape routing.
+
+    :param batches: A list of dictionaries, each containing the orders of a batch.
+    :return: Arrays containing the batch index, the x-coordinate and the y-coordinate of every item.
+    '''
+    batch_indices = []
+    x_positions = []
+    y_positions = []
+    for batch_index, batch in enumerate(batches):
+        for order in batch['orders']:
+            for item in order['items']:
+                batch_indices.append(batch_index)
+                x_positions.append(item['abs_x_position'])
+                y_positions.append(item['abs_y_position'])
+    return np.array(batch_indices, dtype=np.int64), np.array(x_positions, dtype=np.int64), np.array(y_positions, dtype=np.int64)
+
+
+def calculate_tour_lengths_s_shape_routing_vectorized(batch_indices, x_positions, y_positions, batch_count, max_y_position):
+    '''
+    This function calculates the S-Shape tour lengths of many batches at once.
+    It gives the same results as calculate_tour_length_s_shape_routing: the x-coordinates are transformed into aisles by ceil(x/2),
+    the tour starts and ends at (0, -1) and the aisles are traversed alternately upwards and downwards.
+
+    :param batch_indices: Array containing the batch index of every item.
+    :param x_positions: Array containing the untransformed x-coordinate of every item.
+    :param y_positions: Array containing the y-coordinate of every item.
+    :param batch_count: The amount of batches, batches without items get a tour length of 0.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: Array containing the tour length of every batch.
+    '''
+    tour_lengths = np.zeros(batch_count, dtype=np.int64)
+    if len(batch_indices) == 0:
+        return tour_lengths
+
+    # Transform the x-coordinate into aisles by dividing by 2 and rounding up
+    aisles = -(-np.asarray(x_positions, dtype=np.int64) // 2)
+    batch_indices = np.asarray(batch_indices, dtype=np.int64)
+    y_positions = np.asarray(y_positions, dtype=np.int64)
+
+    # Sort the items by batch, aisle and y-coordinate
+    order = np.lexsort((y_positions, aisles, batch_indices))
+    batch_indices = batch_indices[order]
+    aisles = aisles[order]
+    y_positions = y_positions[order]
+
+    # Group the items by batch and aisle, each group stores its lowest and highest y-coordinate
+    group_starts = np.flatnonzero(np.r_[True, (batch_indices[1:] != batch_indices[:-1]) | (aisles[1:] != aisles[:-1])])
+    group_ends = np.r_[group_starts[1:], len(batch_indices)] - 1
+    group_batches = batch_indices[group_starts]
+    group_aisles = aisles[group_starts]
+    group_min_y = y_positions[group_starts]
+    group_max_y = y_positions[group_ends]
+
+    # Get the position of every aisle within its batch, even aisles are traversed upwards and odd aisles downwards
+    first_group_of_batch = np.r_[True, group_batches[1:] != group_batches[:-1]]
+    first_group_indices = np.flatnonzero(first_group_of_batch)
+    group_ranks = np.arange(len(group_batches)) - np.repeat(first_group_indices, np.diff(np.r_[first_group_indices, len(group_batches)]))
+    upwards = group_ranks % 2 == 0
+
+    # The y-coordinate where the picker enters and leaves each aisle
+    entry_y = np.where(upwards, group_min_y, group_max_y)
+    exit_y = np.where(upwards, group_max_y, group_min_y)
+
+    # Distance within every aisle
+    distances = group_max_y - group_min_y
+
+    # Distance from the starting position (0, -1) to the first item of the first aisle
+    distances = distances + np.where(first_group_of_batch, np.abs(group_aisles) + np.abs(-1 - entry_y), 0)
+
+    # Distance from the previous aisle to the entry of the current aisle, passing the end of the aisles given by the walking direction
+    previous_exit_y = np.r_[0, exit_y[:-1]]
+    previous_aisles = np.r_[0, group_aisles[:-1]]
+    turning_y = np.where(upwards, -1, max_y_position)
+    transition = np.abs(previous_exit_y - turning_y) + np.abs(group_aisles - previous_aisles) + np.abs(turning_y - entry_y)
+    distances = distances + np.where(first_group_of_batch, 0, transition)
+
+    # Distance from the last item back to the starting position
+    last_group_of_batch = np.r_[group_batches[1:] != group_batches[:-1], True]
+    distances = distances + np.where(last_group_of_batch, np.abs(group_aisles) + np.abs(exit_y + 1), 0)
+
+    # Sum up the distances per batch
+    np.add.at(tour_lengths, group_batches, distances)
+    return tour_lengths
+
+
+@instrumentation.timed('calculate_tour_lengths_s_shape_routing_batched')
+def calculate_tour_lengths_s_shape_routing_batched(batches, warehouse_layout):
+    '''
+    This function calculates the S-Shape tour lengths of a list of batches in one vectorized pass.
+
+    :param batches: A list of dictionaries, each containing the orders of a batch.
+    :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :return: A list containing the tour length of every batch.
+    '''
+    batch_indices, x_positions, y_positions = create_routing_arrays(batches)
+    tour_lengths = calculate_tour_lengths_s_shape_routing_vectorized(batch_indices, x_positions, y_positions, len(batches), warehouse_layout['max_y_position'])
+    return tour_lengths.tolist()
+
+
+def calculate_tour_lengths_batched(batches, warehouse_layout):
+    '''
+    This function calculates the tour lengths of a list of batches with the routing strategy selected in the warehouse layout.
+    The S-Shape routing is calculated in one vectorized pass, the other routing strategies from the aisle summaries of the batches.
+
+    :param batches: A list of dictionaries, each containing the orders of a batch.
+    :param warehouse_layout: A dictionary containing the warehouse layout information and optionally the routing strategy.
+    :return: A list containing the tour length of every batch.
+    '''
+    if get_routing_strategy(warehouse_layout) == default_routing_strategy:
+        return calculate_tour_lengths_s_shape_routing_batched(batches, warehouse_layout)
+    return [calculate_tour_length_from_aisle_summary(create_batch_aisle_summary(batch), warehouse_layout) for batch in batches]
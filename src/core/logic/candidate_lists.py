@@ -0,0 +1,134 @@
+import heapq
+
+
+def create_aisle_bitset(profile):
+    '''
+    This function creates the aisle bitset of an order or batch profile, bit a is set if aisle a is visited.
+
+    :param profile: An order or batch profile, whose keys are the visited aisles.
+    :return: The aisle bitset as an integer.
+    '''
+    bitset = 0
+    for aisle in profile:
+        bitset |= 1 << aisle
+    return bitset
+
+
+def count_aisles(bitset):
+    '''
+    This function counts the aisles of an aisle bitset.
+
+    :param bitset: The aisle bitset.
+    :return: The amount of visited aisles.
+    '''
+    return bin(bitset).count('1')
+
+
+def rank_candidate_batch(order_bitset, batch_bitset, neighbor_index):
+    '''
+    This function ranks a partner batch of an order, lower ranks are more promising.
+
+    :param order_bitset: The aisle bitset of the order.
+    :param batch_bitset: The aisle bitset of the partner batch.
+    :param neighbor_index: The index of the partner batch, it breaks ties.
+    :return: A tuple of the negative amount of shared aisles, the amount of aisles the order extends beyond the highest aisle of the batch and the index.
+    '''
+    return (-count_aisles(order_bitset & batch_bitset), max(0, order_bitset.bit_length() - batch_bitset.bit_length()), neighbor_index)
+
+
+def rank_candidate_batches(order_bitset, batch_bitsets, batch_index, neighborhood_size):
+    '''
+    This function ranks the partner batches of an order by their aisle overlap and returns the most promising ones.
+    Batches sharing more aisles with the order come first. Among batches sharing the same amount of aisles,
+    batches which the order extends less beyond their highest aisle come first, as the highest aisle determines the walk along the front.
+
+    :param order_bitset: The aisle bitset of the order.
+    :param batch_bitsets: The aisle bitsets of all batches.
+    :param batch_index: The index of the batch containing the order, it is never a candidate.
+    :param neighborhood_size: The amount of partner batches to return.
+    :return: A list containing the indices of the candidate batches.
+    '''
+    neighbor_indices = (neighbor_index for neighbor_index in range(len(batch_bitsets)) if neighbor_index != batch_index)
+    return heapq.nsmallest(neighborhood_size, neighbor_indices, key=lambda neighbor_index: rank_candidate_batch(order_bitset, batch_bitsets[neighbor_index], neighbor_index))
+
+
+class CandidateLists:
+    '''
+    Class for the candidate lists of the swap and shift operators, which restrict the partner batches of an order to the top-k batches sharing the most aisles with it.
+    The candidates of an order are ranked when they are needed first. After a move, only the candidate lists which the changed batches enter or leave are ranked again,
+    and the candidates of a moved order are ranked again when they are needed in its new batch.
+    '''
+    def __init__(self, batch_profiles, neighborhood_size):
+        '''
+        Constructor of the candidate lists
+
+        :param batch_profiles: The list containing the batch profiles, it is read again whenever a batch changes.
+        :param neighborhood_size: The amount of partner batches per order.
+        '''
+        self.batch_profiles = batch_profiles
+        self.neighborhood_size = neighborhood_size
+        self.batch_bitsets = [create_aisle_bitset(batch_profile) for batch_profile in batch_profiles]
+        # The aisle bitsets of the orders never change
+        self.order_bitsets = {}
+        # Candidates of the orders as (index of the batch containing the order, candidate batches, rank of the worst candidate) tuples
+        self.candidates = {}
+
+
+    def get_candidate_batches(self, order_key, order_profile, batch_index):
+        '''
+        Get the candidate batches of an order
+
+        :param order_key: Key identifying the order, e.g. its index.
+        :param order_profile: The order profile of the order.
+        :param batch_index: The index of the batch containing the order.
+        :return: A set containing the indices of the candidate batches.
+        '''
+        entry = self.candidates.get(order_key)
+        # The candidates are ranked again if the order has moved to another batch since they were ranked
+        if entry is not None and entry[0] == batch_index:
+            return entry[1]
+        order_bitset = self.order_bitsets.get(order_key)
+        if order_bitset is None:
+            order_bitset = self.order_bitsets[order_key] = create_aisle_bitset(order_profile)
+        ranked_batches = rank_candidate_batches(order_bitset, self.batch_bitsets, batch_index, self.neighborhood_size)
+        worst_rank = rank_candidate_batch(order_bitset, self.batch_bitsets[ranked_batches[-1]], ranked_batches[-1])
+        candidate_batches = set(ranked_batches)
+        self.candidates[order_key] = (batch_index, candidate_batches, worst_rank)
+        return candidate_batches
+
+
+    def update_batches(self, *batch_indices):
+        '''
+        Update the aisle bitsets of batches after a move. A candidate list is only ranked again when it is needed next,
+        if a changed batch is one of its candidates or now ranks better than its worst candidate, as the ranks of the other batches did not change.
+
+        :param batch_indices: The indices of the changed batches.
+        '''
+        for batch_index in batch_indices:
+            self.batch_bitsets[batch_index] = create_aisle_bitset(self.batch_profiles[batch_index])
+        stale_order_keys = []
+        for order_key, (order_batch_index, candidate_batches, worst_rank) in self.candidates.items():
+            order_bitset = self.order_bitsets[order_key]
+            for batch_index in batch_indices:
+                if batch_index == order_batch_index:
+                    continue
+                if batch_index in candidate_batches or rank_candidate_batch(order_bitset, self.batch_bitsets[batch_index], batch_index) < worst_rank:
+                    stale_order_keys.append(order_key)
+                    break
+        for order_key in stale_order_keys:
+            del self.candidates[order_key]
+
+
+def create_candidate_lists(batch_profiles, neighborhood_size):
+    '''
+    This function creates the candidate lists of a local search operator.
+
+    :param batch_profiles: The list containing the batch profiles.
+    :param neighborhood_size: The amount of partner batches per order, None for the full scan.
+    :return: The candidate lists or None if every batch is a partner batch anyway.
+    '''
+    if neighborhood_size is None or neighborhood_size >= len(batch_profiles) - 1:
+        return None
+    if neighborhood_size < 1:
+        raise ValueError(f'The neighborhood size has to be at least 1, not {neighborhood_size}.')
+    return CandidateLists(batch_profiles, neighborhood_size)
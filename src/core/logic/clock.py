@@ -0,0 +1,118 @@
+import threading
+import time
+
+
+class SystemClock:
+    '''
+    Class for the clock of the real program, which uses the system time
+    '''
+    def time(self):
+        '''
+        Get the current time
+
+        :return: Current time in seconds since the epoch
+        '''
+        return time.time()
+
+
+    def sleep(self, seconds):
+        '''
+        Sleep for the given amount of seconds
+
+        :param seconds: Seconds to sleep
+        '''
+        time.sleep(seconds)
+
+
+    def wait(self, event, timeout=None):
+        '''
+        Block until the event is set or the timeout has passed
+
+        :param event: Threading event to wait for
+        :param timeout: Maximum seconds to wait, None to wait until the event is set
+        :return: True if the event is set, False otherwise
+        '''
+        return event.wait(timeout)
+
+
+class VirtualClock:
+    '''
+    Class for a virtual clock, which only advances when it is told to. It allows to simulate a whole day of warehouse operation in seconds.
+    '''
+    def __init__(self, start_time=0.0):
+        '''
+        Constructor of the virtual clock
+
+        :param start_time: Time the clock starts at
+        '''
+        self.current_time = start_time
+        self.lock = threading.Lock()
+
+
+    def time(self):
+        '''
+        Get the current virtual time
+
+        :return: Current virtual time in seconds
+        '''
+        with self.lock:
+            return self.current_time
+
+
+    def sleep(self, seconds):
+        '''
+        Advance the virtual time instead of sleeping
+
+        :param seconds: Seconds to advance
+        '''
+        with self.lock:
+            self.current_time += max(0.0, seconds)
+
+
+    def wait(self, event, timeout=None):
+        '''
+        Advance the virtual time by the timeout, unless the event is already set.
+        Without a timeout the virtual clock can not block, as nothing else would advance it.
+
+        :param event: Threading event to wait for
+        :param timeout: Maximum seconds to wait, None to only check the event
+        :return: True if the event is set, False otherwise
+        '''
+        if event.is_set():
+            return True
+        if timeout is not None:
+            self.sleep(timeout)
+        return event.is_set()
+
+
+    def advance_to(self, point_in_time):
+        '''
+        Advance the virtual time to the given point in time. The clock never goes back in time.
+
+        :param point_in_time: Point in time to advance to
+        '''
+        with self.lock:
+            self.current_time = max(self.current_time, point_in_time)
+
+
+# Clock used by the decision points and the logic thread
+clock = SystemClock()
+
+
+def get_clock():
+    '''
+    Get the clock used by the decision points and the logic thread
+
+    :return: The clock
+    '''
+    return clock
+
+
+def set_clock(new_clock):
+    '''
+    Set the clock used by the decision points and the logic thread
+
+    :param new_clock: The new clock, e.g. a VirtualClock for simulations
+    '''
+    global clock
+    clock = new_clock
@@ -0,0 +1,228 @@
+import array
+import hashlib
+import math
+import mmap
+import os
+import struct
+import sys
+
+import click
+
+# Header of a compiled layout: magic, version, byte order marker, SHA-256 checksum, size and modification time in nanoseconds of the source csv,
+# amount of item ids, amount of invalid item ids and the max positions
+header_format = '=8sII32sQqIIiii'
+header_size = struct.calcsize(header_format)
+magic = b'OOBLAYT\x00'
+version = 2
+byte_order_marker = 0x01020304
+# File extension of the compiled layout, which is stored next to the source csv
+compiled_layout_extension = '.layout'
+# Value of the x-coordinate of item ids which are not in the dataset or whose position is not an integer
+missing_position = -2 ** 31
+int32_range = range(-2 ** 31 + 1, 2 ** 31)
+
+
+class CompiledPositions:
+    '''
+    Class for the positions of a compiled layout, which are read from a memory-mapped file instead of being parsed.
+    The positions are a dense int32 array of (x, y, z) indexed by the item id, followed by the aisle of every item id.
+    As the file is only mapped, loading it takes no time and processes reading the same layout share its pages.
+    It provides the part of the dictionary interface the item location index uses for its positions.
+    '''
+    def __init__(self, file_map, item_count):
+        '''
+        Constructor of the compiled positions
+
+        :param file_map: Memory map of the compiled layout.
+        :param item_count: Amount of item ids in the dense arrays, the highest item id plus one.
+        '''
+        self.file_map = file_map
+        self.item_count = item_count
+        values = memoryview(file_map)[header_size:header_size + 16 * item_count].cast('i')
+        self.positions = values[:3 * item_count]
+        self.aisles = values[3 * item_count:]
+
+
+    def get(self, item_id, default=None):
+        '''
+        Get the position of an item id
+
+        :param item_id: The id of the item.
+        :param default: Value returned if the item id has no valid position.
+        :return: A tuple containing the x, y and z position of the item.
+        '''
+        if not isinstance(item_id, int) or not 0 <= item_id < self.item_count:
+            return default
+        index = 3 * item_id
+        abs_x_position = self.positions[index]
+        if abs_x_position == missing_position:
+            return default
+        return (abs_x_position, self.positions[index + 1], self.positions[index + 2])
+
+
+    def get_aisle(self, item_id):
+        '''
+        Get the aisle of an item id, which is precomputed the same way as in the S-Shape routing
+
+        :param item_id: The id of the item, it must have a valid position.
+        :return: The aisle of the item.
+        '''
+        return self.aisles[item_id]
+
+
+    def __contains__(self, item_id):
+        return self.get(item_id) is not None
+
+
+    def __len__(self):
+        return sum(1 for _ in self.items())
+
+
+    def items(self):
+        '''
+        Iterate over the item ids with a valid position
+
+        :return: A generator of the item ids and their positions.
+        '''
+        for item_id in range(self.item_count):
+            position = self.get(item_id)
+            if position is not None:
+                yield item_id, position
+
+
+def get_compiled_layout_path(dataset_path):
+    '''
+    This function returns the path of the compiled layout of a csv dataset.
+
+    :param dataset_path: The path to the csv dataset.
+    :return: The path to the compiled layout.
+    '''
+    return os.path.splitext(dataset_path)[0] + compiled_layout_extension
+
+
+def calculate_checksum(dataset_path):
+    '''
+    This function calculates the SHA-256 checksum of a csv dataset, which is stored in the compiled layout to detect stale files.
+
+    :param dataset_path: The path to the csv dataset.
+    :return: The checksum as bytes.
+    '''
+    checksum = hashlib.sha256()
+    with open(dataset_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1 << 20), b''):
+            checksum.update(chunk)
+    return checksum.digest()
+
+
+def get_source_stamp(dataset_path):
+    '''
+    This function returns the size and the modification time of a csv dataset, which are compared before the checksum, as they can be read without reading the csv.
+
+    :param dataset_path: The path to the csv dataset.
+    :return: A tuple containing the size in bytes and the modification time in nanoseconds.
+    '''
+    stat = os.stat(dataset_path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def write_compiled_layout(item_location_index, checksum, source_stamp, output_path):
+    '''
+    This function writes an item location index to a compiled layout.
+
+    :param item_location_index: The item location index as read from the csv dataset.
+    :param checksum: The checksum of the csv dataset.
+    :param source_stamp: The size and the modification time of the csv dataset.
+    :param output_path: The path of the compiled layout.
+    '''
+    positions = item_location_index['positions']
+    invalid_item_ids = item_location_index['invalid_item_ids']
+    # The item ids are the indices of the dense arrays, so they have to be non negative integers
+    for item_id in list(positions) + list(invalid_item_ids):
+        if not isinstance(item_id, int) or item_id < 0:
+            raise ValueError(f'Item ID {item_id} is not a non negative integer, the layout can not be compiled.')
+    for position in positions.values():
+        if not all(value in int32_range for value in position):
+            raise ValueError(f'The position {position} does not fit into 32 bit integers, the layout can not be compiled.')
+    item_count = max(list(positions) + list(invalid_item_ids), default=-1) + 1
+
+    # Fill the dense arrays, item ids without a valid position are marked as missing
+    position_array = array.array('i', [missing_position, 0, 0]) * item_count
+    aisle_array = array.array('i', [0]) * item_count
+    for item_id, (abs_x_position, abs_y_position, abs_z_position) in positions.items():
+        position_array[3 * item_id:3 * item_id + 3] = array.array('i', (abs_x_position, abs_y_position, abs_z_position))
+        # Divide the x-coordinate by 2 and round up to the nearest integer to transform the x-coordinate into corresponding aisles
+        aisle_array[item_id] = math.ceil(abs_x_position / 2)
+    invalid_array = array.array('i', sorted(invalid_item_ids))
+
+    header = struct.pack(
+        header_format, magic, version, byte_order_marker, checksum, source_stamp[0], source_stamp[1], item_count, len(invalid_array),
+        item_location_index['max_x_position'], item_location_index['max_y_position'], item_location_index['max_z_position'],
+    )
+    # Write to a temporary file first, so that processes mapping the layout never see a partially written file
+    temporary_path = f'{output_path}.{os.getpid()}.tmp'
+    with open(temporary_path, 'wb') as file:
+        file.write(header)
+        position_array.tofile(file)
+        aisle_array.tofile(file)
+        invalid_array.tofile(file)
+    os.replace(temporary_path, output_path)
+
+
+def open_compiled_layout(compiled_layout_path, dataset_path=None):
+    '''
+    This function maps a compiled layout into memory and creates the item location index out of it.
+    If the size and the modification time of the csv dataset are the ones stored in the layout, the csv is not read at all.
+    Otherwise, e.g. after the csv has been copied, the checksum of the csv decides if the layout is stale.
+
+    :param compiled_layout_path: The path to the compiled layout.
+    :param dataset_path: The path to the csv dataset the layout was compiled from, None to skip the check.
+    :return: The item location index or None if the file is not a compiled layout of this version or it is stale.
+    '''
+    with open(compiled_layout_path, 'rb') as file:
+        # Empty files can not be mapped
+        if os.fstat(file.fileno()).st_size < header_size:
+            return None
+        file_map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    file_magic, file_version, file_byte_order_marker, file_checksum, source_size, source_mtime_ns, item_count, invalid_count, max_x_position, max_y_position, max_z_position = struct.unpack_from(header_format, file_map)
+    # Layouts of another version or compiled on a machine with another byte order can not be read
+    if file_magic != magic or file_version != version or file_byte_order_marker != byte_order_marker:
+        return None
+    # Hash the csv only if its size or modification time changed since it was compiled
+    if dataset_path is not None and get_source_stamp(dataset_path) != (source_size, source_mtime_ns) and calculate_checksum(dataset_path) != file_checksum:
+        return None
+    if len(file_map) != header_size + 4 * (4 * item_count + invalid_count):
+        return None
+    positions = CompiledPositions(file_map, item_count)
+    invalid_offset = header_size + 16 * item_count
+    invalid_item_ids = set(memoryview(file_map)[invalid_offset:invalid_offset + 4 * invalid_count].cast('i'))
+    return {
+        'positions': positions,
+        'invalid_item_ids': invalid_item_ids,
+        'max_x_position': max_x_position,
+        'max_y_position': max_y_position,
+        'max_z_position': max_z_position,
+    }
+
+
+@click.command()
+@click.argument('dataset_path')
+@click.option('--output', 'output_path', default=None, help='Path of the compiled layout, next to the csv dataset if not given.')
+def main(dataset_path, output_path):
+    '''
+    Compile a warehouse layout [.csv] into a memory-mapped binary layout, which is used instead of the csv as long as the csv does not change
+    '''
+    # Imported here, as the item location index imports this module
+    from src.core.logic.join_item_information import read_item_location_csv
+    output_path = output_path or get_compiled_layout_path(dataset_path)
+    # The stamp is taken before the csv is read, so that a csv changing while it is compiled is detected by its modification time
+    source_stamp = get_source_stamp(dataset_path)
+    try:
+        write_compiled_layout(read_item_location_csv(dataset_path), calculate_checksum(dataset_path), source_stamp, output_path)
+    except ValueError as e:
+        click.secho(str(e), fg='red', err=True)
+        sys.exit(1)
+    click.echo(f'Compiled layout written to {output_path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,5 @@
-import pandas as pd
-from src.core.logic.join_item_information import join_item_id_and_position_csv
+from src.core.logic.join_item_information import join_order_items_and_positions_csv, load_item_location_index
+from src.core.logic.routing_strategies import default_routing_strategy
 import src.vars.shared_variables as shared_variables
 
 
@@ -10,19 +10,16 @@ def get_warehouse_layout():
     :return: warehouse_layout
     '''
     warehouse_layout_path = shared_variables.variables.get('warehouse_layout_path')
-    # Read the CSV file
-    df = pd.read_csv(warehouse_layout_path, sep=';')
-    
-    # Calculate the max positions and round them in case they are not integers
-    max_x_position = round(df['abs_x_position'].max())
-    max_y_position = round(df['abs_y_position'].max())
-    max_z_position = round(df['abs_z_position'].max())
+    # Get the item location index, which already contains the max positions of the warehouse
+    item_location_index = load_item_location_index(warehouse_layout_path)
     
     # Create the warehouse layout dictionary
     warehouse_layout = {
-        'max_x_position': max_x_position,
-        'max_y_position': max_y_position,
-        'max_z_position': max_z_position,
+        'max_x_position': item_location_index['max_x_position'],
+        'max_y_position': item_location_index['max_y_position'],
+        'max_z_position': item_location_index['max_z_position'],
+        # The routing strategy is part of the layout, so that every tour length calculation uses the strategy selected for the run
+        'routing_strategy': get_routing_strategy(),
     }
     return warehouse_layout
 
@@ -36,6 +33,16 @@ def get_warehouse_layout_path():
     return warehouse_layout_path
 
 
+def get_routing_strategy():
+    '''
+    Get the routing strategy from the shared variables
+
+    :return: routing_strategy
+    '''
+    routing_strategy = shared_variables.variables.get('routing_strategy') or default_routing_strategy
+    return routing_strategy
+
+
 def get_max_batch_size():
     '''
     Get the maximum batch size from the shared variables
@@ -105,6 +112,16 @@ def get_selection_rule():
     return selection_rule
 
 
+def get_amount_of_pickers():
+    '''
+    Get the amount of pickers from the shared variables, one picker if it is not set
+
+    :return: amount_of_pickers
+    '''
+    amount_of_pickers = shared_variables.variables.get('amount_of_pickers') or 1
+    return amount_of_pickers
+
+
 def get_input_process_running():
     '''
     Get the input process running variable from the shared variables
@@ -121,19 +138,27 @@ def get_new_order():
 
     :return: order
     '''
-    # Get the new order and remove it from the list
-    if shared_variables.orders:
-        new_order = shared_variables.orders.pop(0)
+    # Get the new order and remove it from the queue
+    new_order = shared_variables.orders.get()
+    if new_order is not None:
         # Add to each item the absolute position in the warehouse
-        for item in new_order['items']:
-            item_id = item['item_id']
-            item_data = join_item_id_and_position_csv(get_warehouse_layout_path(), item_id)
-            item['abs_x_position'] = item_data['abs_x_position']
-            item['abs_y_position'] = item_data['abs_y_position']
-            item['abs_z_position'] = item_data['abs_z_position']
-        return new_order
-    else:
-        return None
+        join_order_items_and_positions_csv(get_warehouse_layout_path(), new_order)
+    return new_order
+
+
+def get_new_orders(max_count=None):
+    '''
+    Get all pending new orders from the shared variables at once
+
+    :param max_count: Maximum amount of orders, None for all pending orders
+    :return: List of orders
+    '''
+    # Drain the pending orders from the queue
+    new_orders = shared_variables.orders.drain(max_count)
+    # Add to each item the absolute position in the warehouse
+    for new_order in new_orders:
+        join_order_items_and_positions_csv(get_warehouse_layout_path(), new_order)
+    return new_orders
 
 
 def get_last_order():
@@ -142,19 +167,12 @@ def get_last_order():
 
     :return: order
     '''
-    # Get the new order and remove it from the list
-    if shared_variables.last_orders:
-        new_order = shared_variables.last_orders.pop(0)
+    # Get the last order and remove it from the queue
+    new_order = shared_variables.last_orders.get()
+    if new_order is not None:
         # Add to each item the absolute position in the warehouse
-        for item in new_order['items']:
-            item_id = item['item_id']
-            item_data = join_item_id_and_position_csv(get_warehouse_layout_path(), item_id)
-            item['abs_x_position'] = item_data['abs_x_position']
-            item['abs_y_position'] = item_data['abs_y_position']
-            item['abs_z_position'] = item_data['abs_z_position']
-        return new_order
-    else:
-        return None
+        join_order_items_and_positions_csv(get_warehouse_layout_path(), new_order)
+    return new_order
 
 
 def is_new_order_available():
@@ -163,9 +181,6 @@ def is_new_order_available():
 
     :return: new_order_available: True if a new order is available, False otherwise
     '''
-    if shared_variables.orders.__len__() > 0:
-        new_order_available = True
-    else:
-        new_order_available = False
+    new_order_available = len(shared_variables.orders) > 0
 
     return new_order_available
\ No newline at end of file
@@ -0,0 +1,126 @@
+import functools
+import threading
+import time
+
+import click
+
+# Flag to switch the instrumentation on and off at runtime, instrumented code only checks this flag while it is disabled
+enabled = False
+# Recorded timers by name, each containing the amount of calls, the total and the maximum runtime in seconds
+timers = {}
+# Recorded counters by name
+counters = {}
+# Lock to allow recording from several threads
+lock = threading.Lock()
+
+
+def enable():
+    '''
+    Switch the instrumentation on
+    '''
+    global enabled
+    enabled = True
+
+
+def disable():
+    '''
+    Switch the instrumentation off, the recorded values are kept
+    '''
+    global enabled
+    enabled = False
+
+
+def reset():
+    '''
+    Remove all recorded timers and counters
+    '''
+    with lock:
+        timers.clear()
+        counters.clear()
+
+
+def add_time(name, seconds):
+    '''
+    Record one call of a timer
+
+    :param name: Name of the timer
+    :param seconds: Runtime of the call in seconds
+    '''
+    with lock:
+        timer = timers.get(name)
+        if timer is None:
+            timer = timers[name] = {'calls': 0, 'total_seconds': 0.0, 'max_seconds': 0.0}
+        timer['calls'] += 1
+        timer['total_seconds'] += seconds
+        timer['max_seconds'] = max(timer['max_seconds'], seconds)
+
+
+def count(name, amount=1):
+    '''
+    Increase a counter
+
+    :param name: Name of the counter
+    :param amount: Amount to add
+    '''
+    with lock:
+        counters[name] = counters.get(name, 0) + amount
+
+
+def timed(name):
+    '''
+    Decorator recording every call of the decorated function as a timer, while the instrumentation is enabled
+
+    :param name: Name of the timer
+    :return: The decorator
+    '''
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return function(*args, **kwargs)
+            start_time = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                add_time(name, time.perf_counter() - start_time)
+        return wrapper
+    return decorator
+
+
+def get_summary():
+    '''
+    Get the recorded timers and counters together with the derived rates
+
+    :return: Dictionary containing the timers, the counters and the moves evaluated per second
+    '''
+    with lock:
+        summary_timers = {
+            name: {**timer, 'mean_seconds': timer['total_seconds'] / timer['calls']}
+            for name, timer in sorted(timers.items())
+        }
+        summary_counters = dict(sorted(counters.items()))
+    # Moves are only evaluated by the swap and shift operators, so their runtime is the time spent evaluating moves
+    local_search_seconds = sum(timer['total_seconds'] for name, timer in summary_timers.items() if name.startswith(('local_search_swap', 'local_search_shift')))
+    moves_evaluated = summary_counters.get('moves_evaluated', 0)
+    return {
+        'timers': summary_timers,
+        'counters': summary_counters,
+        'moves_evaluated_per_second': moves_evaluated / local_search_seconds if local_search_seconds > 0 else 0.0,
+    }
+
+
+def print_summary():
+    '''
+    Print the recorded timers and counters to the console
+    '''
+    # Import tabulate only when the summary is printed, so that importing the instrumented modules stays cheap
+    from tabulate import tabulate
+
+    summary = get_summary()
+    click.echo('--- Instrumentation summary ---')
+    table_data = [[name, timer['calls'], f"{timer['total_seconds']:.4f}", f"{timer['mean_seconds'] * 1000:.3f}", f"{timer['max_seconds'] * 1000:.3f}"] for name, timer in summary['timers'].items()]
+    click.echo(tabulate(table_data, headers=['Timer', 'Calls', 'Total [s]', 'Mean [ms]', 'Max [ms]'], tablefmt='simple_grid'))
+    table_data = [[name, value] for name, value in summary['counters'].items()]
+    table_data.append(['moves_evaluated_per_second', f"{summary['moves_evaluated_per_second']:.0f}"])
+    click.echo(tabulate(table_data, headers=['Counter', 'Value'], tablefmt='simple_grid'))
+    click.echo('\n')
@@ -1,4 +1,154 @@
-import pandas as pd
+import csv
+import math
+import os
+
+import click
+from src.core.logic.aisle_summary import create_order_aisle_summary, get_single_order_tour_length
+from src.core.logic.compiled_layout import compiled_layout_extension, get_compiled_layout_path, get_source_stamp, open_compiled_layout
+from src.core.logic.routing_strategies import default_routing_strategy
+from src.vars import shared_variables
+
+# Loaded item location indices as (size and modification time of the dataset, index) tuples, stored per dataset path so that every layout file is only parsed once
+item_location_indices = {}
+
+# Columns of the dataset which are needed for later processing
+required_columns = ['item_id', 'abs_x_position', 'abs_y_position', 'abs_z_position']
+
+
+def parse_csv_value(value):
+    '''
+    This function converts a value of the csv dataset into an integer or a float, empty values become NaN and other values stay strings.
+
+    :param value: The value as read from the csv dataset.
+    :return: The converted value.
+    '''
+    value = value.strip()
+    if not value:
+        return math.nan
+    try:
+        return int(value)
+    except ValueError:
+        pass
+    try:
+        return float(value)
+    except ValueError:
+        return value
+
+
+def load_item_location_index(dataset_path):
+    '''
+    This function loads the item location index of a csv dataset containing the item id and the item position.
+    If the dataset has been compiled and the compiled layout matches the csv, the compiled layout is mapped instead of parsing the csv.
+    The dataset is only loaded again if its size or modification time has changed since it was loaded, otherwise the already loaded index is returned.
+
+    :param dataset_path: The path to the dataset containing the item id and the item position, or the path to a compiled layout.
+    :return: A dictionary containing the positions per item id, the item ids with non integer values and the maximum positions.
+    '''
+    # Return the index if the dataset has already been loaded and has not changed since, the stamp is taken before reading so that a change while reading loads it again
+    source_stamp = get_source_stamp(dataset_path)
+    loaded = item_location_indices.get(dataset_path)
+    if loaded is not None and loaded[0] == source_stamp:
+        return loaded[1]
+
+    item_location_index = None
+    if dataset_path.endswith(compiled_layout_extension):
+        # A compiled layout given directly can not be checked against its csv
+        item_location_index = open_compiled_layout(dataset_path)
+        if item_location_index is None:
+            raise ValueError(f'The file {dataset_path} is not a compiled layout of this version.')
+    elif os.path.exists(get_compiled_layout_path(dataset_path)):
+        item_location_index = open_compiled_layout(get_compiled_layout_path(dataset_path), dataset_path)
+        if item_location_index is None:
+            click.secho(f'The compiled layout of {dataset_path} is stale or invalid, the csv is parsed instead. Compile it again to speed up loading.', fg='yellow', err=True)
+    if item_location_index is None:
+        item_location_index = read_item_location_csv(dataset_path)
+
+    # Store the index for further calls
+    item_location_indices[dataset_path] = (source_stamp, item_location_index)
+    return item_location_index
+
+
+def read_item_location_csv(dataset_path):
+    '''
+    This function parses a csv dataset containing the item id and the item position into an item location index.
+
+    :param dataset_path: The path to the dataset containing the item id and the item position.
+    :return: A dictionary containing the positions per item id, the item ids with non integer values and the maximum positions.
+    '''
+    # Read the dataset with the csv module, which is much faster to import than pandas and is enough for a flat layout file
+    with open(dataset_path, 'r', newline='') as file:
+        reader = csv.reader(file, delimiter=';')
+        # Blank lines are skipped, also in front of the header
+        header = [column.strip() for column in next((line for line in reader if line), [])]
+
+        # Check if the dataset contains the required columns as they are needed for later processing
+        for column in required_columns:
+            if column not in header:
+                raise ValueError(f'The dataset does not contain the column {column}.')
+        column_indices = [header.index(column) for column in required_columns]
+
+        # Initialize the index
+        positions = {}
+        invalid_item_ids = set()
+        max_positions = [None, None, None]
+        # Iterate over all rows of the dataset once
+        for line in reader:
+            if not line or not any(value.strip() for value in line):
+                continue
+            row = [parse_csv_value(line[index]) if index < len(line) else math.nan for index in column_indices]
+            # Update the max positions with every numeric value, the same rows as the maximum of a column would include
+            for axis, value in enumerate(row[1:]):
+                if isinstance(value, (int, float)) and not math.isnan(value) and (max_positions[axis] is None or value > max_positions[axis]):
+                    max_positions[axis] = value
+            item_id = row[0]
+            # Convert float integers of the item id back to int
+            if isinstance(item_id, float) and item_id.is_integer():
+                item_id = int(item_id)
+            # Only the first occurrence of an item id is used
+            if item_id in positions or item_id in invalid_item_ids:
+                continue
+            # Check if all the values in the row are integers
+            if not all(isinstance(value, (int, float)) and float(value).is_integer() for value in row):
+                invalid_item_ids.add(item_id)
+                continue
+            # Store the position as a tuple of integers
+            positions[item_id] = (int(row[1]), int(row[2]), int(row[3]))
+
+    # Create the index dictionary
+    item_location_index = {
+        'positions': positions,
+        'invalid_item_ids': invalid_item_ids,
+        # Round the max positions in case they are not integers
+        'max_x_position': round(max_positions[0]) if max_positions[0] is not None else 0,
+        'max_y_position': round(max_positions[1]) if max_positions[1] is not None else 0,
+        'max_z_position': round(max_positions[2]) if max_positions[2] is not None else 0,
+    }
+    return item_location_index
+
+
+def clear_item_location_indices():
+    '''
+    This function removes all loaded item location indices, so that changed datasets are parsed again on the next call.
+    '''
+    item_location_indices.clear()
+
+
+def get_item_position(item_location_index, item_id):
+    '''
+    This function returns the position of an item from an item location index.
+
+    :param item_location_index: The item location index as returned by load_item_location_index.
+    :param item_id: The id of the item.
+    :return: A tuple containing the x, y and z position of the item.
+    '''
+    position = item_location_index['positions'].get(item_id)
+    if position is None:
+        # Check if the item ID exists in the dataset, but contains non integer values
+        if item_id in item_location_index['invalid_item_ids']:
+            raise ValueError(f'The position of item ID {item_id} is not an integer.')
+        raise ValueError(f'Item ID {item_id} not found in the dataset.')
+    return position
+
 
 def join_item_id_and_position_csv(dataset_path, item_id):
     '''
@@ -8,30 +158,35 @@ def join_item_id_and_position_csv(dataset_path, item_id):
     :param item_id: The id of the item.
     :return: A dictionary containing the item id and the item position.
     '''
-    # Load the dataset
-    dataset = pd.read_csv(dataset_path, delimiter=';')
+    # Get the position of the item from the index of the dataset
+    abs_x_position, abs_y_position, abs_z_position = get_item_position(load_item_location_index(dataset_path), item_id)
+    return {
+        'item_id': item_id,
+        'abs_x_position': abs_x_position,
+        'abs_y_position': abs_y_position,
+        'abs_z_position': abs_z_position,
+    }
 
-    # Check if the dataset contains the required columns as they are needed for later processing
-    required_columns = ['item_id', 'abs_x_position', 'abs_y_position', 'abs_z_position']
 
-    # Filter the dataset for the specific item ID
-    item_row = dataset[dataset['item_id'] == item_id]
+def join_order_items_and_positions_csv(dataset_path, order):
+    '''
+    This function adds the item position in the warehouse to every item of an order, given a csv dataset containing the item id and the item position.
 
-    # Check if the item ID exists in the dataset
-    if item_row.empty:
-        raise ValueError(f'Item ID {item_id} not found in the dataset.')
-    
-    # Check if all the values in the selected row are of type int
-    item_row = item_row.iloc[0]
-    for column in required_columns:
-        value = item_row[column]
-        if not (isinstance(value, (int, float)) and float(value).is_integer()):
-            raise ValueError(f'The value in column {column} is not an integer.')
-        
-    # Convert the row to a dictionary
-    item_data = item_row.to_dict()
-    # Convert float integers back to int
-    for key, value in item_data.items():
-        if isinstance(value, float) and value.is_integer():
-            item_data[key] = int(value)
-    return item_data
+    :param dataset_path: The path to the dataset containing the item id and the item position.
+    :param order: The order containing a list of items with their item id.
+    :return: The order with the item positions added to its items, its aisle summary and its single order tour length.
+    '''
+    item_location_index = load_item_location_index(dataset_path)
+    # Add to each item the absolute position in the warehouse
+    for item in order['items']:
+        item['abs_x_position'], item['abs_y_position'], item['abs_z_position'] = get_item_position(item_location_index, item['item_id'])
+    # Attach the aisle summary, so that the routing does not have to look at the items again, a compiled layout already contains the aisles of the items
+    positions = item_location_index['positions']
+    item_aisles = [positions.get_aisle(item['item_id']) for item in order['items']] if hasattr(positions, 'get_aisle') else None
+    order['aisle_summary'] = create_order_aisle_summary(order, item_aisles)
+    # Attach the single service time of the order, as it does not change as long as the layout stays the same
+    order.pop('single_order_tour_length', None)
+    warehouse_layout = {key: item_location_index[key] for key in ('max_x_position', 'max_y_position', 'max_z_position')}
+    warehouse_layout['routing_strategy'] = shared_variables.variables.get('routing_strategy') or default_routing_strategy
+    get_single_order_tour_length(order, warehouse_layout)
+    return order
@@ -0,0 +1,132 @@
+import random
+import time
+
+# Improvement policies of the swap and shift operators: apply the first improving move found or the best improving move of the whole neighborhood
+improvement_policies = ('FIRST', 'BEST')
+# Scan orders of the batches and orders: always the same order or a new random order for every scan of the neighborhood
+scan_orders = ('FIXED', 'RANDOM')
+
+# Settings of the local search, the defaults are the full scan of the original algorithm without a budget
+default_local_search_settings = {
+    'neighborhood_size': None,
+    'improvement_policy': 'FIRST',
+    'scan_order': 'FIXED',
+    'max_evaluations': None,
+    'phase_time_limit': None,
+}
+
+
+def create_local_search_settings(variables):
+    '''
+    This function creates the local search settings out of the variables of a run, missing settings get their default value.
+
+    :param variables: A dictionary containing the variables of the run, e.g. the shared variables.
+    :return: A dictionary containing the local search settings.
+    '''
+    local_search_settings = {name: variables.get(name) if variables.get(name) is not None else default for name, default in default_local_search_settings.items()}
+    if local_search_settings['improvement_policy'] not in improvement_policies:
+        raise ValueError(f"Unknown improvement policy {local_search_settings['improvement_policy']}.")
+    if local_search_settings['scan_order'] not in scan_orders:
+        raise ValueError(f"Unknown scan order {local_search_settings['scan_order']}.")
+    for name in ('neighborhood_size', 'max_evaluations'):
+        if local_search_settings[name] is not None and local_search_settings[name] < 1:
+            raise ValueError(f'The setting {name} has to be at least 1, not {local_search_settings[name]}.')
+    if local_search_settings['phase_time_limit'] is not None and local_search_settings['phase_time_limit'] <= 0:
+        raise ValueError(f"The setting phase_time_limit has to be positive, not {local_search_settings['phase_time_limit']}.")
+    return local_search_settings
+
+
+def get_earliest_deadline(*deadlines):
+    '''
+    This function returns the earliest of several deadlines.
+
+    :param deadlines: Points in time, None for no deadline.
+    :return: The earliest point in time or None if there is no deadline.
+    '''
+    deadlines = [deadline for deadline in deadlines if deadline is not None]
+    return min(deadlines) if deadlines else None
+
+
+def get_scan_order(count, scan_order):
+    '''
+    This function returns the order in which the batches or the orders of a batch are scanned.
+
+    :param count: The amount of batches or orders.
+    :param scan_order: The scan order, 'FIXED' or 'RANDOM'.
+    :return: The indices in scan order.
+    '''
+    if scan_order != 'RANDOM':
+        return range(count)
+    indices = list(range(count))
+    random.shuffle(indices)
+    return indices
+
+
+def get_candidate_scan_order(candidate_batches, scan_order):
+    '''
+    This function returns the order in which the candidate batches of an order are scanned.
+
+    :param candidate_batches: The indices of the candidate batches.
+    :param scan_order: The scan order, 'FIXED' or 'RANDOM'.
+    :return: The indices of the candidate batches in scan order, ascending for 'FIXED'.
+    '''
+    indices = sorted(candidate_batches)
+    if scan_order == 'RANDOM':
+        random.shuffle(indices)
+    return indices
+
+
+class SearchBudget:
+    '''
+    Class for the budget of a local search phase, which is shared by its swap and shift operators and checked after every evaluated move.
+    The budget is exhausted when the deadline has passed, the maximum amount of evaluations is reached or the stop event is set.
+    '''
+    def __init__(self, deadline=None, max_evaluations=None, stop_event=None):
+        '''
+        Constructor of the search budget
+
+        :param deadline: Point in time after which no further move is evaluated, None for no deadline.
+        :param max_evaluations: Maximum amount of evaluated moves, None for no maximum.
+        :param stop_event: Threading event, no further move is evaluated once it is set.
+        '''
+        self.deadline = deadline
+        self.max_evaluations = max_evaluations
+        self.stop_event = stop_event
+        self.evaluations = 0
+
+
+    def spend(self):
+        '''
+        Count an evaluated move
+
+        :return: True if the budget is exhausted, False otherwise.
+        '''
+        self.evaluations += 1
+        return self.is_exhausted()
+
+
+    def is_exhausted(self):
+        '''
+        Check if the budget is exhausted
+
+        :return: True if the budget is exhausted, False otherwise.
+        '''
+        if self.max_evaluations is not None and self.evaluations >= self.max_evaluations:
+            return True
+        if self.deadline is not None and time.time() >= self.deadline:
+            return True
+        return self.stop_event is not None and self.stop_event.is_set()
+
+
+def create_search_budget(local_search_settings, deadline=None, stop_event=None):
+    '''
+    This function creates the budget of a local search phase, which ends at the given deadline or after the time limit per phase, whichever comes first.
+
+    :param local_search_settings: A dictionary containing the local search settings.
+    :param deadline: Point in time after which the phase stops, None for no deadline.
+    :param stop_event: Threading event, the phase stops once it is set.
+    :return: The search budget.
+    '''
+    phase_time_limit = local_search_settings['phase_time_limit']
+    phase_deadline = time.time() + phase_time_limit if phase_time_limit is not None else None
+    return SearchBudget(get_earliest_deadline(deadline, phase_deadline), local_search_settings['max_evaluations'], stop_event)
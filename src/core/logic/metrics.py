@@ -0,0 +1,229 @@
+import csv
+import json
+import math
+import threading
+
+import click
+
+# Flag to switch the collection of the order metrics on and off, the dispatcher only checks this flag while it is disabled
+enabled = False
+# Percentiles of the running histograms
+percentiles = (50, 95, 99)
+# Metrics recorded for every order: the wait time until its batch is released, the tour time of its batch and the time from its arrival until its batch is picked
+order_metrics = ('wait_time', 'tour_time', 'completion_time')
+# Columns of the exported orders
+order_columns = ('order_id', 'batch_id', 'picker_id', 'order_arrival_time', 'tour_start_time', 'tour_end_time') + order_metrics
+# Lock to allow recording from several threads
+lock = threading.Lock()
+
+
+class RunningHistogram:
+    '''
+    Class for a running histogram with logarithmic buckets, its memory only depends on the range of the values and not on their amount.
+    Every bucket covers values up to a fixed ratio larger than the previous one, so the percentiles have the same relative precision for short and long times.
+    '''
+    def __init__(self, precision=0.01, min_value=0.001):
+        '''
+        Constructor of the running histogram
+
+        :param precision: Relative precision of the percentiles, e.g. 0.01 for 1%.
+        :param min_value: Smallest value which is distinguished, smaller values share the first bucket.
+        '''
+        self.growth = 1 + precision
+        self.min_value = min_value
+        # Amount of values by the index of their bucket
+        self.buckets = {}
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+
+
+    def add(self, value):
+        '''
+        Add a value to the histogram
+
+        :param value: The value to add
+        '''
+        bucket = math.ceil(math.log(value / self.min_value, self.growth)) if value > self.min_value else 0
+        self.buckets[bucket] = self.buckets.get(bucket, 0) + 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+
+    def get_percentile(self, percentile):
+        '''
+        Get a percentile of the added values
+
+        :param percentile: The percentile between 0 and 100
+        :return: The upper bound of the bucket containing the percentile, limited to the smallest and the largest value, None if no value was added
+        '''
+        if self.count == 0:
+            return None
+        # Rank of the percentile among the sorted values, starting at 1
+        rank = max(1, math.ceil(percentile / 100 * self.count))
+        seen = 0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen >= rank:
+                return min(self.max, max(self.min, self.min_value * self.growth ** bucket))
+        return self.max
+
+
+    def get_summary(self):
+        '''
+        Get the amount, the mean, the smallest and the largest value and the percentiles of the added values
+
+        :return: Dictionary containing the statistics of the histogram
+        '''
+        summary = {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else None,
+            'min': self.min,
+            'max': self.max,
+        }
+        summary.update({f'p{percentile}': self.get_percentile(percentile) for percentile in percentiles})
+        return summary
+
+
+# Running histograms by the name of the order metric
+histograms = {name: RunningHistogram() for name in order_metrics}
+# Recorded orders, each containing the values of the order columns
+orders = []
+# Time the first recorded order arrived and the last recorded tour ends, the makespan lies in between
+first_arrival_time = None
+last_tour_end_time = None
+amount_of_batches = 0
+
+
+def enable():
+    '''
+    Switch the collection of the order metrics on
+    '''
+    global enabled
+    enabled = True
+
+
+def disable():
+    '''
+    Switch the collection of the order metrics off, the recorded values are kept
+    '''
+    global enabled
+    enabled = False
+
+
+def reset():
+    '''
+    Remove all recorded orders and histograms
+    '''
+    global first_arrival_time, last_tour_end_time, amount_of_batches
+    with lock:
+        for name in order_metrics:
+            histograms[name] = RunningHistogram()
+        orders.clear()
+        first_arrival_time = None
+        last_tour_end_time = None
+        amount_of_batches = 0
+
+
+def record_tour(batch):
+    '''
+    Record the orders of a batch a picker starts the tour of, the start time, the arrival time and the tour time have already been added to the batch
+
+    :param batch: The batch of the tour, its orders contain their arrival time
+    '''
+    global first_arrival_time, last_tour_end_time, amount_of_batches
+    with lock:
+        amount_of_batches += 1
+        last_tour_end_time = batch['arrival_time'] if last_tour_end_time is None else max(last_tour_end_time, batch['arrival_time'])
+        for order in batch['orders']:
+            first_arrival_time = order['arrival_time'] if first_arrival_time is None else min(first_arrival_time, order['arrival_time'])
+            order_record = {
+                'order_id': order['order_id'],
+                'batch_id': batch.get('batch_id'),
+                'picker_id': batch.get('picker_id'),
+                'order_arrival_time': order['arrival_time'],
+                'tour_start_time': batch['start_time'],
+                'tour_end_time': batch['arrival_time'],
+                'wait_time': batch['start_time'] - order['arrival_time'],
+                'tour_time': batch['tour_time'],
+                'completion_time': batch['arrival_time'] - order['arrival_time'],
+            }
+            orders.append(order_record)
+            for name in order_metrics:
+                histograms[name].add(order_record[name])
+
+
+def get_summary():
+    '''
+    Get the makespan, the throughput and the running histograms of the order metrics
+
+    :return: Dictionary containing the amount of orders and batches, the makespan from the arrival of the first order until the end of the last tour, the orders picked per hour and the statistics of every order metric
+    '''
+    with lock:
+        makespan = last_tour_end_time - first_arrival_time if orders else 0.0
+        return {
+            'amount_of_orders': len(orders),
+            'amount_of_batches': amount_of_batches,
+            'makespan': makespan,
+            'orders_per_hour': len(orders) / makespan * 3600 if makespan > 0 else 0.0,
+            'histograms': {name: histograms[name].get_summary() for name in order_metrics},
+        }
+
+
+def write_csv(path):
+    '''
+    Write every recorded order with its metrics to a CSV file
+
+    :param path: Path of the CSV file
+    '''
+    with lock:
+        rows = list(orders)
+    with open(path, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=order_columns)
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def write_json(path):
+    '''
+    Write the summary and every recorded order with its metrics to a JSON file
+
+    :param path: Path of the JSON file
+    '''
+    summary = get_summary()
+    with lock:
+        summary['orders'] = list(orders)
+    with open(path, 'w') as file:
+        json.dump(summary, file, indent=2)
+
+
+def export(csv_path=None, json_path=None):
+    '''
+    Write the recorded order metrics to the given files, e.g. at shutdown
+
+    :param csv_path: Path of the CSV file or None
+    :param json_path: Path of the JSON file or None
+    '''
+    if csv_path:
+        write_csv(csv_path)
+    if json_path:
+        write_json(json_path)
+
+
+def print_summary():
+    '''
+    Print the makespan and the running histograms of the order metrics to the console
+    '''
+    # Import tabulate only when the summary is printed, so that importing the dispatcher stays cheap
+    from tabulate import tabulate
+
+    summary = get_summary()
+    click.echo('--- Order metrics summary ---')
+    click.echo(f"Orders: {summary['amount_of_orders']}, Batches: {summary['amount_of_batches']}, Makespan: {summary['makespan']:.1f} s, Orders per hour: {summary['orders_per_hour']:.1f}")
+    format_seconds = lambda value: f'{value:.2f}' if value is not None else '-'
+    table_data = [[name] + [format_seconds(histogram[key]) for key in ['mean'] + [f'p{percentile}' for percentile in percentiles] + ['max']] for name, histogram in summary['histograms'].items()]
+    click.echo(tabulate(table_data, headers=['Metric', 'Mean [s]'] + [f'P{percentile} [s]' for percentile in percentiles] + ['Max [s]'], tablefmt='simple_grid'))
+    click.echo('\n')
@@ -0,0 +1,219 @@
+import math
+from collections import Counter
+
+from src.core.logic.aisle_summary import get_order_aisle_summary
+from src.core.logic.routing_strategies import calculate_tour_length_s_shape_routing_from_statistics, default_routing_strategy, routing_strategies
+
+
+def create_order_profile(order, routing_strategy=default_routing_strategy):
+    '''
+    This function creates the aisle profile of an order, which is everything the routing needs to know about the order.
+    The x-coordinates are transformed into aisles the same way as in the S-Shape routing.
+
+    :param order: An order containing a list of items with their absolute positions.
+    :param routing_strategy: The name of the routing strategy, the S-Shape routing only needs the highest y-coordinate per aisle, the other strategies also need the lowest one.
+    :return: A dictionary containing the transformed aisles of the order and the highest y-coordinate or the lowest and highest y-coordinate visited in each aisle.
+    '''
+    # The other routing strategies are calculated from the aisle summary, which also contains the lowest y-coordinate
+    if routing_strategy != default_routing_strategy:
+        return {aisle: (min_y, max_y) for aisle, min_y, max_y in get_order_aisle_summary(order)}
+    # Use the aisle summary attached to enriched orders instead of looking at every item
+    if order.get('aisle_summary') is not None:
+        return {aisle: max_y for aisle, _, max_y in order['aisle_summary']}
+    order_profile = {}
+    for item in order['items']:
+        # Divide the x-coordinate by 2 and round up to the nearest integer to transform the x-coordinate into corresponding aisles
+        aisle = math.ceil(item['abs_x_position'] / 2)
+        # Store the highest y-coordinate of the aisle
+        if aisle not in order_profile or item['abs_y_position'] > order_profile[aisle]:
+            order_profile[aisle] = item['abs_y_position']
+    return order_profile
+
+
+def create_batch_profile(order_profiles):
+    '''
+    This function creates the aisle profile of a batch out of the aisle profiles of its orders.
+    For every aisle it counts how many orders reach which highest y-coordinate, or which lowest and highest y-coordinate, so that orders can be removed again without looking at the other orders.
+
+    :param order_profiles: A list of order profiles as created by create_order_profile.
+    :return: A dictionary containing the visited aisles of the batch and a counter of the highest y-coordinates of its orders per aisle.
+    '''
+    batch_profile = {}
+    for order_profile in order_profiles:
+        add_order_to_batch_profile(batch_profile, order_profile)
+    return batch_profile
+
+
+def add_order_to_batch_profile(batch_profile, order_profile):
+    '''
+    This function adds the aisle profile of an order to the aisle profile of a batch.
+
+    :param batch_profile: The batch profile to update.
+    :param order_profile: The order profile to add.
+    '''
+    for aisle, max_y in order_profile.items():
+        if aisle not in batch_profile:
+            batch_profile[aisle] = Counter()
+        batch_profile[aisle][max_y] += 1
+
+
+def remove_order_from_batch_profile(batch_profile, order_profile):
+    '''
+    This function removes the aisle profile of an order from the aisle profile of a batch.
+
+    :param batch_profile: The batch profile to update.
+    :param order_profile: The order profile to remove.
+    '''
+    for aisle, max_y in order_profile.items():
+        aisle_counter = batch_profile[aisle]
+        aisle_counter[max_y] -= 1
+        if aisle_counter[max_y] == 0:
+            del aisle_counter[max_y]
+        # Remove the aisle if no order visits it anymore
+        if not aisle_counter:
+            del batch_profile[aisle]
+
+
+def create_aisle_summary_of_batch_profile(batch_profile):
+    '''
+    This function creates the aisle summary of a batch out of a batch profile of the routing strategies other than the S-Shape routing.
+
+    :param batch_profile: A dictionary containing the visited aisles and a counter of the lowest and highest y-coordinates of the orders per aisle.
+    :return: A list of (aisle, lowest y-coordinate, highest y-coordinate) entries sorted by the aisle.
+    '''
+    return [(aisle, min(min_y for min_y, _ in batch_profile[aisle]), max(max_y for _, max_y in batch_profile[aisle])) for aisle in sorted(batch_profile)]
+
+
+def calculate_tour_length_of_batch_profile(batch_profile, max_y_position, routing_strategy=default_routing_strategy):
+    '''
+    This function calculates the tour length of a batch from its aisle profile.
+
+    :param batch_profile: The batch profile as created by create_batch_profile.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :param routing_strategy: The name of the routing strategy the profile has been created for.
+    :return: The tour length.
+    '''
+    if not batch_profile:
+        return 0
+    if routing_strategy != default_routing_strategy:
+        return routing_strategies[routing_strategy](create_aisle_summary_of_batch_profile(batch_profile), max_y_position)
+    max_aisle = max(batch_profile)
+    return calculate_tour_length_s_shape_routing_from_statistics(len(batch_profile), max_aisle, max(batch_profile[max_aisle]), max_y_position)
+
+
+def calculate_tour_length_after_move(batch_profile, removed_order_profiles, added_order_profiles, max_y_position, routing_strategy=default_routing_strategy):
+    '''
+    This function calculates the tour length of a batch after removing and adding orders without changing the batch profile.
+    For the S-Shape routing, only the aisles visited by the moved orders are looked at, except if the highest aisle of the batch is left completely.
+    The other routing strategies depend on every visited aisle, so the aisle summary after the move is created and routed.
+
+    :param batch_profile: The batch profile before the move.
+    :param removed_order_profiles: A list of order profiles to remove from the batch.
+    :param added_order_profiles: A list of order profiles to add to the batch.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :param routing_strategy: The name of the routing strategy the profiles have been created for.
+    :return: The tour length after the move.
+    '''
+    if routing_strategy != default_routing_strategy:
+        moved_batch_profile = {aisle: Counter(aisle_counter) for aisle, aisle_counter in batch_profile.items()}
+        for order_profile in removed_order_profiles:
+            remove_order_from_batch_profile(moved_batch_profile, order_profile)
+        for order_profile in added_order_profiles:
+            add_order_to_batch_profile(moved_batch_profile, order_profile)
+        return calculate_tour_length_of_batch_profile(moved_batch_profile, max_y_position, routing_strategy)
+
+    # Collect the changes of the highest y-coordinates per touched aisle
+    changes = {}
+    for order_profile in removed_order_profiles:
+        for aisle, max_y in order_profile.items():
+            aisle_changes = changes.setdefault(aisle, {})
+            aisle_changes[max_y] = aisle_changes.get(max_y, 0) - 1
+    for order_profile in added_order_profiles:
+        for aisle, max_y in order_profile.items():
+            aisle_changes = changes.setdefault(aisle, {})
+            aisle_changes[max_y] = aisle_changes.get(max_y, 0) + 1
+
+    # Determine the amount of visited aisles and the touched aisles which remain visited
+    aisle_count = len(batch_profile)
+    remaining_touched_aisles = {}
+    removed_aisles = set()
+    for aisle, aisle_changes in changes.items():
+        aisle_counter = batch_profile.get(aisle)
+        # Find the highest y-coordinate which is still reached by an order after applying the changes
+        remaining_max_y = None
+        if aisle_counter is not None:
+            for max_y, count in aisle_counter.items():
+                if count + aisle_changes.get(max_y, 0) > 0 and (remaining_max_y is None or max_y > remaining_max_y):
+                    remaining_max_y = max_y
+        for max_y, change in aisle_changes.items():
+            if change > 0 and (aisle_counter is None or max_y not in aisle_counter) and (remaining_max_y is None or max_y > remaining_max_y):
+                remaining_max_y = max_y
+        if remaining_max_y is not None:
+            remaining_touched_aisles[aisle] = remaining_max_y
+            if aisle_counter is None:
+                aisle_count += 1
+        elif aisle_counter is not None:
+            removed_aisles.add(aisle)
+            aisle_count -= 1
+
+    if aisle_count == 0:
+        return 0
+
+    # Determine the highest visited aisle after the move
+    max_aisle = max(remaining_touched_aisles) if remaining_touched_aisles else -math.inf
+    if batch_profile:
+        current_max_aisle = max(batch_profile)
+        if current_max_aisle in removed_aisles:
+            # The highest aisle is left, so the next highest untouched aisle has to be searched
+            untouched_aisles = [aisle for aisle in batch_profile if aisle not in changes]
+            if untouched_aisles:
+                max_aisle = max(max_aisle, max(untouched_aisles))
+        else:
+            max_aisle = max(max_aisle, current_max_aisle)
+
+    # Determine the highest y-coordinate of the highest aisle after the move
+    if max_aisle in remaining_touched_aisles:
+        max_y_last_aisle = remaining_touched_aisles[max_aisle]
+    else:
+        max_y_last_aisle = max(batch_profile[max_aisle])
+
+    return calculate_tour_length_s_shape_routing_from_statistics(aisle_count, max_aisle, max_y_last_aisle, max_y_position)
+
+
+def evaluate_swap(incumbent_batch_profile, neighbor_batch_profile, incumbent_order_profile, neighbor_order_profile, incumbent_batch_tour_length, neighbor_batch_tour_length, max_y_position, routing_strategy=default_routing_strategy):
+    '''
+    This function evaluates swapping an order of the incumbent batch with an order of the neighbor batch.
+
+    :param incumbent_batch_profile: The batch profile of the incumbent batch.
+    :param neighbor_batch_profile: The batch profile of the neighbor batch.
+    :param incumbent_order_profile: The order profile of the order leaving the incumbent batch.
+    :param neighbor_order_profile: The order profile of the order leaving the neighbor batch.
+    :param incumbent_batch_tour_length: The current tour length of the incumbent batch.
+    :param neighbor_batch_tour_length: The current tour length of the neighbor batch.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :param routing_strategy: The name of the routing strategy the profiles have been created for.
+    :return: The change of the total tour length, the new tour length of the incumbent batch and the new tour length of the neighbor batch.
+    '''
+    new_incumbent_batch_tour_length = calculate_tour_length_after_move(incumbent_batch_profile, [incumbent_order_profile], [neighbor_order_profile], max_y_position, routing_strategy)
+    new_neighbor_batch_tour_length = calculate_tour_length_after_move(neighbor_batch_profile, [neighbor_order_profile], [incumbent_order_profile], max_y_position, routing_strategy)
+    delta = new_incumbent_batch_tour_length + new_neighbor_batch_tour_length - incumbent_batch_tour_length - neighbor_batch_tour_length
+    return delta, new_incumbent_batch_tour_length, new_neighbor_batch_tour_length
+
+
+def evaluate_shift(incumbent_batch_profile, neighbor_batch_profile, order_profile, incumbent_batch_tour_length, neighbor_batch_tour_length, max_y_position, routing_strategy=default_routing_strategy):
+    '''
+    This function evaluates shifting an order from the incumbent batch to the neighbor batch.
+
+    :param incumbent_batch_profile: The batch profile of the incumbent batch.
+    :param neighbor_batch_profile: The batch profile of the neighbor batch.
+    :param order_profile: The order profile of the shifted order.
+    :param incumbent_batch_tour_length: The current tour length of the incumbent batch.
+    :param neighbor_batch_tour_length: The current tour length of the neighbor batch.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :param routing_strategy: The name of the routing strategy the profiles have been created for.
+    :return: The change of the total tour length, the new tour length of the incumbent batch and the new tour length of the neighbor batch.
+    '''
+    new_incumbent_batch_tour_length = calculate_tour_length_after_move(incumbent_batch_profile, [order_profile], [], max_y_position, routing_strategy)
+    new_neighbor_batch_tour_length = calculate_tour_length_after_move(neighbor_batch_profile, [], [order_profile], max_y_position, routing_strategy)
+    delta = new_incumbent_batch_tour_length + new_neighbor_batch_tour_length - incumbent_batch_tour_length - neighbor_batch_tour_length
+    return delta, new_incumbent_batch_tour_length, new_neighbor_batch_tour_length
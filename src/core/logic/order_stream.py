@@ -0,0 +1,159 @@
+import json
+import re
+import sys
+import threading
+
+# Whitespace and separators between the elements of a JSON array
+array_separator = re.compile(r'[\s,]*')
+
+
+def iterate_json_lines(file, first_line=''):
+    '''
+    This function reads orders from a JSON Lines file, one order per line. Empty lines are skipped.
+
+    :param file: The opened file.
+    :param first_line: A line which has already been read from the file.
+    :return: A generator of the orders.
+    '''
+    if first_line.strip():
+        yield json.loads(first_line)
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iterate_json_array(file, buffer='', chunk_size=65536):
+    '''
+    This function reads orders from a file containing a JSON array without loading the whole array.
+    The file is read in chunks and every complete order is decoded as soon as it is in the buffer.
+
+    :param file: The opened file.
+    :param buffer: Text which has already been read from the file, starting with the opening bracket of the array.
+    :param chunk_size: Amount of characters read at once.
+    :return: A generator of the orders.
+    '''
+    decoder = json.JSONDecoder()
+    buffer = buffer.lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('The orders are not a JSON array.')
+    position = 1
+    while True:
+        position = array_separator.match(buffer, position).end()
+        if buffer.startswith(']', position):
+            return
+        try:
+            order, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            # The order is not complete yet, so drop the decoded part of the buffer and read the next chunk
+            chunk = file.read(chunk_size)
+            if not chunk:
+                raise ValueError('The JSON array of the orders is incomplete.')
+            buffer = buffer[position:] + chunk
+            position = 0
+            continue
+        yield order
+
+
+def iterate_orders(file):
+    '''
+    This function reads orders from a file either containing a JSON array or JSON Lines, the format is detected from the first character.
+
+    :param file: The opened file.
+    :return: A generator of the orders.
+    '''
+    # Skip leading empty lines to find the first character
+    line = file.readline()
+    while line and not line.strip():
+        line = file.readline()
+    if line.lstrip().startswith('['):
+        return iterate_json_array(file, line)
+    return iterate_json_lines(file, line)
+
+
+class OrderStream:
+    '''
+    Class for a stream of orders, which reads the orders from a file or from stdin one at a time when they are consumed.
+    Only the next order is read ahead, so the memory does not depend on the size of the file but on the orders which are in flight.
+    The stream provides the same get method as the order queue and is truthy as long as it contains orders.
+    '''
+    def __init__(self, order_path, arrival_interval=None):
+        '''
+        Constructor of the order stream
+
+        :param order_path: Path to a JSON or JSON Lines file containing the orders, '-' to read them from stdin.
+        :param arrival_interval: Seconds between two orders without an arrival time, None to keep them without an arrival time.
+        :raises ValueError: If the file contains no orders or is not valid JSON.
+        '''
+        # Open the file right away, so that a wrong path is reported before the program starts
+        self.file = sys.stdin if order_path == '-' else open(order_path, 'r')
+        self.orders = iterate_orders(self.file)
+        self.arrival_interval = arrival_interval
+        # Amount of orders read from the stream
+        self.consumed = 0
+        # Lock to read the stream from several threads
+        self.lock = threading.Lock()
+        # Read the first order ahead, so that an empty file is reported before the program starts like a wrong path
+        try:
+            self.next_order = self.read_order()
+        except ValueError:
+            self.close()
+            raise
+        if self.next_order is None:
+            raise ValueError(f'The file {order_path} contains no orders.')
+
+
+    def __bool__(self):
+        return self.next_order is not None
+
+
+    def __iter__(self):
+        order = self.get()
+        while order is not None:
+            yield order
+            order = self.get()
+
+
+    def read_order(self):
+        '''
+        Read the next order from the file and close the file at its end
+
+        :return: The next order or None if the file is exhausted.
+        '''
+        order = next(self.orders, None)
+        if order is None:
+            self.close()
+            return None
+        if self.arrival_interval is not None:
+            order.setdefault('arrival_time', self.consumed * self.arrival_interval)
+        self.consumed += 1
+        return order
+
+
+    def peek(self):
+        '''
+        Get the next order without removing it from the stream
+
+        :return: The next order or None if the stream is exhausted.
+        '''
+        return self.next_order
+
+
+    def get(self):
+        '''
+        Remove and return the next order of the stream
+
+        :return: The next order or None if the stream is exhausted.
+        '''
+        with self.lock:
+            order = self.next_order
+            if order is not None:
+                self.next_order = self.read_order()
+            return order
+
+
+    def close(self):
+        '''
+        Close the file of the stream, stdin is kept open
+        '''
+        if self.file is not sys.stdin and not self.file.closed:
+            self.file.close()
@@ -0,0 +1,134 @@
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+import click
+from src.core.logic.batch_assignment_minimizer import iterated_local_search_array
+from src.core.logic.batch_tour_length_minimizer import iterated_local_search
+from src.core.logic.batch_tour_length_vectorized import calculate_tour_lengths_batched
+
+# Seconds the chains may take beyond the deadline to return their result, they stop evaluating moves at the deadline themselves
+result_grace_period = 0.05
+
+# Process pool shared by all decision points, as starting the worker processes takes longer than a typical time limit
+process_pool = None
+process_pool_workers = 0
+
+
+def get_process_pool(workers):
+    '''
+    This function returns the shared process pool and creates it on the first call or if the amount of workers changed.
+
+    :param workers: The amount of worker processes.
+    :return: The process pool.
+    '''
+    global process_pool, process_pool_workers
+    if process_pool is None or process_pool_workers != workers:
+        shutdown_process_pool()
+        process_pool = ProcessPoolExecutor(max_workers=workers)
+        process_pool_workers = workers
+    return process_pool
+
+
+def shutdown_process_pool():
+    '''
+    This function shuts down the shared process pool, if it exists.
+    '''
+    global process_pool, process_pool_workers
+    if process_pool is not None:
+        process_pool.shutdown(wait=False, cancel_futures=True)
+        process_pool = None
+        process_pool_workers = 0
+
+
+def create_chain_rearrangement_parameters(rearrangement_parameter, chains):
+    '''
+    This function spreads the perturbation strength of the chains evenly between half and one and a half times the given rearrangement parameter.
+    The first chain always uses the given rearrangement parameter.
+
+    :param rearrangement_parameter: A constant between [0;1] which determines the amount of perturbation.
+    :param chains: The amount of chains.
+    :return: A list containing the rearrangement parameter of every chain.
+    '''
+    rearrangement_parameters = [rearrangement_parameter]
+    for chain in range(1, chains):
+        factor = 0.5 + chain / (chains - 1) if chains > 2 else 1.5
+        rearrangement_parameters.append(min(1.0, rearrangement_parameter * factor))
+    return rearrangement_parameters
+
+
+def run_iterated_local_search_chain(s_start, max_batch_size, warehouse_layout, rearrangement_parameter, threshold_parameter, time_limit, deadline, seed, ils_engine, local_search_settings=None):
+    '''
+    This function runs one chain of the iterated local search algorithm inside a worker process.
+
+    :param s_start: A list of batches to optimize.
+    :param max_batch_size: The maximum size of orders a batch can contain.
+    :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :param rearrangement_parameter: A constant between [0;1] which determines the amount of perturbation.
+    :param threshold_parameter: A constant between [0;1] which determines the threshold to choose a solution.
+    :param time_limit: The maximum time in seconds the algorithm is allowed to run without improvement.
+    :param deadline: Point in time after which the chain stops.
+    :param seed: Seed of the random number generator of the chain.
+    :param ils_engine: The engine of the iterated local search, 'ARRAY' or 'DICT'.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan without a budget.
+    :return: The total tour length and the batches of the best solution of the chain.
+    '''
+    # Every chain needs its own random sequence
+    random.seed(seed)
+    if ils_engine == 'ARRAY':
+        batches = iterated_local_search_array(s_start, max_batch_size, warehouse_layout, None, rearrangement_parameter, threshold_parameter, time_limit, deadline, local_search_settings)
+    else:
+        batches = iterated_local_search(s_start, max_batch_size, warehouse_layout, None, rearrangement_parameter, threshold_parameter, time_limit, deadline, local_search_settings)
+    return sum(calculate_tour_lengths_batched(batches, warehouse_layout)), batches
+
+
+def parallel_iterated_local_search(s_start, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, workers, exchange_rounds=1, ils_engine='DICT', local_search_settings=None):
+    '''
+    This function runs independent chains of the iterated local search algorithm in a process pool and keeps the best solution.
+    Every chain gets its own seed and perturbation strength. All chains stop at the time limit, so that the wall-clock time stays the same as for a single chain.
+    The chains share one deadline per round, results arriving later than a short grace period after it are ignored.
+    With more than one exchange round, the time limit is split into rounds and every round restarts all chains from the best solution found so far.
+
+    :param s_start: A list of batches to optimize.
+    :param max_batch_size: The maximum size of orders a batch can contain.
+    :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :param rearrangement_parameter: A constant between [0;1] which determines the amount of perturbation.
+    :param threshold_parameter: A constant between [0;1] which determines the threshold to choose a solution.
+    :param time_limit: The maximum time in seconds the algorithm is allowed to run.
+    :param workers: The amount of chains running in parallel.
+    :param exchange_rounds: The amount of rounds after which the chains exchange their best solution.
+    :param ils_engine: The engine of the iterated local search, 'ARRAY' or 'DICT'.
+    :param local_search_settings: A dictionary containing the local search settings, None for the full scan without a budget.
+    :return: A list of optimized batches.
+    '''
+    start_time = time.time()
+    best_batches = s_start
+    best_tour_length = sum(calculate_tour_lengths_batched(s_start, warehouse_layout))
+    rearrangement_parameters = create_chain_rearrangement_parameters(rearrangement_parameter, workers)
+    pool = get_process_pool(workers)
+
+    for exchange_round in range(exchange_rounds):
+        # Every round ends at its share of the time limit
+        deadline = start_time + time_limit * (exchange_round + 1) / exchange_rounds
+        round_time_limit = deadline - time.time()
+        if round_time_limit <= 0:
+            break
+        # Start the chains from the best solution found so far
+        futures = [pool.submit(run_iterated_local_search_chain, best_batches, max_batch_size, warehouse_layout, rearrangement_parameters[chain], threshold_parameter, round_time_limit, deadline, random.randrange(2**32), ils_engine, local_search_settings) for chain in range(workers)]
+        # Wait for all chains at once until the shared deadline, the chains check the deadline after every evaluated move
+        done, not_done = wait(futures, timeout=max(0.0, deadline - time.time()) + result_grace_period)
+        # Chains which have not started yet are cancelled, running chains end at the deadline on their own
+        for future in not_done:
+            future.cancel()
+        # Keep the best solution of all chains
+        for future in done:
+            try:
+                tour_length, batches = future.result()
+            except Exception as e:
+                click.secho(f'parallel_iterated_local_search encountered an error: {e}', fg='red')
+                continue
+            if tour_length < best_tour_length:
+                best_tour_length = tour_length
+                best_batches = batches
+
+    return best_batches
@@ -0,0 +1,145 @@
+from src.core.logic import metrics
+
+
+class Picker:
+    '''
+    Class for the tour state of a picker
+    '''
+    def __init__(self, picker_id, available_time=0.0):
+        '''
+        Constructor of the picker
+
+        :param picker_id: ID of the picker, starting at 1.
+        :param available_time: Time the picker is available for the first tour.
+        '''
+        self.picker_id = picker_id
+        # Batch of the current or the last tour
+        self.current_batch = None
+        self.start_time = available_time
+        # Time the picker returns from the current tour
+        self.arrival_time = available_time
+        self.amount_of_tours = 0
+
+
+    def is_available(self, now):
+        '''
+        Check if the picker has returned from the current tour
+
+        :param now: Current time
+        :return: True if the picker is available, False otherwise
+        '''
+        return now >= self.arrival_time
+
+
+class PickerDispatcher:
+    '''
+    Class for the dispatcher of several pickers, each of them with its own tour state.
+    Whenever a picker is available, it is handed the next released batch. If several pickers are available,
+    the picker which has been waiting the longest is dispatched first, so that the tours are spread over all pickers.
+    '''
+    def __init__(self, amount_of_pickers, available_time=0.0):
+        '''
+        Constructor of the picker dispatcher
+
+        :param amount_of_pickers: Amount of pickers, at least one.
+        :param available_time: Time the pickers are available for their first tour.
+        '''
+        if amount_of_pickers < 1:
+            raise ValueError(f'The amount of pickers has to be at least 1, not {amount_of_pickers}.')
+        self.pickers = [Picker(picker_id, available_time) for picker_id in range(1, amount_of_pickers + 1)]
+
+
+    def get_next_picker(self):
+        '''
+        Get the picker which is available first, no matter if it is on tour now
+
+        :return: The picker returning first or waiting the longest
+        '''
+        return min(self.pickers, key=lambda picker: (picker.arrival_time, picker.picker_id))
+
+
+    def get_available_picker(self, now):
+        '''
+        Get the picker which is dispatched next
+
+        :param now: Current time
+        :return: The available picker which has been waiting the longest, None if all pickers are on tour
+        '''
+        picker = self.get_next_picker()
+        return picker if picker.is_available(now) else None
+
+
+    def is_any_picker_available(self, now):
+        '''
+        Check if at least one picker is available
+
+        :param now: Current time
+        :return: True if a picker is available, False if all pickers are on tour
+        '''
+        return self.get_available_picker(now) is not None
+
+
+    def get_picker_states(self, now):
+        '''
+        Get the state of every picker
+
+        :param now: Current time
+        :return: List containing True for every available picker and False for every picker on tour
+        '''
+        return [picker.is_available(now) for picker in self.pickers]
+
+
+    def get_next_return_time(self, now):
+        '''
+        Get the time the next picker returns from its tour
+
+        :param now: Current time
+        :return: The earliest arrival time of the pickers on tour, None if no picker is on tour
+        '''
+        arrival_times = [picker.arrival_time for picker in self.pickers if not picker.is_available(now)]
+        return min(arrival_times) if arrival_times else None
+
+
+    def get_last_arrival_time(self):
+        '''
+        Get the time the last picker returns from its tour
+
+        :return: The latest arrival time of all pickers
+        '''
+        return max(picker.arrival_time for picker in self.pickers)
+
+
+    def start_tour(self, picker, batch):
+        '''
+        Hand a batch to a picker, the start and the arrival time have already been added to the batch, e.g. by picker_starts_tour
+
+        :param picker: The picker starting the tour.
+        :param batch: The batch of the tour.
+        :return: The batch with the ID of the picker.
+        '''
+        batch['picker_id'] = picker.picker_id
+        picker.current_batch = batch
+        picker.start_time = batch['start_time']
+        picker.arrival_time = batch['arrival_time']
+        picker.amount_of_tours += 1
+        # Record the wait, tour and completion time of the orders of the batch
+        if metrics.enabled:
+            metrics.record_tour(batch)
+        return batch
+
+
+    def schedule_batches(self, batches, now):
+        '''
+        Schedule batches which are picked one after another, every batch is handed to the picker which is available first.
+        The tour time has already been added to the batches, e.g. by add_additional_information_to_batches.
+
+        :param batches: List of batches in the order they are picked.
+        :param now: Current time, no tour starts before it.
+        :return: The batches with their picker ID, start time and arrival time.
+        '''
+        for batch in batches:
+            picker = self.get_next_picker()
+            batch['start_time'] = max(now, picker.arrival_time)
+            batch['arrival_time'] = batch['start_time'] + batch['tour_time']
+            self.start_tour(picker, batch)
+        return batches
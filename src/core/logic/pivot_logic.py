@@ -2,10 +2,16 @@ import datetime
 import time
 import traceback
 import click
-from src.core.logic.batch_selector import order_picking_decision_point_ab, order_picking_decision_point_c
-from src.core.logic.batch_tour_length_calculator import calculate_tour_length_s_shape_routing, sort_and_transform_batch_s_shape_routing
+from src.core.logic import instrumentation
+from src.core.logic.background_optimizer import BackgroundOptimizer
+from src.core.logic.batch_selector import order_picking_decision_point_ab, order_picking_decision_point_ab_warm_start, order_picking_decision_point_background, order_picking_decision_point_c
+from src.core.logic.batch_tour_length_calculator import calculate_tour_length, sort_and_transform_batch
+from src.core.logic.clock import get_clock
+from src.core.logic.local_search_control import create_local_search_settings
+from src.core.logic.routing_strategies import get_routing_strategy
 from src.vars import shared_variables
 
+@instrumentation.timed('pivot_logic.initial_orders_arrived')
 def initial_orders_arrived(orders, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule):
     '''
     This function is called when the initial order release is reached.
@@ -24,9 +30,11 @@ def initial_orders_arrived(orders, max_batch_size, warehouse_layout, warehouse_l
     batches = order_picking_decision_point_ab(orders, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule)
     return batches
 
-def new_order_arrives(order, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule, orders):
+@instrumentation.timed('pivot_logic.new_order_arrives')
+def new_order_arrives(order, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule, orders, current_batches=None):
     '''
     This function is called when a new order arrives.
+    If warm start is enabled in the shared variables and the current batches contain exactly the open orders, the new order is inserted into the current batches instead of batching all orders from scratch.
 
     :param order: new order
     :param max_batch_size: maximum batch size
@@ -37,15 +45,23 @@ def new_order_arrives(order, max_batch_size, warehouse_layout, warehouse_layout_
     :param release_parameter: parameter for the release of the batches
     :param selection_rule: selection rule for the batches
     :param orders: list of orders
+    :param current_batches: list of the current batches containing the orders before the new order arrived
     :return: list of batches with their release time
     '''
+    # Check if the current batches can be used for a warm start
+    warm_start = shared_variables.variables.get('warm_start', False) and current_batches and \
+        sorted(batch_order['order_id'] for batch in current_batches for batch_order in batch['orders']) == sorted(open_order['order_id'] for open_order in orders)
     # Add the order to the list of orders
     orders.append(order)
+    if warm_start:
+        # Get sorted batches with their release time by inserting the order into the current batches
+        return order_picking_decision_point_ab_warm_start(order, current_batches, max_batch_size, warehouse_layout, warehouse_layout_path, time_limit, release_parameter, selection_rule)
     # Get sorted batches with their release time
     batches = order_picking_decision_point_ab(orders, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule)
     return batches
 
 
+@instrumentation.timed('pivot_logic.one_batch_available')
 def one_batch_available(orders, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule):
     '''
     This function is called when only one batch is available.
@@ -65,6 +81,7 @@ def one_batch_available(orders, max_batch_size, warehouse_layout, warehouse_layo
     return batches
 
 
+@instrumentation.timed('pivot_logic.last_order_arrives')
 def last_order_arrives(order, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, selection_rule, orders):
     '''
     This function is called when the last order arrives.
@@ -91,6 +108,7 @@ def last_order_arrives(order, max_batch_size, warehouse_layout, warehouse_layout
 
     return batches
 
+@instrumentation.timed('pivot_logic.picker_starts_tour')
 def picker_starts_tour(batch, warehouse_layout):
     '''
     This function is called when the picker starts the tour.
@@ -100,15 +118,16 @@ def picker_starts_tour(batch, warehouse_layout):
     :return: batch, start time, arrival time
     '''
     # Start the tour
-    start_time = time.time()
+    start_time = get_clock().time()
     # Get the tour length
-    tour_length , batches = calculate_tour_length_s_shape_routing(batch, warehouse_layout)
+    tour_length = calculate_tour_length(batch, warehouse_layout)
     # Calculate the tour time according to the predefined units per second
     tour_time = tour_length / shared_variables.variables['tour_length_units_per_second']
     # Arrival time assuming 1 second per 5 warehouse units
     arrival_time = start_time + tour_time
-    # Batch sorted by S-Shape-Routing
-    batch['sorted_batch_s_shape_routing'] = sort_and_transform_batch_s_shape_routing(batch)
+    # Batch sorted in the pick sequence of the routing strategy the tour length is calculated with
+    batch['sorted_batch'] = sort_and_transform_batch(batch, warehouse_layout)
+    batch['routing_strategy'] = get_routing_strategy(warehouse_layout)
     # Add the amount of orders to the batch
     batch['amount_of_orders'] = len(batch['orders'])
     # Add the amount of items to the batch
@@ -125,6 +144,44 @@ def picker_starts_tour(batch, warehouse_layout):
     # Return start time and arrival time
     return batch, start_time, arrival_time
 
+def background_optimization_starts(batches, max_batch_size, warehouse_layout, rearrangement_parameter, threshold_parameter):
+    '''
+    This function is called when the picker starts a tour and background optimization is enabled in the shared variables.
+
+    :param batches: list of the open batches
+    :param max_batch_size: maximum batch size
+    :param warehouse_layout: dictionary containing the warehouse layout information
+    :param rearrangement_parameter: parameter for the rearrangement of the batches
+    :param threshold_parameter: parameter for the threshold of the batches
+    :return: the running background optimizer or None if there is nothing to optimize
+    '''
+    # Only several batches can be improved by exchanging orders
+    if not shared_variables.variables.get('background_optimization', False) or len(batches) < 2:
+        return None
+    optimizer = BackgroundOptimizer(batches, max_batch_size, warehouse_layout, rearrangement_parameter, threshold_parameter, create_local_search_settings(shared_variables.variables))
+    optimizer.start()
+    return optimizer
+
+@instrumentation.timed('pivot_logic.background_optimization_stops')
+def background_optimization_stops(optimizer, batches, warehouse_layout, release_parameter, selection_rule):
+    '''
+    This function is called before the next batch is handed to an available picker or when a new order arrives while the background optimizer is running.
+
+    :param optimizer: the running background optimizer
+    :param batches: list of the open batches the optimizer was started with
+    :param warehouse_layout: dictionary containing the warehouse layout information
+    :param release_parameter: parameter for the release of the batches
+    :param selection_rule: selection rule for the batches
+    :return: list of batches with their release time
+    '''
+    # Stop the optimizer and read its best solution
+    best_batches, best_tour_length = optimizer.stop()
+    # Keep the open batches if the optimizer did not find a shorter solution
+    if best_tour_length >= optimizer.initial_tour_length:
+        return batches
+    # Get sorted batches with their release time
+    return order_picking_decision_point_background(best_batches, warehouse_layout, release_parameter, selection_rule)
+
 def add_additional_information_to_batches(batches, warehouse_layout):
     '''
     This function adds additional information to the batches.
@@ -138,11 +195,12 @@ def add_additional_information_to_batches(batches, warehouse_layout):
     # Iterate over the batches
     for batch in batches:
         # Get the tour length
-        tour_length , batches = calculate_tour_length_s_shape_routing(batch, warehouse_layout)
+        tour_length = calculate_tour_length(batch, warehouse_layout)
         # Calculate the tour time according to the predefined units per second
         tour_time = tour_length / shared_variables.variables['tour_length_units_per_second']
-        # Batch sorted by S-Shape-Routing
-        batch['sorted_batch_s_shape_routing'] = sort_and_transform_batch_s_shape_routing(batch)
+        # Batch sorted in the pick sequence of the routing strategy the tour length is calculated with
+        batch['sorted_batch'] = sort_and_transform_batch(batch, warehouse_layout)
+        batch['routing_strategy'] = get_routing_strategy(warehouse_layout)
         # Add the amount of orders to the batch
         batch['amount_of_orders'] = len(batch['orders'])
         # Add the amount of items to the batch
@@ -0,0 +1,182 @@
+import math
+
+
+def calculate_tour_length_s_shape_routing_from_statistics(aisle_count, max_aisle, max_y_last_aisle, max_y_position):
+    '''
+    This function calculates the S-Shape tour length from the only three values it depends on.
+    Starting at (0, -1), the picker traverses every visited aisle completely, except the last one if the amount of visited aisles is odd.
+    In that case the picker turns at the highest item of the last aisle and walks back to the front.
+
+    :param aisle_count: The amount of visited aisles.
+    :param max_aisle: The highest visited aisle.
+    :param max_y_last_aisle: The highest y-coordinate visited in the highest aisle.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: The tour length.
+    '''
+    # An empty batch does not need a tour
+    if aisle_count == 0:
+        return 0
+    # Walking to the highest aisle and back
+    tour_length = 2 * max_aisle
+    if aisle_count % 2 == 0:
+        # Every aisle is traversed completely from one end to the other end
+        tour_length += aisle_count * (max_y_position + 1)
+    else:
+        # The last aisle is entered from the front and left at the front again
+        tour_length += (aisle_count - 1) * (max_y_position + 1) + 2 * (max_y_last_aisle + 1)
+    return tour_length
+
+
+def calculate_tour_length_s_shape_routing_from_aisle_summary(aisle_summary, max_y_position):
+    '''
+    This function calculates the S-Shape tour length from an aisle summary in time proportional to the amount of aisles.
+
+    :param aisle_summary: The aisle summary of a batch, (aisle, lowest y-coordinate, highest y-coordinate) entries sorted by the aisle.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: The tour length.
+    '''
+    if not aisle_summary:
+        return 0
+    max_aisle, _, max_y_last_aisle = aisle_summary[-1]
+    return calculate_tour_length_s_shape_routing_from_statistics(len(aisle_summary), max_aisle, max_y_last_aisle, max_y_position)
+
+
+def calculate_tour_length_return_routing_from_aisle_summary(aisle_summary, max_y_position):
+    '''
+    This function calculates the Return tour length from an aisle summary.
+    The picker enters every visited aisle from the front, walks up to its highest item and returns to the front.
+
+    :param aisle_summary: The aisle summary of a batch, (aisle, lowest y-coordinate, highest y-coordinate) entries sorted by the aisle.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: The tour length.
+    '''
+    if not aisle_summary:
+        return 0
+    # Walking to the highest aisle and back and into every aisle up to its highest item and back
+    return 2 * aisle_summary[-1][0] + sum(2 * (max_y + 1) for _, _, max_y in aisle_summary)
+
+
+def calculate_tour_length_with_traversed_outer_aisles(aisle_summary, max_y_position, calculate_inner_aisle_length):
+    '''
+    This function calculates the tour length of the routings which traverse the first and the last visited aisle completely and enter the aisles in between from the front or the back.
+    The picker walks along the front to the first aisle, traverses it, walks along the back to the last aisle while visiting the back parts of the aisles in between,
+    traverses the last aisle and walks along the front back to the start while visiting the front parts of the aisles in between.
+
+    :param aisle_summary: The aisle summary of a batch, (aisle, lowest y-coordinate, highest y-coordinate) entries sorted by the aisle.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :param calculate_inner_aisle_length: Function returning the distance walked inside an aisle in between out of its lowest and highest y-coordinate and the maximum y-coordinate.
+    :return: The tour length.
+    '''
+    if not aisle_summary:
+        return 0
+    # A single aisle is entered from the front and left at the front again
+    if len(aisle_summary) == 1:
+        aisle, _, max_y = aisle_summary[0]
+        return 2 * aisle + 2 * (max_y + 1)
+    # Walking to the highest aisle and back and traversing the first and the last aisle from one end to the other end
+    tour_length = 2 * aisle_summary[-1][0] + 2 * (max_y_position + 1)
+    for _, min_y, max_y in aisle_summary[1:-1]:
+        tour_length += calculate_inner_aisle_length(min_y, max_y, max_y_position)
+    return tour_length
+
+
+def calculate_midpoint_aisle_length(min_y, max_y, max_y_position):
+    '''
+    This function calculates the distance walked inside an aisle in between by the Midpoint routing.
+    Items in the front half are picked from the front and items in the back half are picked from the back.
+    For an aisle with items in both halves, the summary does not contain the items next to the midpoint, so the picker is assumed to walk up to the midpoint from both sides.
+
+    :param min_y: The lowest y-coordinate visited in the aisle.
+    :param max_y: The highest y-coordinate visited in the aisle.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: The distance walked inside the aisle.
+    '''
+    midpoint = max_y_position / 2
+    if max_y <= midpoint:
+        return 2 * (max_y + 1)
+    if min_y > midpoint:
+        return 2 * (max_y_position - min_y)
+    # Up to the last position of the front half from the front and up to the first position of the back half from the back
+    last_front_y = math.floor(midpoint)
+    return 2 * (last_front_y + 1) + 2 * (max_y_position - last_front_y - 1)
+
+
+def calculate_largest_gap_aisle_length(min_y, max_y, max_y_position):
+    '''
+    This function calculates the distance walked inside an aisle in between by the Largest Gap routing.
+    The picker does not walk through the largest gap of the aisle. The summary only contains the lowest and the highest item,
+    so the gaps known are the gap between the front and the lowest item and the gap between the highest item and the back.
+
+    :param min_y: The lowest y-coordinate visited in the aisle.
+    :param max_y: The highest y-coordinate visited in the aisle.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: The distance walked inside the aisle.
+    '''
+    # Skipping the gap at the back means entering from the front, skipping the gap at the front means entering from the back
+    return min(2 * (max_y + 1), 2 * (max_y_position - min_y))
+
+
+def calculate_tour_length_midpoint_routing_from_aisle_summary(aisle_summary, max_y_position):
+    '''
+    This function calculates the Midpoint tour length from an aisle summary.
+
+    :param aisle_summary: The aisle summary of a batch, (aisle, lowest y-coordinate, highest y-coordinate) entries sorted by the aisle.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: The tour length.
+    '''
+    return calculate_tour_length_with_traversed_outer_aisles(aisle_summary, max_y_position, calculate_midpoint_aisle_length)
+
+
+def calculate_tour_length_largest_gap_routing_from_aisle_summary(aisle_summary, max_y_position):
+    '''
+    This function calculates the Largest Gap tour length from an aisle summary.
+
+    :param aisle_summary: The aisle summary of a batch, (aisle, lowest y-coordinate, highest y-coordinate) entries sorted by the aisle.
+    :param max_y_position: The maximum y-coordinate in the warehouse.
+    :return: The tour length.
+    '''
+    return calculate_tour_length_with_traversed_outer_aisles(aisle_summary, max_y_position, calculate_largest_gap_aisle_length)
+
+
+# Routing strategies by their name, every strategy calculates the tour length from the aisle summary of a batch
+routing_strategies = {
+    'S_SHAPE': calculate_tour_length_s_shape_routing_from_aisle_summary,
+    'RETURN': calculate_tour_length_return_routing_from_aisle_summary,
+    'MIDPOINT': calculate_tour_length_midpoint_routing_from_aisle_summary,
+    'LARGEST_GAP': calculate_tour_length_largest_gap_routing_from_aisle_summary,
+}
+
+# Names of the routing strategies printed with the pick sequence of a batch
+routing_strategy_names = {
+    'S_SHAPE': 'S-Shape-Routing',
+    'RETURN': 'Return-Routing',
+    'MIDPOINT': 'Midpoint-Routing',
+    'LARGEST_GAP': 'Largest-Gap-Routing',
+}
+
+# Routing strategy used if the warehouse layout does not select one
+default_routing_strategy = 'S_SHAPE'
+
+
+def get_routing_strategy(warehouse_layout):
+    '''
+    This function returns the name of the routing strategy selected in the warehouse layout.
+
+    :param warehouse_layout: A dictionary containing the warehouse layout information and optionally the routing strategy.
+    :return: The name of the routing strategy.
+    '''
+    routing_strategy = warehouse_layout.get('routing_strategy') or default_routing_strategy
+    if routing_strategy not in routing_strategies:
+        raise ValueError(f'Unknown routing strategy {routing_strategy}.')
+    return routing_strategy
+
+
+def calculate_tour_length_from_aisle_summary(aisle_summary, warehouse_layout):
+    '''
+    This function calculates the tour length of a batch from its aisle summary with the routing strategy of the warehouse layout.
+
+    :param aisle_summary: The aisle summary of a batch, (aisle, lowest y-coordinate, highest y-coordinate) entries sorted by the aisle.
+    :param warehouse_layout: A dictionary containing the warehouse layout information and optionally the routing strategy.
+    :return: The tour length.
+    '''
+    return routing_strategies[get_routing_strategy(warehouse_layout)](aisle_summary, warehouse_layout['max_y_position'])
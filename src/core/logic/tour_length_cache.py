@@ -0,0 +1,119 @@
+import math
+import threading
+from collections import OrderedDict
+
+from src.core.logic.batch_tour_length_calculator import calculate_tour_length
+
+
+class TourLengthCache:
+    '''
+    Class for a bounded least recently used cache of tour lengths.
+    A batch is identified by the set of its transformed (aisle, y) locations, as this is everything the routing strategies depend on, together with the warehouse layout and its routing strategy.
+    '''
+    def __init__(self, max_size=10000):
+        '''
+        Constructor of the tour length cache
+
+        :param max_size: The maximum amount of stored tour lengths.
+        '''
+        # Set the maximum size
+        self.max_size = max_size
+        # Initialize the stored tour lengths in the order of their last usage
+        self.tour_lengths = OrderedDict()
+        # Initialize the statistics
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Lock to allow the usage from several threads
+        self.lock = threading.Lock()
+
+
+    def get_tour_length(self, batch, warehouse_layout):
+        '''
+        Get the tour length of a batch from the cache or calculate and store it if it is not cached yet
+
+        :param batch: A dictionary containing the orders of the batch.
+        :param warehouse_layout: A dictionary containing the warehouse layout information.
+        :return: The tour length of the batch.
+        '''
+        key = create_cache_key(batch, warehouse_layout)
+        with self.lock:
+            if key in self.tour_lengths:
+                # Mark the tour length as recently used
+                self.tour_lengths.move_to_end(key)
+                self.hits += 1
+                return self.tour_lengths[key]
+            self.misses += 1
+
+        # Calculate the tour length outside of the lock
+        tour_length = calculate_tour_length(batch, warehouse_layout)
+        # Do not store failed calculations
+        if tour_length is None:
+            return None
+
+        with self.lock:
+            self.tour_lengths[key] = tour_length
+            # Remove the least recently used tour lengths if the cache is full
+            while len(self.tour_lengths) > self.max_size:
+                self.tour_lengths.popitem(last=False)
+                self.evictions += 1
+        return tour_length
+
+
+    def clear(self):
+        '''
+        Remove all stored tour lengths and reset the statistics
+        '''
+        with self.lock:
+            self.tour_lengths.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+    def get_statistics(self):
+        '''
+        Get the statistics of the cache
+
+        :return: Dictionary containing the hits, misses, evictions, size and hit rate of the cache
+        '''
+        with self.lock:
+            requests = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'size': len(self.tour_lengths),
+                'max_size': self.max_size,
+                'hit_rate': self.hits / requests if requests else 0.0,
+            }
+
+
+def create_cache_key(batch, warehouse_layout):
+    '''
+    This function creates the cache key of a batch. It consists of the canonical set of transformed (aisle, y) locations and the warehouse layout.
+
+    :param batch: A dictionary containing the orders of the batch.
+    :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :return: A hashable cache key.
+    '''
+    # Transform the x-coordinate into aisles the same way as in the S-Shape routing
+    locations = frozenset((math.ceil(item['abs_x_position'] / 2), item['abs_y_position']) for order in batch['orders'] for item in order['items'])
+    # Add the layout, so that a changed layout or routing strategy never returns tour lengths of a former one
+    layout = tuple(sorted(warehouse_layout.items()))
+    return locations, layout
+
+
+# Shared cache used by the Iterated Local Search
+tour_length_cache = TourLengthCache()
+
+
+def calculate_tour_length_cached(batch, warehouse_layout):
+    '''
+    This function returns the tour length of a batch with the routing strategy of the warehouse layout using the shared tour length cache.
+
+    :param batch: A dictionary containing the orders of the batch.
+    :param warehouse_layout: A dictionary containing the warehouse layout information.
+    :return: The tour length of the batch.
+    '''
+    return tour_length_cache.get_tour_length(batch, warehouse_layout)
@@ -4,17 +4,47 @@ import threading
 import time
 import traceback
 import click
-from src.core.logic.batch_tour_length_calculator import calculate_tour_length_s_shape_routing
+from src.core.logic.clock import get_clock
 from src.core.logic.input_handler import (
-    get_initial_order_release, get_input_process_running, get_last_order, get_max_batch_size, 
-    get_new_order, get_rearrangement_parameter, get_release_parameter, get_selection_rule, 
+    get_amount_of_pickers, get_initial_order_release, get_input_process_running, get_last_order, get_max_batch_size, 
+    get_new_order, get_new_orders, get_rearrangement_parameter, get_release_parameter, get_selection_rule, 
     get_threshold_parameter, get_time_limit, get_warehouse_layout, get_warehouse_layout_path, 
     is_new_order_available
 )
-from src.core.logic.pivot_logic import add_additional_information_to_batches, initial_orders_arrived, last_order_arrives, new_order_arrives, one_batch_available, picker_starts_tour
-import tabulate
+from src.core.logic.pivot_logic import add_additional_information_to_batches, background_optimization_starts, background_optimization_stops, initial_orders_arrived, last_order_arrives, new_order_arrives, one_batch_available, picker_starts_tour
+from src.core.logic.picker_dispatcher import PickerDispatcher
 import src.vars.shared_variables as shared_variables
 
+def get_wait_timeout(current_sorted_batches, picker_dispatcher):
+    '''
+    Get the time until the next event the logic thread does not get notified about
+
+    :param current_sorted_batches: List of sorted batches with release times
+    :param picker_dispatcher: Dispatcher containing the tour state of every picker
+    :return: Seconds until the next picker returns or the next batch is released, None if the thread can wait for a new order
+    '''
+    now = get_clock().time()
+    # All pickers are on tour, nothing can be released before the first of them returns
+    if not picker_dispatcher.is_any_picker_available(now):
+        return picker_dispatcher.get_next_return_time(now) - now
+    # A picker is available, wait for the release time of the next batch
+    if current_sorted_batches:
+        return min(batch['release_time'] for batch in current_sorted_batches) - now
+    return None
+
+
+def is_dispatch_due(current_sorted_batches, picker_dispatcher):
+    '''
+    Check if an available picker can start a tour with a released batch now
+
+    :param current_sorted_batches: List of sorted batches with release times
+    :param picker_dispatcher: Dispatcher containing the tour state of every picker
+    :return: True if a picker is available and a batch has been released, False otherwise
+    '''
+    now = get_clock().time()
+    return picker_dispatcher.is_any_picker_available(now) and any(batch['release_time'] < now for batch in current_sorted_batches)
+
+
 class LogicThread(threading.Thread):
     '''
     Class for the logic thread
@@ -52,6 +82,8 @@ class LogicThread(threading.Thread):
         finally:
             # Set the logic function variable to not running
             shared_variables.variables['logic_function_running'] = False
+            # Wake up the CLI, so that it does not wait for a thread which has ended
+            shared_variables.cli_event.set()
 
 
     def logic_function(self):
@@ -69,6 +101,7 @@ class LogicThread(threading.Thread):
             release_parameter = get_release_parameter()
             time_limit = get_time_limit()
             selection_rule = get_selection_rule()
+            amount_of_pickers = get_amount_of_pickers()
             input_process_running = get_input_process_running()
             
             # Store the variables in a dictionary
@@ -81,6 +114,7 @@ class LogicThread(threading.Thread):
                 'release_parameter': release_parameter,
                 'time_limit': time_limit,
                 'selection_rule': selection_rule,
+                'amount_of_pickers': amount_of_pickers,
                 'input_process_running': input_process_running
             }
             
@@ -89,11 +123,14 @@ class LogicThread(threading.Thread):
             current_picking_batch = {}
             current_picking_process_start_time = 0
             current_picking_process_arrival_time = 0
+            # Every picker has its own tour state and is available from the start
+            picker_dispatcher = PickerDispatcher(amount_of_pickers)
             batch_information_temp = {'orders': []}
+            background_optimizer = None
             shared_variables.variables['last_batching_process_finished'] = False
             
             # Get the initial order release
-            all_orders = copy.deepcopy([get_new_order() for _ in range(initial_order_release)])
+            all_orders = copy.deepcopy(get_new_orders(initial_order_release))
             # Create a batch for the initial order release
             current_sorted_batches = copy.deepcopy(initial_orders_arrived(all_orders, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule))
             # Remove batches with empty orders
@@ -101,34 +138,35 @@ class LogicThread(threading.Thread):
 
             # Loops while the input process is running
             while input_process_running:
-                # Check if for the current batch the picking process has already ended
-                if time.time() < current_picking_process_arrival_time:
-                    # Set the picker state to False (not available)
-                    shared_variables.picker_state = False
-                else:
-                    # Set the picker state to True (available)
-                    shared_variables.picker_state = True
+                # Check for every picker if its picking process has already ended
+                picker_states = picker_dispatcher.get_picker_states(get_clock().time())
+                picker_state = any(picker_states)
+                # Set the picker states (True: available, False: not available) and wake up the CLI if they changed
+                if shared_variables.picker_states != picker_states:
+                    shared_variables.picker_states = picker_states
+                    shared_variables.picker_state = picker_state
+                    shared_variables.cli_event.set()
+                # Stop the background optimization before the next dispatch or as soon as a new order arrives and continue with its best solution
+                if background_optimizer is not None and (is_dispatch_due(current_sorted_batches, picker_dispatcher) or is_new_order_available()):
+                    current_sorted_batches = background_optimization_stops(background_optimizer, current_sorted_batches, warehouse_layout, release_parameter, selection_rule)
+                    background_optimizer = None
                 # Check if a new order is available and create with them new optimized batches
                 if is_new_order_available():
                     # Get the new order
                     order = get_new_order()
 
                     # Pass the new order and receive batches with release times
-                    current_sorted_batches = copy.deepcopy(new_order_arrives(order, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule, all_orders))
+                    current_sorted_batches = copy.deepcopy(new_order_arrives(order, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule, all_orders, current_sorted_batches))
                     # Remove batches with empty orders
                     current_sorted_batches = [batch for batch in current_sorted_batches if len(batch['orders']) > 0]
                 # If no new order is available, release the current batches
                 else:
-                    # Check if the current picking process has already started
-                    if current_picking_process_arrival_time > time.time():
-                        # Avoid busy waiting
-                        time.sleep(0.05)
-                        continue
-                    # If the current picking process has not started, start it with the next batch
-                    else:
+                    # If the picking process of a picker has ended, start a new one with the next batch
+                    picker = picker_dispatcher.get_available_picker(get_clock().time())
+                    if picker is not None:
                         for batch in current_sorted_batches:
                             # Check if the batch is ready to be picked
-                            if batch['release_time'] < time.time():
+                            if batch['release_time'] < get_clock().time():
                                 # Check if there is only one batch left and the orders are different
                                 if len(current_sorted_batches) == 1 and batch_information_temp['orders'] != batch['orders']:
                                     # Store the current batch information
@@ -139,14 +177,21 @@ class LogicThread(threading.Thread):
                                 # Start the picking process
                                 else:
                                     current_picking_batch, current_picking_process_start_time, current_picking_process_arrival_time = picker_starts_tour(batch, warehouse_layout)
+                                    # Hand the batch to the picker
+                                    picker_dispatcher.start_tour(picker, current_picking_batch)
                                   
-                                    # Store the current batch in the shared variables
+                                    # Store the current batch in the shared variables and add it to the released batches
                                     shared_variables.variables['current_picking_batch'] = current_picking_batch
+                                    shared_variables.batches_to_select.append(current_picking_batch)
                                     # Store the current picking process start time in the shared variables
                                     shared_variables.variables['current_picking_process_start_time'] = current_picking_process_start_time
                                     # Store the current picking process arrival time in the shared variables
                                     shared_variables.variables['current_picking_process_arrival_time'] = current_picking_process_arrival_time
-                                   
+                                    # The picker is on tour now, wake up the CLI to print the released batch
+                                    shared_variables.picker_states = picker_dispatcher.get_picker_states(get_clock().time())
+                                    shared_variables.picker_state = any(shared_variables.picker_states)
+                                    shared_variables.cli_event.set()
+
                                     # Remove the orders of the current batch from the list of all orders
                                     for batch_order in current_picking_batch['orders']:
                                         for all_order in all_orders:
@@ -155,6 +200,9 @@ class LogicThread(threading.Thread):
                     
                                     # Remove the batch from the list of sorted batches
                                     current_sorted_batches.remove(batch)
+                                    # Improve the open batches in the background while pickers are on tour, unless another available picker gets the next batch right away
+                                    if not is_dispatch_due(current_sorted_batches, picker_dispatcher):
+                                        background_optimizer = background_optimization_starts(current_sorted_batches, max_batch_size, warehouse_layout, rearrangement_parameter, threshold_parameter)
                     
                                     break
 
@@ -164,9 +212,23 @@ class LogicThread(threading.Thread):
                 shared_variables.variables['amount_of_existing_orders'] = len(all_orders)
                 # Update the input process running variable
                 input_process_running = get_input_process_running()
-                # Avoid busy waiting
-                time.sleep(0.05)
+
+                # Block until the next event instead of polling: a new order or the end of the input wakes the event,
+                # the return of the next picker and the release time of the next batch are known in advance and become the timeout
+                if input_process_running and not is_new_order_available():
+                    timeout = get_wait_timeout(current_sorted_batches, picker_dispatcher)
+                    if timeout is None or timeout > 0:
+                        get_clock().wait(shared_variables.logic_event, timeout)
+                    shared_variables.logic_event.clear()
             
+            # The pickers start the last tours once the input process has ended and they have returned from their current tours
+            input_end_time = get_clock().time()
+            # Orders which were released shortly before the end of the input process are still in the queue, they are batched together with the last order
+            all_orders.extend(get_new_orders())
+            # The last batches are formed from all open orders, so the result of the background optimization is not needed anymore
+            if background_optimizer is not None:
+                background_optimizer.stop()
+
             # As the input process is finished, the last batches are sorted and released
             # Get the last order
             order = get_last_order()
@@ -175,6 +237,8 @@ class LogicThread(threading.Thread):
             current_sorted_batches = last_order_arrives(copy.deepcopy(order), max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, selection_rule, copy.deepcopy(all_orders))
             # Add additional information to the last batches
             add_additional_information_to_batches(current_sorted_batches, warehouse_layout)
+            # Hand every last batch to the picker which is available first
+            picker_dispatcher.schedule_batches(current_sorted_batches, input_end_time)
             # Add the last order to the list of all orders
             all_orders.append(order)
             # Add the last batches to the shared variables
@@ -183,8 +247,9 @@ class LogicThread(threading.Thread):
             shared_variables.variables['amount_of_existing_batches'] = len(current_sorted_batches)
             # Update the amount of existing orders
             shared_variables.variables['amount_of_existing_orders'] = len(all_orders)
-            # Set a flag that the last batching process is finished
+            # Set a flag that the last batching process is finished and wake up the CLI
             shared_variables.variables['last_batching_process_finished'] = True
+            shared_variables.cli_event.set()
 
         except Exception as e:
             click.secho(f'Logic function encountered an error: {e}', fg='red')
\ No newline at end of file
@@ -0,0 +1,225 @@
+import copy
+import json
+import uuid
+
+import click
+from src.core.logic import instrumentation, metrics
+from src.core.logic.clock import SystemClock, VirtualClock, set_clock
+from src.core.logic.input_handler import get_warehouse_layout
+from src.core.logic.join_item_information import join_order_items_and_positions_csv
+from src.core.logic.local_search_control import improvement_policies, scan_orders
+from src.core.logic.order_stream import OrderStream
+from src.core.logic.picker_dispatcher import PickerDispatcher
+from src.core.logic.routing_strategies import routing_strategies
+from src.core.logic.pivot_logic import initial_orders_arrived, last_order_arrives, new_order_arrives, one_batch_available, picker_starts_tour
+import src.vars.shared_variables as shared_variables
+
+
+def load_order_trace(order_path, arrival_interval=1.0):
+    '''
+    Load an order arrival trace from a JSON file containing a list of orders or a JSON Lines file.
+    Orders without an arrival time arrive one after another in the given interval.
+
+    :param order_path: Path to the JSON or JSON Lines file, - for stdin
+    :param arrival_interval: Seconds between two orders without an arrival time
+    :return: List of orders sorted by their arrival time
+    '''
+    return sorted(OrderStream(order_path, arrival_interval), key=lambda order: order['arrival_time'])
+
+
+def save_shared_state():
+    '''
+    Save the shared variables and the picker state, so that a simulation can give them back afterwards
+
+    :return: Dictionary containing copies of the shared state
+    '''
+    return {
+        'variables': dict(shared_variables.variables),
+        'picker_state': shared_variables.picker_state,
+        'picker_states': list(shared_variables.picker_states),
+        'batches_to_select': list(shared_variables.batches_to_select),
+        'last_batches_to_select': list(shared_variables.last_batches_to_select),
+    }
+
+
+def restore_shared_state(shared_state):
+    '''
+    Restore the shared variables and the picker state saved by save_shared_state
+
+    :param shared_state: Dictionary containing the saved shared state
+    '''
+    # Keep the dictionary of the shared variables, as other modules may hold a reference to it
+    shared_variables.variables.clear()
+    shared_variables.variables.update(shared_state['variables'])
+    shared_variables.picker_state = shared_state['picker_state']
+    shared_variables.picker_states = shared_state['picker_states']
+    shared_variables.batches_to_select = shared_state['batches_to_select']
+    shared_variables.last_batches_to_select = shared_state['last_batches_to_select']
+
+
+def simulate(order_trace, variables):
+    '''
+    Replay an order arrival trace against the decision points on a virtual clock.
+    The pickers and the batch release behave the same as in the logic thread, but instead of waiting, the clock jumps to the next event:
+    the arrival of an order, the return of a picker or the release time of a batch.
+    The last order of the trace is handed over as the last order, after which every remaining batch is picked by the picker which is available first.
+
+    :param order_trace: List of orders with their items and their arrival time in seconds
+    :param variables: Dictionary containing the same variables as the CLI initialization, e.g. the warehouse layout path and the selection rule
+    :return: Dictionary containing the makespan, the total tour length, the amount of batches, the amount of tours of every picker and the completion time of every order
+    '''
+    # Initialize the virtual clock at the arrival of the first order
+    orders = copy.deepcopy(order_trace)
+    if not orders:
+        return {'makespan': 0, 'total_tour_length': 0, 'amount_of_batches': 0, 'picker_tours': {}, 'order_completion_times': {}}
+    start_time = orders[0]['arrival_time']
+    clock = VirtualClock(start_time)
+    set_clock(clock)
+    shared_state = save_shared_state()
+
+    try:
+        # Store the variables in the shared variables, as the decision points read some of them from there
+        shared_variables.variables.update(variables)
+        warehouse_layout = get_warehouse_layout()
+        warehouse_layout_path = variables['warehouse_layout_path']
+        max_batch_size = variables['max_batch_size']
+        rearrangement_parameter = variables['rearrangement_parameter']
+        threshold_parameter = variables['threshold_parameter']
+        release_parameter = variables['release_parameter']
+        time_limit = variables['time_limit']
+        selection_rule = variables['selection_rule']
+        # The last order is always handed over as the last order, so at most the other orders can be released initially
+        initial_order_release = max(0, min(variables.get('initial_order_release', 1), len(orders) - 1))
+        amount_of_pickers = variables.get('amount_of_pickers') or 1
+
+        # Add the order IDs and the item positions to the orders
+        for order in orders:
+            order.setdefault('order_id', uuid.uuid4().hex)
+            join_order_items_and_positions_csv(warehouse_layout_path, order)
+        last_order = orders.pop()
+        pending_orders = orders[initial_order_release:]
+
+        # Initialize the results
+        order_completion_times = {}
+        total_tour_length = 0
+        amount_of_batches = 0
+        picker_dispatcher = PickerDispatcher(amount_of_pickers, start_time)
+        batch_information_temp = {'orders': []}
+
+        def start_tour(picker, batch):
+            '''
+            Let a picker start the tour of a batch and store the results of its orders
+            '''
+            nonlocal total_tour_length, amount_of_batches
+            batch, _, arrival_time = picker_starts_tour(batch, warehouse_layout)
+            picker_dispatcher.start_tour(picker, batch)
+            total_tour_length += batch['tour_length']
+            amount_of_batches += 1
+            for order in batch['orders']:
+                order_completion_times[order['order_id']] = arrival_time
+
+        # Release the initial orders, without initial orders the first order is handed over when it arrives
+        all_orders = copy.deepcopy(orders[:initial_order_release])
+        current_sorted_batches = []
+        if all_orders:
+            clock.advance_to(all_orders[-1]['arrival_time'])
+            current_sorted_batches = initial_orders_arrived(all_orders, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule)
+            current_sorted_batches = [batch for batch in current_sorted_batches if len(batch['orders']) > 0]
+
+        # Run until the last order arrives
+        while pending_orders or clock.time() < last_order['arrival_time']:
+            next_arrival_time = pending_orders[0]['arrival_time'] if pending_orders else last_order['arrival_time']
+
+            # Start the next batch if a picker is available and a batch is released
+            picker = picker_dispatcher.get_available_picker(clock.time())
+            if picker is not None:
+                released_batch = next((batch for batch in current_sorted_batches if batch['release_time'] <= clock.time()), None)
+                if released_batch is not None:
+                    # Check if there is only one batch left and the orders are different
+                    if len(current_sorted_batches) == 1 and batch_information_temp['orders'] != released_batch['orders']:
+                        # Store the current batch information and get a new release time
+                        batch_information_temp = copy.deepcopy(released_batch)
+                        current_sorted_batches = one_batch_available(all_orders, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule)
+                    else:
+                        start_tour(picker, released_batch)
+                        # Remove the orders of the batch from the open orders
+                        picked_order_ids = {order['order_id'] for order in released_batch['orders']}
+                        all_orders = [order for order in all_orders if order['order_id'] not in picked_order_ids]
+                        current_sorted_batches.remove(released_batch)
+                    continue
+
+            # Jump to the next event
+            next_event_time = next_arrival_time
+            if picker is None:
+                next_event_time = min(next_event_time, picker_dispatcher.get_next_return_time(clock.time()))
+            elif current_sorted_batches:
+                next_event_time = min(next_event_time, min(batch['release_time'] for batch in current_sorted_batches))
+            clock.advance_to(next_event_time)
+
+            # Hand over the order which arrived
+            if pending_orders and clock.time() >= pending_orders[0]['arrival_time']:
+                order = pending_orders.pop(0)
+                current_sorted_batches = new_order_arrives(order, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, release_parameter, selection_rule, all_orders, current_sorted_batches)
+                current_sorted_batches = [batch for batch in current_sorted_batches if len(batch['orders']) > 0]
+
+        # Hand over the last order and hand every remaining batch to the picker which is available first
+        last_batches = last_order_arrives(last_order, max_batch_size, warehouse_layout, warehouse_layout_path, rearrangement_parameter, threshold_parameter, time_limit, selection_rule, all_orders)
+        for batch in last_batches:
+            picker = picker_dispatcher.get_next_picker()
+            clock.advance_to(picker.arrival_time)
+            start_tour(picker, batch)
+
+        return {
+            'makespan': picker_dispatcher.get_last_arrival_time() - start_time,
+            'total_tour_length': total_tour_length,
+            'amount_of_batches': amount_of_batches,
+            'picker_tours': {picker.picker_id: picker.amount_of_tours for picker in picker_dispatcher.pickers},
+            'order_completion_times': order_completion_times,
+        }
+    finally:
+        # Give the decision points the system clock and the shared state of the caller back
+        set_clock(SystemClock())
+        restore_shared_state(shared_state)
+
+
+@click.command()
+@click.argument('order_path')
+@click.option('--warehouse-layout-path', default='tests/data/warehouse_positions.csv', help='Path to the warehouse layout [.csv].')
+@click.option('--arrival-interval', default=1.0, help='Seconds between orders without an arrival time.')
+@click.option('--max-batch-size', default=15, help='Maximum batch size.')
+@click.option('--initial-order-release', default=10, help='Initial order release.')
+@click.option('--tour-length-units-per-second', default=20, help='Tour length units per second.')
+@click.option('--rearrangement-parameter', default=0.5, help='Rearrangement parameter [0;1].')
+@click.option('--threshold-parameter', default=0.5, help='Threshold parameter [0;1].')
+@click.option('--release-parameter', default=0.5, help='Release parameter [0;1].')
+@click.option('--time-limit', default=0.5, help='Time limit of the iterated local search.')
+@click.option('--selection-rule', default='FIRST', type=click.Choice(['FIRST', 'SHORT', 'LONG', 'SAV']), help='Selection rule.')
+@click.option('--routing-strategy', default='S_SHAPE', type=click.Choice(list(routing_strategies)), help='Routing strategy the tour lengths are calculated with.')
+@click.option('--amount-of-pickers', default=1, type=click.IntRange(min=1), help='Pickers picking batches in parallel tours.')
+@click.option('--neighborhood-size', type=click.IntRange(min=1), default=None, help='Partner batches per order the local search tries, all batches if not given.')
+@click.option('--improvement-policy', type=click.Choice(list(improvement_policies)), default=None, help='Apply the first or the best improving move of a local search scan.')
+@click.option('--scan-order', type=click.Choice(list(scan_orders)), default=None, help='Scan the batches and orders of the local search in a fixed or a random order.')
+@click.option('--max-evaluations', type=click.IntRange(min=1), default=None, help='Evaluated moves per local search phase, no limit if not given.')
+@click.option('--phase-time-limit', type=click.FloatRange(min=0, min_open=True), default=None, help='Seconds per local search phase, no limit besides the time limit if not given.')
+@click.option('--instrumentation', 'instrumentation_enabled', is_flag=True, help='Add the timers and counters of the decision points to the results.')
+@click.option('--metrics-csv', default=None, help='Path of the CSV file the wait, tour and completion time of every order are written to, the percentiles are added to the results.')
+@click.option('--metrics-json', default=None, help='Path of the JSON file the order metrics, their percentiles and the makespan are written to, the percentiles are added to the results.')
+def main(order_path, arrival_interval, instrumentation_enabled, metrics_csv, metrics_json, **variables):
+    '''
+    Simulate an order arrival trace on a virtual clock and print the results as JSON
+    '''
+    if instrumentation_enabled:
+        instrumentation.enable()
+    if metrics_csv or metrics_json:
+        metrics.enable()
+    results = simulate(load_order_trace(order_path, arrival_interval), variables)
+    if instrumentation_enabled:
+        results['instrumentation'] = instrumentation.get_summary()
+    if metrics.enabled:
+        results['metrics'] = metrics.get_summary()
+        metrics.export(metrics_csv, metrics_json)
+    click.echo(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
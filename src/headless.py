@@ -0,0 +1,126 @@
+import json
+import threading
+
+import click
+from src.core.logic import instrumentation, metrics
+from src.core.logic.local_search_control import create_local_search_settings, improvement_policies, scan_orders
+from src.core.logic.order_stream import OrderStream
+from src.core.logic.routing_strategies import routing_strategies
+from src.core.logic_controller import LogicThread
+from src.ui.headless_controller import HeadlessThread
+
+# Default values of the parameters, the same as the defaults of the interactive initialization
+default_variables = {
+    'warehouse_layout_path': 'tests/data/warehouse_positions.csv',
+    'order_path': 'tests/data/test_orders.json',
+    'max_batch_size': 15,
+    'initial_order_release': 10,
+    'tour_length_units_per_second': 20,
+    'rearrangement_parameter': 0.5,
+    'threshold_parameter': 0.5,
+    'release_parameter': 0.5,
+    'time_limit': 0.5,
+    'selection_rule': 'FIRST',
+    'routing_strategy': 'S_SHAPE',
+    'amount_of_pickers': 1,
+    'neighborhood_size': None,
+    'improvement_policy': 'FIRST',
+    'scan_order': 'FIXED',
+    'max_evaluations': None,
+    'phase_time_limit': None,
+    'arrival_interval': 1.0,
+}
+
+
+def load_variables(config_path, flags):
+    '''
+    Combine the default values, the values of the config file and the values of the command line flags, later ones override earlier ones
+
+    :param config_path: Path to a JSON file containing the parameters or None
+    :param flags: Dictionary containing the command line flags, flags which are not given are None
+    :return: Dictionary containing the variables of the run
+    '''
+    variables = dict(default_variables)
+    if config_path:
+        with open(config_path, 'r') as file:
+            variables.update(json.load(file))
+    variables.update({name: value for name, value in flags.items() if value is not None})
+    if variables['selection_rule'] not in ('FIRST', 'SHORT', 'LONG', 'SAV'):
+        raise click.BadParameter(f"Unknown selection rule {variables['selection_rule']}.", param_hint='selection_rule')
+    if variables['routing_strategy'] not in routing_strategies:
+        raise click.BadParameter(f"Unknown routing strategy {variables['routing_strategy']}.", param_hint='routing_strategy')
+    if variables['amount_of_pickers'] < 1:
+        raise click.BadParameter(f"The amount of pickers has to be at least 1, not {variables['amount_of_pickers']}.", param_hint='amount_of_pickers')
+    try:
+        create_local_search_settings(variables)
+    except ValueError as e:
+        raise click.BadParameter(str(e), param_hint='local search settings')
+    return variables
+
+
+@click.command()
+@click.option('--config', 'config_path', type=click.Path(exists=True, dir_okay=False), default=None, help='JSON file containing the parameters, flags override its values.')
+@click.option('--warehouse-layout-path', default=None, help='Path to the warehouse layout [.csv].')
+@click.option('--order-path', default=None, help='Path to the orders [.json, .jsonl] or - for stdin, orders may contain an arrival time in seconds after the start.')
+@click.option('--arrival-interval', type=float, default=None, help='Seconds between orders without an arrival time.')
+@click.option('--max-batch-size', type=int, default=None, help='Maximum batch size.')
+@click.option('--initial-order-release', type=int, default=None, help='Initial order release.')
+@click.option('--tour-length-units-per-second', type=int, default=None, help='Tour length units per second.')
+@click.option('--rearrangement-parameter', type=float, default=None, help='Rearrangement parameter [0;1].')
+@click.option('--threshold-parameter', type=float, default=None, help='Threshold parameter [0;1].')
+@click.option('--release-parameter', type=float, default=None, help='Release parameter [0;1].')
+@click.option('--time-limit', type=float, default=None, help='Time limit of the iterated local search.')
+@click.option('--selection-rule', type=click.Choice(['FIRST', 'SHORT', 'LONG', 'SAV']), default=None, help='Selection rule.')
+@click.option('--routing-strategy', type=click.Choice(list(routing_strategies)), default=None, help='Routing strategy the tour lengths are calculated with.')
+@click.option('--amount-of-pickers', type=click.IntRange(min=1), default=None, help='Pickers picking batches in parallel tours.')
+@click.option('--neighborhood-size', type=click.IntRange(min=1), default=None, help='Partner batches per order the local search tries, all batches if not given.')
+@click.option('--improvement-policy', type=click.Choice(list(improvement_policies)), default=None, help='Apply the first or the best improving move of a local search scan.')
+@click.option('--scan-order', type=click.Choice(list(scan_orders)), default=None, help='Scan the batches and orders of the local search in a fixed or a random order.')
+@click.option('--max-evaluations', type=click.IntRange(min=1), default=None, help='Evaluated moves per local search phase, no limit if not given.')
+@click.option('--phase-time-limit', type=click.FloatRange(min=0, min_open=True), default=None, help='Seconds per local search phase, no limit besides the time limit if not given.')
+@click.option('--output', default=None, help='Path of the JSON file the summary is written to, it is printed if not given.')
+@click.option('--instrumentation', 'instrumentation_enabled', is_flag=True, help='Add the timers and counters of the decision points to the summary.')
+@click.option('--metrics-csv', default=None, help='Path of the CSV file the wait, tour and completion time of every order are written to, the percentiles are added to the summary.')
+@click.option('--metrics-json', default=None, help='Path of the JSON file the order metrics, their percentiles and the makespan are written to, the percentiles are added to the summary.')
+def main(config_path, output, instrumentation_enabled, metrics_csv, metrics_json, **flags):
+    '''
+    Run the program without a terminal: the orders are released according to their arrival schedule and a JSON summary is written at the end
+    '''
+    variables = load_variables(config_path, flags)
+    if instrumentation_enabled:
+        instrumentation.enable()
+    if metrics_csv or metrics_json:
+        metrics.enable()
+    # The order path and the arrival interval are only needed to create the schedule, the orders are read while they are released
+    order_stream = OrderStream(variables.pop('order_path'), variables.pop('arrival_interval'))
+
+    # Create the threads for the schedule and logic
+    init_event = threading.Event()
+    headless_thread = HeadlessThread(init_event, variables, order_stream)
+    logic_thread = LogicThread(init_event, variables)
+
+    # Start the threads
+    headless_thread.start()
+    logic_thread.start()
+    headless_thread.join()
+    logic_thread.join()
+
+    # Write the summary
+    try:
+        summary = {'parameters': variables, **headless_thread.create_summary()}
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    if instrumentation_enabled:
+        summary['instrumentation'] = instrumentation.get_summary()
+    if metrics.enabled:
+        summary['metrics'] = metrics.get_summary()
+        metrics.export(metrics_csv, metrics_json)
+    if output:
+        with open(output, 'w') as file:
+            json.dump(summary, file, indent=2)
+    else:
+        click.echo(json.dumps(summary, indent=2))
+
+
+if __name__ == '__main__':
+    main()
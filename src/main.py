@@ -1,18 +1,32 @@
 import threading
 import click
+from src.core.logic import instrumentation, metrics
 import src.vars.shared_variables as shared_variables
 from src.ui.cli_controller import CLIThread
 from src.core.logic_controller import LogicThread
 from src.ui.cli.cli_initialize import initialize
 
 @click.command()
+@click.option('--instrumentation', 'instrumentation_enabled', is_flag=True, help='Record timers and counters of the decision points and print them at shutdown.')
+@click.option('--metrics-csv', default=None, help='Path of the CSV file the wait, tour and completion time of every order are written to at shutdown.')
+@click.option('--metrics-json', default=None, help='Path of the JSON file the order metrics, their percentiles and the makespan are written to at shutdown.')
 @click.pass_context
-def main(ctx):
+def main(ctx, instrumentation_enabled, metrics_csv, metrics_json):
     '''
     Main function of the program
 
     :param ctx: Click context
+    :param instrumentation_enabled: Record timers and counters of the decision points
+    :param metrics_csv: Path of the CSV file of the order metrics or None
+    :param metrics_json: Path of the JSON file of the order metrics or None
     '''
+    # Switch on the instrumentation, it can also be printed on demand while the program is running
+    if instrumentation_enabled:
+        instrumentation.enable()
+    # Switch on the order metrics, they can also be printed on demand while the program is running
+    if metrics_csv or metrics_json:
+        metrics.enable()
+
     # Create a dictionary in the click context to store the variables
     ctx.ensure_object(dict)
 
@@ -32,6 +46,14 @@ def main(ctx):
         cli_thread.join()
         logic_thread.join()
 
+        # Print the recorded timers and counters
+        if instrumentation.enabled:
+            instrumentation.print_summary()
+        # Print and write the order metrics
+        if metrics.enabled:
+            metrics.print_summary()
+            metrics.export(metrics_csv, metrics_json)
+
     else:
         # Print a message that the program initialization was aborted
         click.echo("Program initialization was aborted.")
@@ -1,6 +1,6 @@
-import json
 import click
-from InquirerPy import prompt, inquirer
+from src.core.logic.order_stream import OrderStream
+from src.ui import imported_orders
 from src.vars import shared_variables
 
 # Define the buttons for the program
@@ -14,6 +14,9 @@ def initialize(ctx):
     '''
     This function is the initializer function of the program. It initializes the program and gets the inputs from the user.
     '''
+    # Import the prompts only when the interactive initialization starts, as InquirerPy is slow to import
+    from InquirerPy import inquirer
+
     # Display the welcome message
     display_welcome_message()
     # Get the inputs from the user
@@ -53,6 +56,8 @@ def get_inputs():
     '''
     This function gets the inputs from the user and stores them in the global variables. 
     '''
+    from InquirerPy import prompt
+
     # Give the user instructions
     click.echo("Please provide the following inputs, as they are required to run the program. If you want to use the default values, just press Enter. \n")
     
@@ -67,7 +72,7 @@ def get_inputs():
         {
             'type': 'input',
             'name': 'order_path',
-            'message': 'Path to the orders [.json]:',
+            'message': 'Path to the orders [.json, .jsonl]:',
             'default': 'tests/data/test_orders.json'
         },
         {
@@ -107,6 +112,12 @@ def get_inputs():
             'message': 'Release parameter [0;1]:',
             'default': '0.5'
         },
+        {
+            'type': 'input',
+            'name': 'amount_of_pickers',
+            'message': 'Amount of pickers: [>0]',
+            'default': '1'
+        },
         {
             'type': 'input',
             'name': 'time_limit',
@@ -137,6 +148,30 @@ def get_inputs():
             ],
             'default': 'FIRST'
         },
+        {
+            'type': 'list',
+            'name': 'routing_strategy',
+            'message': 'Routing strategy:',
+            'choices': [
+                {
+                    'name': 'S_SHAPE',
+                    'value': 'S_SHAPE'
+                },
+                {
+                    'name': 'RETURN',
+                    'value': 'RETURN'
+                },
+                {
+                    'name': 'MIDPOINT',
+                    'value': 'MIDPOINT'
+                },
+                {
+                    'name': 'LARGEST_GAP',
+                    'value': 'LARGEST_GAP'
+                }
+            ],
+            'default': 'S_SHAPE'
+        },
     ]
 
     # Get the answers from the user
@@ -151,12 +186,14 @@ def get_inputs():
         'rearrangement_parameter': float(answers['rearrangement_parameter']),
         'threshold_parameter': float(answers['threshold_parameter']),
         'release_parameter': float(answers['release_parameter']),
+        'amount_of_pickers': int(answers['amount_of_pickers']),
         'time_limit': float(answers['time_limit']),
         'selection_rule': answers['selection_rule'],
+        'routing_strategy': answers['routing_strategy'],
     }
 
-    # Write the JSON orders to a file
-    duplicate_orders_to_py(answers['order_path'])
+    # Open the orders as a stream, they are read one at a time when they are released
+    import_orders(answers['order_path'])
 
     return variables
 
@@ -186,21 +223,14 @@ def create_hyperlink(text, url):
     # Return the hyperlink
     return f"\033]8;;{url}\033\\{text}\033]8;;\033\\"
 
-def duplicate_orders_to_py(order_path):
+def import_orders(order_path):
     '''
-    This function duplicates the orders to a .py file.
+    This function opens the orders as the stream the CLI releases the orders from.
 
-    :param order_path: The path to the orders.
+    :param order_path: The path to the orders, either a JSON array or JSON Lines.
     '''
-    # Read the orders from the file
-    with open(order_path, 'r') as file:
-        orders = json.load(file)
-    # Clear the .py file content
-    open('src/ui/imported_orders.py', 'w').close()
-    # Write the orders to the .py file
-    with open('src/ui/imported_orders.py', 'a') as file:
-        file.write('imported_orders = ' + str(orders) + '\n')
-
+    # Replace the imported orders with a stream of the file instead of loading the whole file
+    imported_orders.imported_orders = OrderStream(order_path)
 
 if __name__ == '__main__':
     initialize()
@@ -1,10 +1,11 @@
 import datetime
+import queue
 import time
 import traceback
 import uuid
 import click
-import keyboard
-from tabulate import tabulate
+from src.core.logic import instrumentation, metrics
+from src.core.logic.routing_strategies import routing_strategy_names
 from src.ui import imported_orders
 from src.vars import shared_variables
 import src.ui.cli_controller as cli_controller
@@ -13,17 +14,19 @@ def runtime():
     '''
     This function is working as the runtime for the CLI. It is responsible for the interaction with the user and the picker.
     '''
+    # Import the keyboard hooks only when the interactive runtime starts, as they are not needed for the headless mode and the simulator
+    import keyboard
+
     # Update the shared variables to indicate that the input process is running
     shared_variables.variables.update({'input_process_running': True})
 
     # Define the buttons for the program
     release_button = 'Space'
     end_button = 'Delete'
+    instrumentation_button = 'i'
+    metrics_button = 'm'
     # Flag to indicate that the user wants to end the program
     end_input_process = False
-    # Initialize the variables
-    picker_state = True # True: Picker is available, False: Picker is picking
-    batch_to_select = []
 
     # Define debounce time in seconds
     debounce_time = 0.3
@@ -32,101 +35,93 @@ def runtime():
     # Initialize the last end time
     last_end_time = 0
     
-    # Initialize the flag to print the first batch
-    first_batch_flag = True
-
-    # Store the last printed batch
-    last_printed_batch = None
+    # Store the amount of printed batches, every batch released since the last wake up is printed
+    amount_of_printed_batches = 0
 
     # Print a message to indicate that the program is running and explain the basic functionality
-    click.echo('The program is running. The picker is currently available and can pick the first batch.\n\n')
+    click.echo('The program is running. Every picker is currently available and can pick one of the first batches.\n\n')
+
+    # The keyboard hooks put the pressed buttons into a queue and wake up the runtime, so that it does not have to poll the keyboard
+    pressed_buttons = queue.Queue()
+    def on_button_pressed(button):
+        pressed_buttons.put((button, time.time()))
+        shared_variables.cli_event.set()
+    keyboard.on_press_key(release_button, lambda _: on_button_pressed(release_button))
+    keyboard.on_press_key(end_button, lambda _: on_button_pressed(end_button))
+    keyboard.on_press_key(instrumentation_button, lambda _: on_button_pressed(instrumentation_button))
+    keyboard.on_press_key(metrics_button, lambda _: on_button_pressed(metrics_button))
 
     # Run the picking process
-    while not end_input_process:
-        # Check if the logic function has populated the shared variables with the necessary data
-        current_picking_batch = shared_variables.variables.get('current_picking_batch')
-        # Check if a batch is available and print it
-        if current_picking_batch is not None:
-            # Check if it is the first batch, as otherwise it could result in a missing batch
-            if first_batch_flag:
-                # Get the current batch
-                batch_to_select = current_picking_batch
-                # Print the batch
-                print_batch_to_select(batch_to_select)
-                # Store the batch
-                last_printed_batch = batch_to_select
-                # Set the flag to False
-                first_batch_flag = False
-            # Check if the picker state has changed and the picker is now not available anymore
-            elif (picker_state != get_picker_state()) and not get_picker_state():
-                # Check if the last printed batch is the same as the current batch
-                if last_printed_batch != current_picking_batch:
-                    # Get the current batch
-                    batch_to_select = get_batches_to_select()
-                    # Store the batch
-                    last_printed_batch = batch_to_select
-                    # Print the batch
-                    print_batch_to_select(batch_to_select)
-                
-        # Update the picker state
-        picker_state = get_picker_state()
-
-        # Check if the user has pressed the release button and debounce
-        if keyboard.is_pressed(release_button):
-            current_time = time.time()
-            if current_time - last_release_time >= debounce_time:
-                last_release_time = current_time
-                # Release the order
-                release_order()
-        
-        # Check if the user has pressed the end button and debounce
-        if keyboard.is_pressed(end_button):
-            current_time = time.time()
-            if current_time - last_end_time >= debounce_time:
-                last_end_time = current_time
-                # Print a message to indicate that the program will be terminated
-                click.secho('The user decided to hand over a last order to the system to pick.', fg='blue')
-                click.secho('The program will now output the remaining batches and orders.\n\n', fg='blue')
-                # Release the last order
-                release_last_order()
-                # Set the flag to end the cli program
-                # Set the flag to end the logic of the program
-                shared_variables.variables.update({'input_process_running': False})
-                end_input_process = True
-
-        # Avoid too high CPU usage
-        time.sleep(0.01)
-
+    try:
+        while not end_input_process:
+            # Block until the logic thread released a batch, the picker state changed or a button was pressed
+            shared_variables.cli_event.wait()
+            shared_variables.cli_event.clear()
+
+            # Print the batches the logic thread has released to the pickers since the last wake up
+            batches_to_select = get_batches_to_select()
+            while amount_of_printed_batches < len(batches_to_select):
+                print_batch_to_select(batches_to_select[amount_of_printed_batches])
+                amount_of_printed_batches += 1
+
+            # Handle the pressed buttons
+            while not pressed_buttons.empty() and not end_input_process:
+                button, current_time = pressed_buttons.get()
+                # Check if the user has pressed the release button and debounce
+                if button == release_button:
+                    if current_time - last_release_time >= debounce_time:
+                        last_release_time = current_time
+                        # Release the order
+                        release_order()
+                # Check if the user has pressed the instrumentation button and print the summary on demand
+                elif button == instrumentation_button:
+                    if instrumentation.enabled:
+                        instrumentation.print_summary()
+                # Check if the user has pressed the metrics button and print the order metrics on demand
+                elif button == metrics_button:
+                    if metrics.enabled:
+                        metrics.print_summary()
+                # Check if the user has pressed the end button and debounce
+                elif button == end_button:
+                    if current_time - last_end_time >= debounce_time:
+                        last_end_time = current_time
+                        # Print a message to indicate that the program will be terminated
+                        click.secho('The user decided to hand over a last order to the system to pick.', fg='blue')
+                        click.secho('The program will now output the remaining batches and orders.\n\n', fg='blue')
+                        # Release the last order
+                        release_last_order()
+                        # Set the flag to end the cli program
+                        # Set the flag to end the logic of the program and wake it up
+                        shared_variables.variables.update({'input_process_running': False})
+                        shared_variables.logic_event.set()
+                        end_input_process = True
+    finally:
+        # Remove the keyboard hooks
+        keyboard.unhook_all()
 
     # Wait until the last batches have been formed
     # Otherwise the program would jump to the end before the last batches have been formed
-    while shared_variables.variables.get('last_batching_process_finished') is False:
-        time.sleep(0.01)
-        pass
+    while shared_variables.variables.get('last_batching_process_finished') is False and shared_variables.variables.get('logic_function_running'):
+        shared_variables.cli_event.wait()
+        shared_variables.cli_event.clear()
 
     # Initialize variables
     amount_of_last_batches = shared_variables.variables.get('amount_of_existing_batches')
     amount_of_last_orders = shared_variables.variables.get('amount_of_existing_orders')
     # Check if there are any batches released before but not printed due to the end of the loop
-    forgotten_batch = None
-    if get_batches_to_select():
-        if last_printed_batch != get_batches_to_select():
-            # Get the forgotten batch
-            forgotten_batch = get_batches_to_select()
-            # Set the amount of last batches to the amount of last batches + 1
-            amount_of_last_batches += 1
-            # Set the amount of last orders to the amount of last orders + the amount of orders in the forgotten batch
-            amount_of_last_orders += forgotten_batch['amount_of_orders']
-            # Print the forgotten batch later on for an improved user experience
+    forgotten_batches = get_batches_to_select()[amount_of_printed_batches:]
+    # Print the forgotten batches later on for an improved user experience
+    amount_of_last_batches += len(forgotten_batches)
+    amount_of_last_orders += sum(forgotten_batch['amount_of_orders'] for forgotten_batch in forgotten_batches)
     
     # Get the last batches and add them to the last batches
     last_batches = shared_variables.last_batches_to_select
 
     # Give out the selection rule
-    click.secho(f'The remaining {amount_of_last_batches} batches and {amount_of_last_orders} orders are given out, ready to be picked sequentially.', fg='blue')
-    click.secho(f'The previously selected selection rule is: {shared_variables.variables.get('selection_rule')}\n', fg='blue')
-    # Print the forgotten batch
-    if forgotten_batch:
+    click.secho(f'The remaining {amount_of_last_batches} batches and {amount_of_last_orders} orders are given out, ready to be picked by the pickers which are available first.', fg='blue')
+    click.secho(f'The previously selected selection rule is: {shared_variables.variables.get("selection_rule")}\n', fg='blue')
+    # Print the forgotten batches
+    for forgotten_batch in forgotten_batches:
         print_last_batch_to_select(forgotten_batch)
     # Print the last batches
     for batch in last_batches:
@@ -140,17 +135,17 @@ def get_picker_state():
     '''
     Get the picker state from the shared variables
 
-    :return: Picker state
+    :return: Picker state, True if at least one picker is available
     '''
     return shared_variables.picker_state
 
 def get_batches_to_select():
     '''
-    Get the batches to select from the shared variables
+    Get the batches released to the pickers from the shared variables
 
-    :return: Batches to select
+    :return: Batches to select, in the order of their release
     '''
-    return shared_variables.variables.get('current_picking_batch', [])
+    return list(shared_variables.batches_to_select)
 
 def release_order():
     '''
@@ -158,17 +153,24 @@ def release_order():
 
     :return: Released order
     '''
+    from tabulate import tabulate
     try:
+        # If the logic thread has not caught up with the released orders yet, do not release further orders
+        if shared_variables.orders.full():
+            # Print a message that the order queue is full
+            click.secho('The order queue is full, please wait until the batching process has caught up.', fg='red')
+            # Return None
+            return None
         # If there are still orders in the imported orders
         if imported_orders.imported_orders:
-            # Pop the first order from the imported orders and store it in a variable
-            order = imported_orders.imported_orders.pop(0)
+            # Get the first order from the imported orders and store it in a variable
+            order = imported_orders.imported_orders.get()
             # Generate a unique order ID
             order['order_id'] = generate_unique_id()
             # Set the arrival time of the order to the current time
             order['arrival_time'] = time.time()
             # Update the shared variables with the released order
-            shared_variables.orders.append(order)
+            shared_variables.orders.put(order)
             # Print the released order
             click.echo(f"Order with the ID {order['order_id']} arrived at {datetime.datetime.fromtimestamp(order['arrival_time']).strftime('%H:%M:%S')} and is handed over to the batching process.")
             click.echo('The order contains the following items:')
@@ -194,17 +196,18 @@ def release_last_order():
     '''
     Release the last order to the shared variables from the imported orders and remove it from the imported orders
     '''
+    from tabulate import tabulate
     try:
         # If there are still orders in the imported orders
         if imported_orders.imported_orders:
-            # Pop the first order from the imported orders and store it in a variable
-            order = imported_orders.imported_orders.pop(0)
+            # Get the first order from the imported orders and store it in a variable
+            order = imported_orders.imported_orders.get()
             # Generate a unique order ID
             order['order_id'] = generate_unique_id()
             # Set the arrival time of the order to the current time
             order['arrival_time'] = time.time()
             # Update the shared variables with the released order
-            shared_variables.last_orders.append(order)
+            shared_variables.last_orders.put(order)
             # Print the released order
             click.echo(f"Last Order with the ID {order['order_id']} arrived at {datetime.datetime.fromtimestamp(order['arrival_time']).strftime('%H:%M:%S')} and is handed over to the batching process.")
             click.echo('This order contains the following items:')
@@ -241,12 +244,13 @@ def print_batch_to_select(batch):
 
     :param batch: Batch to be printed
     '''
+    from tabulate import tabulate
     # Convert the batch structure to a table
     table = []
     # Get the batch ID
     batch_id = batch['batch_id']
-    # Get the items sorted by S-Shape-Routing
-    batch_sorted_items = batch['sorted_batch_s_shape_routing']
+    # Get the items sorted in the pick sequence of the routing strategy
+    batch_sorted_items = batch['sorted_batch']
     # Get the amount of orders
     batch_amount_of_orders = batch['amount_of_orders']
     # Get the amount of items
@@ -281,9 +285,11 @@ def print_batch_to_select(batch):
         orders.append(f"Order ID: {order_id}\n" + "\n".join(items))
     # Append the batch ID and the orders to the table
     table.append([f"Batch ID: {batch_id}", "\n\n".join(orders)])
-    # Add the items sorted by S-Shape-Routing to the table so that the picker can see the items in the order they should be picked
+    # Add the picker of the batch to the table
+    table.append(['Picker ID:', batch.get('picker_id', 1)])
+    # Add the items sorted by the routing strategy to the table so that the picker can see the items in the order they should be picked
     sorted_items_table = "\n".join([f"Item ID: {item['item_id']}, X: {item['abs_x_position']}, Y: {item['abs_y_position']}, Z: {item['abs_z_position']}" for item in batch_sorted_items])
-    table.append(['Items sorted by S-Shape-Routing:', sorted_items_table])
+    table.append([f"Items sorted by {routing_strategy_names[batch['routing_strategy']]}:", sorted_items_table])
     # Add the amount of orders to the table
     table.append(['Amount of Orders:', batch_amount_of_orders])
     # Add the amount of items to the table
@@ -310,12 +316,13 @@ def print_last_batch_to_select(batch):
 
     :param batch: Batch to be printed
     '''
+    from tabulate import tabulate
     # Convert the batch structure to a table
     table = []
     # Get the batch ID
     batch_id = batch['batch_id']
-    # Get the items sorted by S-Shape-Routing
-    batch_sorted_items = batch['sorted_batch_s_shape_routing']
+    # Get the items sorted in the pick sequence of the routing strategy
+    batch_sorted_items = batch['sorted_batch']
     # Get the amount of orders
     batch_amount_of_orders = batch['amount_of_orders']
     # Get the amount of items
@@ -346,9 +353,11 @@ def print_last_batch_to_select(batch):
         orders.append(f"Order ID: {order_id}\n" + "\n".join(items))
     # Append the batch ID and the orders to the table
     table.append([f"Batch ID: {batch_id}", "\n\n".join(orders)])
-    # Add the items sorted by S-Shape-Routing to the table so that the picker can see the items in the order they should be picked
+    # Add the picker of the batch to the table
+    table.append(['Picker ID:', batch.get('picker_id', 1)])
+    # Add the items sorted by the routing strategy to the table so that the picker can see the items in the order they should be picked
     sorted_items_table = "\n".join([f"Item ID: {item['item_id']}, X: {item['abs_x_position']}, Y: {item['abs_y_position']}, Z: {item['abs_z_position']}" for item in batch_sorted_items])
-    table.append(['Items sorted by S-Shape-Routing:', sorted_items_table])
+    table.append([f"Items sorted by {routing_strategy_names[batch['routing_strategy']]}:", sorted_items_table])
     # Add the amount of orders to the table
     table.append(['Amount of Orders:', batch_amount_of_orders])
     # Add the amount of items to the table
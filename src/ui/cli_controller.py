@@ -51,8 +51,9 @@ class CLIThread(threading.Thread):
             click.secho(f'CLIThread encountered an error: {e}', fg='red')
         # Finally, print a message that the run method has completed
         finally:
-            # Set the input process to not running
+            # Set the input process to not running and wake up the logic thread
             shared_variables.variables['input_process_running'] = False
+            shared_variables.logic_event.set()
 
 
     def release_order(self):
@@ -62,16 +63,16 @@ class CLIThread(threading.Thread):
         :return: Released order
         '''
         try:
-            # If there are still orders in the imported orders
-            if imported_orders.imported_orders:
-                # Pop the first order from the imported orders and store it in a variable
-                order = imported_orders.imported_orders.pop(0)
+            # If there are still orders in the imported orders and the order queue is not full
+            if imported_orders.imported_orders and not shared_variables.orders.full():
+                # Get the first order from the imported orders and store it in a variable
+                order = imported_orders.imported_orders.get()
                 # Generate a unique order ID
                 order['order_id'] = generate_unique_id()
                 # Set the arrival time of the order to the current time
                 order['arrival_time'] = time.time()
                 # Update the shared variables with the released order
-                shared_variables.orders.append(order)
+                shared_variables.orders.put(order)
 
                 return order
             
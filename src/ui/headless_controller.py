@@ -0,0 +1,135 @@
+import threading
+import uuid
+
+import click
+from src.core.logic.clock import get_clock
+import src.vars.shared_variables as shared_variables
+
+
+class HeadlessThread(threading.Thread):
+    '''
+    Class for the headless thread, which replaces the CLI thread when the program runs without a terminal.
+    Instead of waiting for key presses, it releases the orders according to their arrival schedule and hands over the last order of the schedule as the last order.
+    '''
+    def __init__(self, event, variables, order_stream):
+        '''
+        Constructor of the headless thread
+
+        :param event: Event to signal the initialization of the thread
+        :param variables: Variables for the thread
+        :param order_stream: Stream of the orders sorted by their arrival time in seconds after the start
+        '''
+        # Call the constructor of the parent class
+        super().__init__()
+        # Set the event
+        self.event = event
+        # Set the variables
+        self.variables = variables
+        # Set the stream of the orders which are not released yet, it is only read when the orders are released
+        self.order_stream = order_stream
+        self.next_order = order_stream.get()
+        self.first_arrival_time = self.next_order['arrival_time'] if self.next_order else 0.0
+        # Set the start time of the schedule
+        self.start_time = get_clock().time()
+        self.input_end_time = None
+        # Amount of orders handed over to the logic thread, including the last order
+        self.amount_of_released_orders = 0
+
+        # Set the input process to running
+        shared_variables.variables['input_process_running'] = True
+
+        # Release the starting orders based on the initial order release variable, the last order is always kept for the end of the schedule
+        for i in range(variables.get('initial_order_release')):
+            if self.next_order is None or not self.order_stream:
+                break
+            self.release_order(self.next_order, shared_variables.orders)
+            self.next_order = self.order_stream.get()
+
+
+    def run(self):
+        '''
+        Run method of the headless thread
+        '''
+        try:
+            # Update the shared variables with the variables of the thread
+            shared_variables.variables.update(self.variables)
+            # Release the orders at their arrival time, releasing waits while the order queue is full, so that only the orders in flight are in memory
+            while self.next_order is not None:
+                release_time = self.start_time + self.next_order['arrival_time'] - self.first_arrival_time
+                get_clock().sleep(max(0.0, release_time - get_clock().time()))
+                # The last order of the schedule is handed over as the last order
+                if not self.order_stream:
+                    self.release_order(self.next_order, shared_variables.last_orders)
+                else:
+                    self.release_order(self.next_order, shared_variables.orders)
+                self.next_order = self.order_stream.get()
+
+            # End the input process and wake up the logic thread
+            self.input_end_time = get_clock().time()
+            shared_variables.variables['input_process_running'] = False
+            shared_variables.logic_event.set()
+
+            # Wait until the last batches have been formed
+            while shared_variables.variables.get('last_batching_process_finished') is False and shared_variables.variables.get('logic_function_running'):
+                shared_variables.cli_event.wait()
+                shared_variables.cli_event.clear()
+        # Catch exceptions
+        except Exception as e:
+            click.secho(f'HeadlessThread encountered an error: {e}', fg='red', err=True)
+        # Finally, end the input process in any case
+        finally:
+            # Set the input process to not running and wake up the logic thread
+            shared_variables.variables['input_process_running'] = False
+            shared_variables.logic_event.set()
+
+
+    def release_order(self, order, order_queue):
+        '''
+        Release an order to the given queue of the shared variables
+
+        :param order: Order to release
+        :param order_queue: Queue of the shared variables, either the orders or the last orders
+        :return: Released order
+        '''
+        # Generate a unique order ID, if the schedule does not contain one
+        order.setdefault('order_id', uuid.uuid4().hex)
+        # Set the arrival time of the order to the current time
+        order['arrival_time'] = get_clock().time()
+        # Update the shared variables with the released order, waiting while the queue is full
+        order_queue.put(order)
+        self.amount_of_released_orders += 1
+        return order
+
+
+    def create_summary(self):
+        '''
+        Create the summary of the run out of the released batches and the last batches, which the logic thread has handed to the pickers after the input process ended.
+
+        :return: Dictionary containing the makespan, the total tour length, the amount of batches and orders, the amount of tours of every picker, the completion time of every order and the statistics of the order queue
+        :raises RuntimeError: If the amount of picked orders differs from the amount of released orders
+        '''
+        order_completion_times = {}
+        picker_tours = {}
+        total_tour_length = 0
+        picker_arrival_time = max(self.start_time, self.input_end_time or self.start_time)
+        released_batches = list(shared_variables.batches_to_select)
+        # Batches released while the input process was running and the last batches, every batch knows its picker and its arrival time
+        for batch in released_batches + list(shared_variables.last_batches_to_select):
+            total_tour_length += batch['tour_length']
+            picker_arrival_time = max(picker_arrival_time, batch['arrival_time'])
+            picker_tours[batch['picker_id']] = picker_tours.get(batch['picker_id'], 0) + 1
+            for order in batch['orders']:
+                order_completion_times[order['order_id']] = batch['arrival_time'] - self.start_time
+        # Every released order has to be picked, otherwise the summary would silently describe only a part of the run
+        if len(order_completion_times) != self.amount_of_released_orders:
+            raise RuntimeError(f'{self.amount_of_released_orders} orders were released, but {len(order_completion_times)} orders were picked.')
+
+        return {
+            'makespan': picker_arrival_time - self.start_time,
+            'total_tour_length': total_tour_length,
+            'amount_of_batches': len(released_batches) + len(shared_variables.last_batches_to_select),
+            'amount_of_orders': len(order_completion_times),
+            'picker_tours': dict(sorted(picker_tours.items())),
+            'order_completion_times': order_completion_times,
+            'order_queue': shared_variables.orders.get_statistics(),
+        }
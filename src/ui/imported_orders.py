@@ -1 +1,4 @@
-imported_orders = [{'items': [{'item_id': 281}, {'item_id': 579}, {'item_id': 570}, {'item_id': 17}, {'item_id': 505}, {'item_id': 842}, {'item_id': 907}, {'item_id': 696}, {'item_id': 28}, {'item_id': 201}]}, {'items': [{'item_id': 376}, {'item_id': 165}, {'item_id': 182}, {'item_id': 518}, {'item_id': 228}, {'item_id': 702}, {'item_id': 862}]}, {'items': [{'item_id': 228}, {'item_id': 182}, {'item_id': 518}, {'item_id': 702}, {'item_id': 862}, {'item_id': 376}, {'item_id': 165}]}, {'items': [{'item_id': 891}, {'item_id': 746}]}, {'items': [{'item_id': 307}, {'item_id': 994}, {'item_id': 192}, {'item_id': 506}, {'item_id': 260}, {'item_id': 362}, {'item_id': 1000}]}, {'items': [{'item_id': 282}, {'item_id': 776}, {'item_id': 384}, {'item_id': 301}]}, {'items': [{'item_id': 282}, {'item_id': 776}, {'item_id': 384}, {'item_id': 384}, {'item_id': 301}]}, {'items': [{'item_id': 891}, {'item_id': 746}]}, {'items': [{'item_id': 891}, {'item_id': 746}, {'item_id': 891}]}, {'items': [{'item_id': 410}, {'item_id': 564}, {'item_id': 678}, {'item_id': 789}, {'item_id': 234}]}, {'items': [{'item_id': 111}, {'item_id': 222}, {'item_id': 333}, {'item_id': 444}, {'item_id': 555}]}, {'items': [{'item_id': 123}, {'item_id': 456}, {'item_id': 789}, {'item_id': 101}, {'item_id': 202}]}, {'items': [{'item_id': 555}, {'item_id': 666}, {'item_id': 777}, {'item_id': 888}, {'item_id': 999}]}, {'items': [{'item_id': 321}, {'item_id': 432}, {'item_id': 543}, {'item_id': 654}, {'item_id': 765}]}, {'items': [{'item_id': 135}, {'item_id': 246}, {'item_id': 357}, {'item_id': 468}, {'item_id': 579}]}, {'items': [{'item_id': 680}, {'item_id': 790}, {'item_id': 801}, {'item_id': 912}, {'item_id': 102}]}, {'items': [{'item_id': 300}, {'item_id': 400}, {'item_id': 500}, {'item_id': 600}, {'item_id': 700}]}, {'items': [{'item_id': 812}, {'item_id': 923}, {'item_id': 103}, {'item_id': 204}, {'item_id': 305}]}, {'items': [{'item_id': 450}, {'item_id': 560}, {'item_id': 670}, {'item_id': 780}, {'item_id': 890}]}, {'items': [{'item_id': 501}, {'item_id': 602}, {'item_id': 703}, {'item_id': 804}, {'item_id': 905}]}, {'items': [{'item_id': 213}, {'item_id': 324}]}, {'items': [{'item_id': 567}, {'item_id': 678}, {'item_id': 789}]}, {'items': [{'item_id': 890}, {'item_id': 901}, {'item_id': 123}, {'item_id': 234}]}, {'items': [{'item_id': 345}, {'item_id': 456}, {'item_id': 567}]}, {'items': [{'item_id': 678}, {'item_id': 789}, {'item_id': 890}, {'item_id': 901}]}, {'items': [{'item_id': 101}, {'item_id': 202}, {'item_id': 303}]}, {'items': [{'item_id': 404}, {'item_id': 505}]}, {'items': [{'item_id': 606}, {'item_id': 707}, {'item_id': 808}, {'item_id': 909}]}, {'items': [{'item_id': 100}, {'item_id': 200}, {'item_id': 300}, {'item_id': 400}, {'item_id': 500}]}, {'items': [{'item_id': 600}, {'item_id': 700}, {'item_id': 800}]}, {'items': [{'item_id': 711}, {'item_id': 821}, {'item_id': 931}, {'item_id': 102}, {'item_id': 203}]}, {'items': [{'item_id': 314}, {'item_id': 425}, {'item_id': 536}]}, {'items': [{'item_id': 647}, {'item_id': 758}, {'item_id': 869}, {'item_id': 980}, {'item_id': 101}]}, {'items': [{'item_id': 212}, {'item_id': 323}, {'item_id': 434}, {'item_id': 545}]}, {'items': [{'item_id': 656}, {'item_id': 767}, {'item_id': 878}]}, {'items': [{'item_id': 989}, {'item_id': 100}, {'item_id': 211}, {'item_id': 322}, {'item_id': 433}]}, {'items': [{'item_id': 544}, {'item_id': 655}, {'item_id': 766}, {'item_id': 877}, {'item_id': 988}]}, {'items': [{'item_id': 199}, {'item_id': 299}, {'item_id': 399}, {'item_id': 499}]}, {'items': [{'item_id': 599}, {'item_id': 699}, {'item_id': 799}, {'item_id': 899}, {'item_id': 999}]}, {'items': [{'item_id': 101}, {'item_id': 202}, {'item_id': 303}, {'item_id': 404}, {'item_id': 505}]}, {'items': [{'item_id': 606}, {'item_id': 707}, {'item_id': 808}, {'item_id': 909}]}, {'items': [{'item_id': 111}, {'item_id': 222}, {'item_id': 333}, {'item_id': 444}, {'item_id': 555}]}, {'items': [{'item_id': 666}, {'item_id': 777}, {'item_id': 888}, {'item_id': 999}]}, {'items': [{'item_id': 123}, {'item_id': 234}, {'item_id': 345}, {'item_id': 456}]}, {'items': [{'item_id': 567}, {'item_id': 678}, {'item_id': 789}, {'item_id': 890}, {'item_id': 901}]}, {'items': [{'item_id': 12}, {'item_id': 123}, {'item_id': 234}, {'item_id': 345}, {'item_id': 456}]}, {'items': [{'item_id': 567}, {'item_id': 678}, {'item_id': 789}, {'item_id': 890}, {'item_id': 901}]}, {'items': [{'item_id': 102}, {'item_id': 203}, {'item_id': 203}, {'item_id': 405}, {'item_id': 405}]}, {'items': [{'item_id': 607}, {'item_id': 708}, {'item_id': 809}, {'item_id': 910}]}, {'items': [{'item_id': 11}]}]
+from src.vars.order_queue import OrderQueue
+
+# Orders the CLI releases from, they are replaced by a stream of the order file during the initialization
+imported_orders = OrderQueue()
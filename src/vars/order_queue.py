@@ -0,0 +1,146 @@
+import threading
+from collections import deque
+
+
+class OrderQueue:
+    '''
+    Class for a bounded, thread-safe first in first out queue of orders.
+    It hands the orders over from the CLI to the logic thread, with constant time enqueue and dequeue and backpressure once it is full.
+    '''
+    def __init__(self, orders=None, max_size=None, wake_event=None):
+        '''
+        Constructor of the order queue
+
+        :param orders: Orders the queue starts with.
+        :param max_size: The maximum amount of queued orders, None for an unbounded queue.
+        :param wake_event: Threading event which is set whenever an order is enqueued, e.g. to wake up the logic thread.
+        '''
+        # Set the maximum size
+        self.max_size = max_size
+        # Set the event to wake up the consumer
+        self.wake_event = wake_event
+        # Initialize the queued orders
+        self.orders = deque()
+        # Initialize the statistics
+        self.enqueued = 0
+        self.dequeued = 0
+        self.high_water_mark = 0
+        # Condition to allow the usage from several threads and to block producers while the queue is full
+        self.condition = threading.Condition()
+        for order in orders or []:
+            self.put(order, block=False)
+
+
+    def __len__(self):
+        '''
+        Get the current amount of queued orders
+
+        :return: The depth of the queue.
+        '''
+        with self.condition:
+            return len(self.orders)
+
+
+    def __bool__(self):
+        '''
+        Check if orders are queued
+
+        :return: True if at least one order is queued, False otherwise.
+        '''
+        return len(self) > 0
+
+
+    def full(self):
+        '''
+        Check if the queue has reached its maximum size
+
+        :return: True if no further order can be enqueued without blocking, False otherwise.
+        '''
+        with self.condition:
+            return self.max_size is not None and len(self.orders) >= self.max_size
+
+
+    def put(self, order, block=True, timeout=None):
+        '''
+        Enqueue an order at the end of the queue
+
+        :param order: The order to enqueue.
+        :param block: Wait for free space if the queue is full, otherwise fail immediately.
+        :param timeout: Maximum seconds to wait for free space, None to wait until space is available.
+        :return: True if the order is enqueued, False if the queue stayed full.
+        '''
+        with self.condition:
+            if self.max_size is not None and len(self.orders) >= self.max_size:
+                if not block:
+                    return False
+                if not self.condition.wait_for(lambda: len(self.orders) < self.max_size, timeout):
+                    return False
+            self.orders.append(order)
+            self.enqueued += 1
+            self.high_water_mark = max(self.high_water_mark, len(self.orders))
+            self.condition.notify_all()
+        # Wake up the consumer outside of the lock
+        if self.wake_event is not None:
+            self.wake_event.set()
+        return True
+
+
+    def get(self, block=False, timeout=None):
+        '''
+        Dequeue the first order of the queue
+
+        :param block: Wait for an order if the queue is empty, otherwise return immediately.
+        :param timeout: Maximum seconds to wait for an order, None to wait until an order is available.
+        :return: The first order or None if the queue is empty.
+        '''
+        with self.condition:
+            if not self.orders:
+                if not block or not self.condition.wait_for(lambda: len(self.orders) > 0, timeout):
+                    return None
+            order = self.orders.popleft()
+            self.dequeued += 1
+            self.condition.notify_all()
+            return order
+
+
+    def drain(self, max_count=None):
+        '''
+        Dequeue all pending orders at once
+
+        :param max_count: The maximum amount of orders to dequeue, None for all of them.
+        :return: List of the dequeued orders in their arrival order.
+        '''
+        with self.condition:
+            count = len(self.orders) if max_count is None else min(max_count, len(self.orders))
+            orders = [self.orders.popleft() for _ in range(count)]
+            self.dequeued += count
+            self.condition.notify_all()
+            return orders
+
+
+    def clear(self):
+        '''
+        Remove all queued orders and reset the statistics
+        '''
+        with self.condition:
+            self.orders.clear()
+            self.enqueued = 0
+            self.dequeued = 0
+            self.high_water_mark = 0
+            self.condition.notify_all()
+
+
+    def get_statistics(self):
+        '''
+        Get the statistics of the queue
+
+        :return: Dictionary containing the depth, the high-water mark, the amount of enqueued and dequeued orders and the maximum size.
+        '''
+        with self.condition:
+            return {
+                'depth': len(self.orders),
+                'high_water_mark': self.high_water_mark,
+                'enqueued': self.enqueued,
+                'dequeued': self.dequeued,
+                'max_size': self.max_size,
+            }
@@ -1,10 +1,21 @@
 '''
 File for shared variables
 '''
+import threading
+from src.vars.order_queue import OrderQueue
 
 variables = {}
+# Batches released to the picker, in the order of their release
 batches_to_select = []
 last_batches_to_select = []
-orders= []
-last_orders = []
-picker_state = False
\ No newline at end of file
+# True if at least one picker is available
+picker_state = False
+# State of every picker (True: available, False: on tour), in the order of the picker IDs
+picker_states = []
+# Event to wake up the logic thread when an order arrives or the input process ends
+logic_event = threading.Event()
+# Event to wake up the CLI when a batch is released, the picker state changes or the last batches are formed
+cli_event = threading.Event()
+# Queues handing the orders over from the CLI to the logic thread, enqueuing an order wakes up the logic thread
+orders = OrderQueue(max_size=1000, wake_event=logic_event)
+last_orders = OrderQueue(max_size=1, wake_event=logic_event)
@@ -0,0 +1,25 @@
+import time
+
+from src.core.logic.background_optimizer import BackgroundOptimizer
+from src.core.logic.batch_tour_length_minimizer import local_search_swap
+from tests.test_ils_engines import copy_batches, create_instance, max_batch_size
+
+
+def test_stop_does_not_wait_for_a_swap_pass():
+    # Single order batches of four copies of the test orders, a full swap pass over them takes much longer than stopping
+    batches, warehouse_layout = create_instance(0, amount_of_batches=50, orders_per_batch=1)
+    batches = copy_batches(batches, 4)
+    pass_start_time = time.perf_counter()
+    local_search_swap(batches, max_batch_size, warehouse_layout)
+    pass_seconds = time.perf_counter() - pass_start_time
+
+    optimizer = BackgroundOptimizer(batches, max_batch_size, warehouse_layout, 0.5, 0.5)
+    optimizer.start()
+    time.sleep(0.01)
+    stop_start_time = time.perf_counter()
+    best_batches, best_tour_length = optimizer.stop()
+    stop_seconds = time.perf_counter() - stop_start_time
+
+    assert not optimizer.is_alive()
+    assert best_tour_length <= optimizer.initial_tour_length
+    assert stop_seconds < max(0.05, pass_seconds / 4)
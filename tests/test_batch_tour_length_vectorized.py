@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+from src.core.logic.batch_tour_length_calculator import calculate_tour_length_s_shape_routing
+from src.core.logic.batch_tour_length_vectorized import calculate_tour_lengths_batched
+
+warehouse_layout = {'max_x_position': 24, 'max_y_position': 9, 'max_z_position': 2}
+
+
+def create_item(generator, item_id, x_position):
+    '''
+    Create an item at the given x-coordinate and a random y-coordinate
+
+    :param generator: Random generator
+    :param item_id: ID of the item
+    :param x_position: Untransformed x-coordinate of the item
+    :return: The item
+    '''
+    return {'item_id': item_id, 'abs_x_position': x_position, 'abs_y_position': generator.randint(0, warehouse_layout['max_y_position']), 'abs_z_position': generator.randint(0, 2)}
+
+
+def create_batches(seed, amount_of_batches=40):
+    '''
+    Create random batches, including empty batches, batches of orders without items and batches visiting a single aisle
+
+    :param seed: Seed of the batches
+    :param amount_of_batches: Amount of batches
+    :return: The list of batches
+    '''
+    generator = random.Random(seed)
+    batches = []
+    for batch_index in range(amount_of_batches):
+        kind = generator.choice(['EMPTY', 'EMPTY_ORDERS', 'SINGLE_AISLE', 'RANDOM'])
+        orders = []
+        if kind == 'EMPTY_ORDERS':
+            orders = [{'order_id': f'order-{batch_index}-0', 'items': []}]
+        elif kind == 'SINGLE_AISLE':
+            # Both x-coordinates of an aisle are transformed into the same aisle
+            aisle = generator.randint(1, warehouse_layout['max_x_position'] // 2)
+            orders = [
+                {'order_id': f'order-{batch_index}-{order_index}', 'items': [create_item(generator, item_id, 2 * aisle - generator.randint(0, 1)) for item_id in range(generator.randint(1, 4))]}
+                for order_index in range(generator.randint(1, 3))
+            ]
+        elif kind == 'RANDOM':
+            orders = [
+                {'order_id': f'order-{batch_index}-{order_index}', 'items': [create_item(generator, item_id, generator.randint(1, warehouse_layout['max_x_position'])) for item_id in range(generator.randint(1, 6))]}
+                for order_index in range(generator.randint(1, 4))
+            ]
+        batches.append({'batch_id': f'batch-{batch_index}', 'orders': orders})
+    return batches
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_batched_tour_lengths_match_the_s_shape_routing(seed):
+    batches = create_batches(seed)
+    expected = [calculate_tour_length_s_shape_routing(batch, warehouse_layout, return_sorted_batch=False)[0] for batch in batches]
+    assert calculate_tour_lengths_batched(batches, warehouse_layout) == expected
+
+
+def test_batched_tour_lengths_of_empty_and_single_aisle_batches():
+    item = {'item_id': 0, 'abs_x_position': 3, 'abs_y_position': 4, 'abs_z_position': 0}
+    batches = [
+        {'batch_id': 'empty', 'orders': []},
+        {'batch_id': 'empty-order', 'orders': [{'order_id': 'order-0', 'items': []}]},
+        {'batch_id': 'single-aisle', 'orders': [{'order_id': 'order-1', 'items': [item]}]},
+    ]
+    # The single item in aisle 2 is reached by walking 2 aisles and 5 positions up, and the same way back
+    assert calculate_tour_lengths_batched(batches, warehouse_layout) == [0, 0, 14]
+    assert calculate_tour_lengths_batched([], warehouse_layout) == []
@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+from src.core.logic.candidate_lists import CandidateLists, create_aisle_bitset, rank_candidate_batches
+from src.core.logic.move_evaluator import add_order_to_batch_profile, create_batch_profile, create_order_profile, remove_order_from_batch_profile
+from tests.test_ils_engines import create_instance
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_candidate_lists_match_a_full_ranking_after_every_move(seed):
+    batches, _ = create_instance(seed, amount_of_batches=12, orders_per_batch=2)
+    order_profiles = {id(order): create_order_profile(order) for batch in batches for order in batch['orders']}
+    batch_profiles = [create_batch_profile([order_profiles[id(order)] for order in batch['orders']]) for batch in batches]
+    candidate_lists = CandidateLists(batch_profiles, 3)
+    generator = random.Random(seed)
+
+    # Shift random orders, the cached candidates of every order have to be the top-k of ranking all batches again
+    for _ in range(200):
+        i = generator.choice([index for index, batch in enumerate(batches) if batch['orders']])
+        j = generator.choice([index for index in range(len(batches)) if index != i])
+        order = generator.choice(batches[i]['orders'])
+        batches[i]['orders'] = [other_order for other_order in batches[i]['orders'] if other_order is not order]
+        batches[j]['orders'] = batches[j]['orders'] + [order]
+        remove_order_from_batch_profile(batch_profiles[i], order_profiles[id(order)])
+        add_order_to_batch_profile(batch_profiles[j], order_profiles[id(order)])
+        candidate_lists.update_batches(i, j)
+
+        batch_bitsets = [create_aisle_bitset(batch_profile) for batch_profile in batch_profiles]
+        for batch_index, batch in enumerate(batches):
+            for order in batch['orders']:
+                expected = set(rank_candidate_batches(create_aisle_bitset(order_profiles[id(order)]), batch_bitsets, batch_index, 3))
+                assert candidate_lists.get_candidate_batches(id(order), order_profiles[id(order)], batch_index) == expected
@@ -0,0 +1,95 @@
+import copy
+import json
+import os
+import shutil
+import struct
+
+import pytest
+from click.testing import CliRunner
+
+from src.core.logic import compiled_layout
+from src.core.logic.compiled_layout import CompiledPositions, get_compiled_layout_path, header_format, open_compiled_layout
+from src.core.logic.join_item_information import clear_item_location_indices, join_order_items_and_positions_csv, load_item_location_index, read_item_location_csv
+from tests.test_ils_engines import order_path, warehouse_layout_path
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    dataset_path = str(tmp_path / 'warehouse_positions.csv')
+    shutil.copyfile(warehouse_layout_path, dataset_path)
+    clear_item_location_indices()
+    yield dataset_path
+    clear_item_location_indices()
+
+
+def compile_layout(dataset_path):
+    '''
+    Compile a csv dataset next to it with the command line interface
+
+    :param dataset_path: The path to the csv dataset
+    :return: The path to the compiled layout
+    '''
+    result = CliRunner().invoke(compiled_layout.main, [dataset_path])
+    assert result.exit_code == 0, result.output
+    return get_compiled_layout_path(dataset_path)
+
+
+def enrich_orders(dataset_path):
+    '''
+    Enrich the test orders with the positions of a dataset
+
+    :param dataset_path: The path to the dataset
+    :return: The enriched orders
+    '''
+    with open(order_path) as file:
+        orders = json.load(file)
+    return [join_order_items_and_positions_csv(dataset_path, copy.deepcopy(order)) for order in orders]
+
+
+def test_compiled_layout_enriches_the_orders_like_the_csv(dataset_path):
+    csv_orders = enrich_orders(dataset_path)
+    assert isinstance(load_item_location_index(dataset_path)['positions'], dict)
+
+    compiled_layout_path = compile_layout(dataset_path)
+    assert os.path.exists(compiled_layout_path)
+    clear_item_location_indices()
+    assert isinstance(load_item_location_index(dataset_path)['positions'], CompiledPositions)
+    assert enrich_orders(dataset_path) == csv_orders
+
+    # The compiled index contains the same positions, invalid item ids and max positions as the csv
+    csv_index = read_item_location_csv(dataset_path)
+    compiled_index = open_compiled_layout(compiled_layout_path, dataset_path)
+    assert dict(compiled_index['positions'].items()) == csv_index['positions']
+    assert {key: value for key, value in compiled_index.items() if key != 'positions'} == {key: value for key, value in csv_index.items() if key != 'positions'}
+
+
+def test_copied_csv_is_accepted_by_its_checksum(dataset_path):
+    compiled_layout_path = compile_layout(dataset_path)
+    # Only the modification time changes, the checksum still matches
+    stat = os.stat(dataset_path)
+    os.utime(dataset_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert open_compiled_layout(compiled_layout_path, dataset_path) is not None
+
+
+def test_changed_csv_makes_the_compiled_layout_stale(dataset_path):
+    compiled_layout_path = compile_layout(dataset_path)
+    with open(dataset_path, 'a') as file:
+        file.write('5000;1;2;3\n')
+    assert open_compiled_layout(compiled_layout_path, dataset_path) is None
+    # The csv is parsed instead of the stale layout
+    item_location_index = load_item_location_index(dataset_path)
+    assert isinstance(item_location_index['positions'], dict)
+    assert item_location_index['positions'][5000] == (1, 2, 3)
+
+
+def test_compiled_layout_of_another_version_is_rejected(dataset_path):
+    compiled_layout_path = compile_layout(dataset_path)
+    with open(compiled_layout_path, 'r+b') as file:
+        header = file.read(struct.calcsize(header_format))
+        fields = list(struct.unpack(header_format, header))
+        fields[1] += 1
+        file.seek(0)
+        file.write(struct.pack(header_format, *fields))
+    assert open_compiled_layout(compiled_layout_path, dataset_path) is None
+    with pytest.raises(ValueError):
+        load_item_location_index(compiled_layout_path)
@@ -0,0 +1,90 @@
+import copy
+import json
+import random
+
+import pytest
+
+from src.core.logic.batch_assignment_minimizer import AssignmentSolution, local_search_phase_array
+from src.core.logic.batch_tour_length_minimizer import local_search_phase
+from src.core.logic.join_item_information import join_order_items_and_positions_csv, load_item_location_index
+from src.core.logic.local_search_control import default_local_search_settings
+
+warehouse_layout_path = 'tests/data/warehouse_positions.csv'
+order_path = 'tests/data/test_orders.json'
+max_batch_size = 40
+
+
+def create_instance(seed, amount_of_batches=12, orders_per_batch=2):
+    '''
+    Create a fixed instance out of the test orders: the orders are shuffled with the seed and split into batches of the same amount of orders
+
+    :param seed: Seed of the shuffle
+    :param amount_of_batches: Amount of batches
+    :param orders_per_batch: Amount of orders per batch
+    :return: Tuple of the batches and the warehouse layout
+    '''
+    item_location_index = load_item_location_index(warehouse_layout_path)
+    warehouse_layout = {
+        'max_x_position': item_location_index['max_x_position'],
+        'max_y_position': item_location_index['max_y_position'],
+        'max_z_position': item_location_index['max_z_position'],
+        'routing_strategy': 'S_SHAPE',
+    }
+    with open(order_path, 'r') as file:
+        orders = json.load(file)
+    random.Random(seed).shuffle(orders)
+    orders = orders[:amount_of_batches * orders_per_batch]
+    for order_index, order in enumerate(orders):
+        order['order_id'] = f'order-{order_index}'
+        join_order_items_and_positions_csv(warehouse_layout_path, order)
+    batches = [
+        {'batch_id': f'batch-{batch_index}', 'orders': orders[batch_index * orders_per_batch:(batch_index + 1) * orders_per_batch]}
+        for batch_index in range(amount_of_batches)
+    ]
+    return batches, warehouse_layout
+
+
+def copy_batches(batches, copies):
+    '''
+    Copy every batch and its orders several times with suffixed IDs, e.g. to get an instance larger than the test orders
+
+    :param batches: A list of batches
+    :param copies: Amount of copies of every batch
+    :return: List of the copied batches
+    '''
+    return [
+        {'batch_id': f"{batch['batch_id']}-{copy_index}", 'orders': [{**order, 'order_id': f"{order['order_id']}-{copy_index}"} for order in batch['orders']]}
+        for copy_index in range(copies) for batch in batches
+    ]
+
+
+def get_order_ids(batches):
+    '''
+    Get the order IDs of every batch
+
+    :param batches: A list of batches
+    :return: List containing the list of order IDs of every non-empty batch
+    '''
+    return [[order['order_id'] for order in batch['orders']] for batch in batches if batch['orders']]
+
+
+@pytest.mark.parametrize('seed', range(15))
+def test_local_search_phase_engines_are_identical(seed):
+    batches, warehouse_layout = create_instance(seed)
+    dict_batches = local_search_phase(copy.deepcopy(batches), max_batch_size, warehouse_layout)
+    solution = AssignmentSolution.from_batches(copy.deepcopy(batches), max_batch_size, warehouse_layout)
+    array_batches = local_search_phase_array(solution).to_batches()
+    assert get_order_ids(array_batches) == get_order_ids(dict_batches)
+
+
+@pytest.mark.parametrize('scan_order', ['FIXED', 'RANDOM'])
+@pytest.mark.parametrize('seed', range(5))
+def test_local_search_phase_engines_are_identical_with_candidate_lists(seed, scan_order):
+    batches, warehouse_layout = create_instance(seed, amount_of_batches=25)
+    local_search_settings = dict(default_local_search_settings, neighborhood_size=3, scan_order=scan_order)
+    random.seed(seed)
+    dict_batches = local_search_phase(copy.deepcopy(batches), max_batch_size, warehouse_layout, local_search_settings=local_search_settings)
+    solution = AssignmentSolution.from_batches(copy.deepcopy(batches), max_batch_size, warehouse_layout)
+    random.seed(seed)
+    array_batches = local_search_phase_array(solution, local_search_settings=local_search_settings).to_batches()
+    assert get_order_ids(array_batches) == get_order_ids(dict_batches)
@@ -0,0 +1,61 @@
+import copy
+
+import pytest
+
+from src.core.logic import instrumentation
+from src.core.logic.batch_tour_length_minimizer import local_search_shift
+from src.core.logic.local_search_control import default_local_search_settings
+from tests.test_ils_engines import create_instance, max_batch_size
+
+
+@instrumentation.timed('test_instrumentation.add')
+def add(a, b):
+    '''
+    Add two numbers, recorded as a timer while the instrumentation is enabled
+
+    :param a: First number
+    :param b: Second number
+    :return: The sum
+    '''
+    return a + b
+
+
+@pytest.fixture(autouse=True)
+def reset_instrumentation():
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_timed_function_is_only_recorded_while_enabled():
+    # Disabled by default, the decorated function runs without being recorded
+    assert add(1, 2) == 3
+    assert instrumentation.get_summary()['timers'] == {}
+
+    instrumentation.enable()
+    assert add(2, 3) == 5
+    assert add(3, 4) == 7
+    timer = instrumentation.get_summary()['timers']['test_instrumentation.add']
+    assert timer['calls'] == 2
+    assert 0 <= timer['max_seconds'] <= timer['total_seconds']
+    assert timer['mean_seconds'] == timer['total_seconds'] / 2
+
+    # Switched off at runtime, the recorded values are kept but not extended
+    instrumentation.disable()
+    assert add(4, 5) == 9
+    assert instrumentation.get_summary()['timers']['test_instrumentation.add']['calls'] == 2
+
+
+def test_local_search_counters_and_rates():
+    batches, warehouse_layout = create_instance(0, amount_of_batches=10, orders_per_batch=1)
+    local_search_shift(copy.deepcopy(batches), max_batch_size, warehouse_layout, default_local_search_settings)
+    assert instrumentation.get_summary() == {'timers': {}, 'counters': {}, 'moves_evaluated_per_second': 0.0}
+
+    instrumentation.enable()
+    local_search_shift(copy.deepcopy(batches), max_batch_size, warehouse_layout, default_local_search_settings)
+    summary = instrumentation.get_summary()
+    assert summary['timers']['local_search_shift']['calls'] == 1
+    assert summary['counters']['moves_evaluated'] > 0
+    assert 0 < summary['counters']['moves_accepted'] <= summary['counters']['moves_evaluated']
+    assert summary['moves_evaluated_per_second'] == summary['counters']['moves_evaluated'] / summary['timers']['local_search_shift']['total_seconds']
@@ -0,0 +1,38 @@
+import os
+
+import pytest
+
+from src.core.logic.join_item_information import clear_item_location_indices, load_item_location_index
+
+
+@pytest.fixture
+def dataset_path(tmp_path):
+    dataset_path = tmp_path / 'positions.csv'
+    dataset_path.write_text('item_id;abs_x_position;abs_y_position;abs_z_position\n1;2;3;0\n2;4;5;1\n')
+    yield str(dataset_path)
+    clear_item_location_indices()
+
+
+def test_unchanged_dataset_is_only_loaded_once(dataset_path):
+    item_location_index = load_item_location_index(dataset_path)
+    assert load_item_location_index(dataset_path) is item_location_index
+    assert load_item_location_index(dataset_path)['positions'][2] == (4, 5, 1)
+
+
+def test_changed_dataset_is_loaded_again(dataset_path):
+    item_location_index = load_item_location_index(dataset_path)
+    stat = os.stat(dataset_path)
+
+    # A changed size is noticed
+    with open(dataset_path, 'a') as file:
+        file.write('3;6;7;2\n')
+    changed_item_location_index = load_item_location_index(dataset_path)
+    assert changed_item_location_index is not item_location_index
+    assert load_item_location_index(dataset_path)['positions'][3] == (6, 7, 2)
+    assert changed_item_location_index['max_x_position'] == 6
+
+    # A changed modification time is noticed even if the size stays the same
+    with open(dataset_path, 'w') as file:
+        file.write('item_id;abs_x_position;abs_y_position;abs_z_position\n1;2;3;0\n2;8;5;1\n3;6;7;2\n')
+    os.utime(dataset_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert load_item_location_index(dataset_path)['positions'][2] == (8, 5, 1)
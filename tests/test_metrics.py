@@ -0,0 +1,91 @@
+import csv
+import json
+import math
+import random
+
+import pytest
+
+from src.core.logic import metrics
+from src.core.logic.metrics import RunningHistogram
+
+
+@pytest.fixture(autouse=True)
+def reset_metrics():
+    metrics.reset()
+    yield
+    metrics.disable()
+    metrics.reset()
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_percentiles_are_within_the_precision_of_the_exact_percentiles(seed):
+    generator = random.Random(seed)
+    values = [generator.lognormvariate(3, 1.5) for _ in range(2000)]
+    histogram = RunningHistogram(precision=0.01)
+    for value in values:
+        histogram.add(value)
+    sorted_values = sorted(values)
+    for percentile in (1, 25, 50, 90, 95, 99, 100):
+        # Nearest rank percentile
+        exact = sorted_values[max(1, math.ceil(percentile / 100 * len(values))) - 1]
+        assert exact <= histogram.get_percentile(percentile) <= exact * 1.01
+    summary = histogram.get_summary()
+    assert (summary['count'], summary['min'], summary['max']) == (len(values), sorted_values[0], sorted_values[-1])
+    assert summary['mean'] == pytest.approx(sum(values) / len(values))
+
+
+def test_empty_histogram_has_no_percentiles():
+    assert RunningHistogram().get_summary() == {'count': 0, 'mean': None, 'min': None, 'max': None, 'p50': None, 'p95': None, 'p99': None}
+
+
+def record_tours():
+    '''
+    Record two tours of two pickers, the orders arrive at 10, 40 and 100 and the last tour ends at 370
+    '''
+    metrics.record_tour({
+        'batch_id': 'batch-1', 'picker_id': 1, 'start_time': 100.0, 'arrival_time': 250.0, 'tour_time': 150.0,
+        'orders': [{'order_id': 1, 'arrival_time': 10.0}, {'order_id': 2, 'arrival_time': 40.0}],
+    })
+    metrics.record_tour({
+        'batch_id': 'batch-2', 'picker_id': 2, 'start_time': 120.0, 'arrival_time': 370.0, 'tour_time': 250.0,
+        'orders': [{'order_id': 3, 'arrival_time': 100.0}],
+    })
+
+
+def test_record_tour_calculates_the_order_metrics():
+    record_tours()
+    assert [(order['wait_time'], order['tour_time'], order['completion_time']) for order in metrics.orders] == [(90.0, 150.0, 240.0), (60.0, 150.0, 210.0), (20.0, 250.0, 270.0)]
+    assert [(order['batch_id'], order['picker_id'], order['tour_start_time'], order['tour_end_time']) for order in metrics.orders] == [
+        ('batch-1', 1, 100.0, 250.0), ('batch-1', 1, 100.0, 250.0), ('batch-2', 2, 120.0, 370.0),
+    ]
+
+
+def test_makespan_and_orders_per_hour():
+    assert metrics.get_summary()['makespan'] == 0.0
+    record_tours()
+    summary = metrics.get_summary()
+    assert (summary['amount_of_orders'], summary['amount_of_batches']) == (3, 2)
+    # From the arrival of the first order until the end of the last tour
+    assert summary['makespan'] == 360.0
+    assert summary['orders_per_hour'] == 30.0
+    assert summary['histograms']['wait_time']['max'] == 90.0
+    assert summary['histograms']['completion_time']['count'] == 3
+
+
+def test_exported_columns(tmp_path):
+    record_tours()
+    csv_path, json_path = tmp_path / 'metrics.csv', tmp_path / 'metrics.json'
+    metrics.export(csv_path=str(csv_path), json_path=str(json_path))
+
+    with open(csv_path, newline='') as file:
+        reader = csv.DictReader(file)
+        rows = list(reader)
+    assert tuple(reader.fieldnames) == metrics.order_columns
+    assert [row['order_id'] for row in rows] == ['1', '2', '3']
+    assert float(rows[2]['completion_time']) == 270.0
+
+    with open(json_path) as file:
+        summary = json.load(file)
+    assert set(summary) == {'amount_of_orders', 'amount_of_batches', 'makespan', 'orders_per_hour', 'histograms', 'orders'}
+    assert set(summary['histograms']) == set(metrics.order_metrics)
+    assert all(tuple(order) == metrics.order_columns for order in summary['orders'])
@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from src.core.logic.batch_tour_length_calculator import calculate_tour_length
+from src.core.logic.move_evaluator import add_order_to_batch_profile, create_batch_profile, create_order_profile, evaluate_shift, evaluate_swap, remove_order_from_batch_profile
+from src.core.logic.routing_strategies import routing_strategies
+from tests.test_ils_engines import create_instance
+
+
+@pytest.mark.parametrize('routing_strategy', list(routing_strategies))
+@pytest.mark.parametrize('seed', range(5))
+def test_evaluated_moves_match_the_routed_batches(routing_strategy, seed):
+    batches, warehouse_layout = create_instance(seed, amount_of_batches=6, orders_per_batch=3)
+    warehouse_layout = {**warehouse_layout, 'routing_strategy': routing_strategy}
+    max_y_position = warehouse_layout['max_y_position']
+    order_profiles = {id(order): create_order_profile(order, routing_strategy) for batch in batches for order in batch['orders']}
+    batch_profiles = [create_batch_profile([order_profiles[id(order)] for order in batch['orders']]) for batch in batches]
+    batch_tour_lengths = [calculate_tour_length(batch, warehouse_layout) for batch in batches]
+    generator = random.Random(seed)
+
+    # Apply random swaps and shifts, every evaluation has to match routing the batches after the move
+    for _ in range(100):
+        i = generator.choice([index for index, batch in enumerate(batches) if batch['orders']])
+        j = generator.choice([index for index in range(len(batches)) if index != i])
+        incumbent_order = generator.choice(batches[i]['orders'])
+        # Orders can only be swapped with a batch which is not empty, shifts also fill empty batches again
+        if batches[j]['orders'] and generator.random() < 0.5:
+            neighbor_order = generator.choice(batches[j]['orders'])
+            delta, incumbent_batch_tour_length, neighbor_batch_tour_length = evaluate_swap(batch_profiles[i], batch_profiles[j], order_profiles[id(incumbent_order)], order_profiles[id(neighbor_order)], batch_tour_lengths[i], batch_tour_lengths[j], max_y_position, routing_strategy)
+            batches[i]['orders'] = [neighbor_order if order is incumbent_order else order for order in batches[i]['orders']]
+            batches[j]['orders'] = [incumbent_order if order is neighbor_order else order for order in batches[j]['orders']]
+            remove_order_from_batch_profile(batch_profiles[j], order_profiles[id(neighbor_order)])
+            add_order_to_batch_profile(batch_profiles[i], order_profiles[id(neighbor_order)])
+        else:
+            delta, incumbent_batch_tour_length, neighbor_batch_tour_length = evaluate_shift(batch_profiles[i], batch_profiles[j], order_profiles[id(incumbent_order)], batch_tour_lengths[i], batch_tour_lengths[j], max_y_position, routing_strategy)
+            batches[i]['orders'] = [order for order in batches[i]['orders'] if order is not incumbent_order]
+            batches[j]['orders'] = batches[j]['orders'] + [incumbent_order]
+        remove_order_from_batch_profile(batch_profiles[i], order_profiles[id(incumbent_order)])
+        add_order_to_batch_profile(batch_profiles[j], order_profiles[id(incumbent_order)])
+
+        assert incumbent_batch_tour_length == calculate_tour_length(batches[i], warehouse_layout)
+        assert neighbor_batch_tour_length == calculate_tour_length(batches[j], warehouse_layout)
+        assert delta == incumbent_batch_tour_length + neighbor_batch_tour_length - batch_tour_lengths[i] - batch_tour_lengths[j]
+        batch_tour_lengths[i] = incumbent_batch_tour_length
+        batch_tour_lengths[j] = neighbor_batch_tour_length
@@ -0,0 +1,72 @@
+import threading
+
+from src.vars.order_queue import OrderQueue
+
+
+def test_orders_are_dequeued_first_in_first_out():
+    order_queue = OrderQueue([{'order_id': 1}, {'order_id': 2}])
+    order_queue.put({'order_id': 3})
+    assert len(order_queue) == 3
+    assert order_queue.get() == {'order_id': 1}
+    assert [order['order_id'] for order in order_queue.drain()] == [2, 3]
+    assert not order_queue
+    assert order_queue.get() is None
+
+
+def test_drain_dequeues_at_most_max_count_orders():
+    order_queue = OrderQueue([{'order_id': order_id} for order_id in range(5)])
+    assert [order['order_id'] for order in order_queue.drain(2)] == [0, 1]
+    assert [order['order_id'] for order in order_queue.drain(10)] == [2, 3, 4]
+    assert order_queue.drain(3) == []
+    statistics = order_queue.get_statistics()
+    assert (statistics['depth'], statistics['enqueued'], statistics['dequeued'], statistics['high_water_mark']) == (0, 5, 5, 5)
+
+
+def test_full_queue_rejects_a_non_blocking_put():
+    order_queue = OrderQueue(max_size=2)
+    assert order_queue.put({'order_id': 1}, block=False)
+    assert order_queue.put({'order_id': 2}, block=False)
+    assert order_queue.full()
+    assert not order_queue.put({'order_id': 3}, block=False)
+    # A blocking put gives up after its timeout
+    assert not order_queue.put({'order_id': 3}, timeout=0.01)
+    assert len(order_queue) == 2
+    assert order_queue.get_statistics()['enqueued'] == 2
+
+
+def test_blocking_put_is_released_by_the_consumer():
+    order_queue = OrderQueue([{'order_id': 1}], max_size=1)
+    put_results = []
+    producer = threading.Thread(target=lambda: put_results.append(order_queue.put({'order_id': 2}, timeout=5)))
+    producer.start()
+    # The producer waits until the consumer frees a place
+    producer.join(0.05)
+    assert producer.is_alive()
+    assert order_queue.get() == {'order_id': 1}
+    producer.join(5)
+    assert not producer.is_alive()
+    assert put_results == [True]
+    assert order_queue.get() == {'order_id': 2}
+
+
+def test_high_water_mark_keeps_the_deepest_queue():
+    order_queue = OrderQueue()
+    for order_id in range(3):
+        order_queue.put({'order_id': order_id})
+    order_queue.drain()
+    order_queue.put({'order_id': 3})
+    assert order_queue.get_statistics()['high_water_mark'] == 3
+    order_queue.clear()
+    assert order_queue.get_statistics() == {'depth': 0, 'high_water_mark': 0, 'enqueued': 0, 'dequeued': 0, 'max_size': None}
+
+
+def test_put_sets_the_wake_event():
+    wake_event = threading.Event()
+    order_queue = OrderQueue(max_size=1, wake_event=wake_event)
+    assert not wake_event.is_set()
+    order_queue.put({'order_id': 1})
+    assert wake_event.is_set()
+    # A rejected order does not wake up the consumer
+    wake_event.clear()
+    assert not order_queue.put({'order_id': 2}, block=False)
+    assert not wake_event.is_set()
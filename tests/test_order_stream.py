@@ -0,0 +1,69 @@
+import io
+import json
+
+import pytest
+
+from src.core.logic.order_stream import OrderStream, iterate_json_array, iterate_orders
+
+orders = [
+    {'order_id': 1, 'items': [{'item_id': 10}, {'item_id': 11}]},
+    {'order_id': 2, 'items': [{'item_id': 12}], 'arrival_time': 7.5},
+    {'order_id': 3, 'items': []},
+]
+
+
+def write_orders(tmp_path, text, name='orders.json'):
+    '''
+    Write an order file
+
+    :param tmp_path: Directory of the file
+    :param text: Content of the file
+    :param name: Name of the file
+    :return: The path to the file
+    '''
+    order_path = tmp_path / name
+    order_path.write_text(text)
+    return str(order_path)
+
+
+def test_json_lines_skip_blank_lines(tmp_path):
+    order_path = write_orders(tmp_path, '\n\n' + '\n\n'.join(json.dumps(order) for order in orders) + '\n  \n', 'orders.jsonl')
+    order_stream = OrderStream(order_path)
+    assert order_stream.peek() == orders[0]
+    assert list(order_stream) == orders
+    assert not order_stream
+    assert order_stream.file.closed
+
+
+@pytest.mark.parametrize('chunk_size', [1, 7, 65536])
+def test_pretty_printed_array_is_read_in_small_chunks(chunk_size):
+    file = io.StringIO(json.dumps(orders, indent=4))
+    first_line = file.readline()
+    assert list(iterate_json_array(file, first_line, chunk_size=chunk_size)) == orders
+
+
+def test_format_is_detected_from_the_first_character():
+    assert list(iterate_orders(io.StringIO('\n  ' + json.dumps(orders, indent=2)))) == orders
+    assert list(iterate_orders(io.StringIO('\n'.join(json.dumps(order) for order in orders)))) == orders
+
+
+@pytest.mark.parametrize('text', ['[]', '', '\n \n', '[\n  {"order_id": 1, "it', '{"order_id": 1'])
+def test_files_without_complete_orders_are_rejected(tmp_path, text):
+    with pytest.raises(ValueError):
+        OrderStream(write_orders(tmp_path, text))
+
+
+def test_truncated_array_fails_after_the_complete_orders():
+    file = io.StringIO('  {"order_id": 2, "items": []},\n  {"order_id": 3, "items": [')
+    order_iterator = iterate_json_array(file, '[{"order_id": 1, "items": []},\n', chunk_size=8)
+    assert [order['order_id'] for order in [next(order_iterator), next(order_iterator)]] == [1, 2]
+    with pytest.raises(ValueError, match='incomplete'):
+        next(order_iterator)
+
+
+def test_arrival_interval_only_fills_missing_arrival_times(tmp_path):
+    order_path = write_orders(tmp_path, json.dumps(orders))
+    # The arrival time of an order is its position in the file times the interval
+    assert [order.get('arrival_time') for order in OrderStream(order_path, arrival_interval=2.0)] == [0.0, 7.5, 4.0]
+    # Without an interval, orders keep having no arrival time
+    assert [order.get('arrival_time') for order in OrderStream(order_path)] == [None, 7.5, None]
@@ -0,0 +1,25 @@
+import time
+
+import pytest
+
+from src.core.logic.batch_tour_length_calculator import calculate_tour_length
+from src.core.logic.parallel_iterated_local_search import parallel_iterated_local_search, result_grace_period, shutdown_process_pool
+from tests.test_ils_engines import create_instance, get_order_ids, max_batch_size, warehouse_layout_path
+
+
+@pytest.mark.parametrize('ils_engine', ['DICT', 'ARRAY'])
+def test_parallel_iterated_local_search_improves_within_the_time_limit(ils_engine):
+    # Single order batches, which the chains can merge into much shorter tours
+    batches, warehouse_layout = create_instance(0, amount_of_batches=50, orders_per_batch=1)
+    start_tour_length = sum(calculate_tour_length(batch, warehouse_layout) for batch in batches)
+    time_limit = 1.0
+    try:
+        start_time = time.time()
+        improved_batches = parallel_iterated_local_search(batches, max_batch_size, warehouse_layout, warehouse_layout_path, 0.5, 0.5, time_limit, 2, exchange_rounds=2, ils_engine=ils_engine)
+        wall_time = time.time() - start_time
+    finally:
+        shutdown_process_pool()
+
+    assert sorted(order_id for order_ids in get_order_ids(improved_batches) for order_id in order_ids) == sorted(order_id for order_ids in get_order_ids(batches) for order_id in order_ids)
+    assert sum(calculate_tour_length(batch, warehouse_layout) for batch in improved_batches) <= start_tour_length
+    assert wall_time <= time_limit + result_grace_period
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+from src.core.logic.batch_tour_length_calculator import calculate_tour_length, sort_and_transform_batch
+from src.core.logic.routing_strategies import routing_strategies
+
+max_y_position = 9
+
+
+def create_batch(seed, amount_of_items=12, max_x_position=24):
+    '''
+    Create a batch of one order with items at random positions
+
+    :param seed: Seed of the positions
+    :param amount_of_items: Amount of items
+    :param max_x_position: Maximum x-coordinate of the items
+    :return: The batch
+    '''
+    generator = random.Random(seed)
+    items = [
+        {
+            'item_id': item_id,
+            'abs_x_position': generator.randint(1, max_x_position),
+            'abs_y_position': generator.randint(0, max_y_position),
+            'abs_z_position': generator.randint(0, 2),
+        }
+        for item_id in range(amount_of_items)
+    ]
+    return {'orders': [{'order_id': 'order-0', 'items': items}]}
+
+
+def walk_pick_sequence(sorted_batch):
+    '''
+    Walk the pick sequence from the start and back, leaving an aisle at the front or at the back, whichever is shorter
+
+    :param sorted_batch: The items in their pick sequence with the x-coordinates transformed into aisles
+    :return: The walked distance
+    '''
+    distance = 0
+    aisle, y_position = 0, -1
+    for item in sorted_batch:
+        if item['abs_x_position'] == aisle:
+            distance += abs(item['abs_y_position'] - y_position)
+        else:
+            # The front is at y = -1 and the back at y = max_y_position, as in the tour lengths of the routing strategies
+            distance += abs(item['abs_x_position'] - aisle) + min(y_position + item['abs_y_position'] + 2, 2 * max_y_position - y_position - item['abs_y_position'])
+        aisle, y_position = item['abs_x_position'], item['abs_y_position']
+    return distance + aisle + y_position + 1
+
+
+@pytest.mark.parametrize('routing_strategy', list(routing_strategies))
+@pytest.mark.parametrize('seed', range(20))
+def test_pick_sequence_follows_the_tour(routing_strategy, seed):
+    batch = create_batch(seed)
+    warehouse_layout = {'max_x_position': 24, 'max_y_position': max_y_position, 'max_z_position': 2, 'routing_strategy': routing_strategy}
+    sorted_batch = sort_and_transform_batch(batch, warehouse_layout)
+    # Every item is picked exactly once
+    assert sorted(item['item_id'] for item in sorted_batch) == list(range(len(batch['orders'][0]['items'])))
+    # Picking in the sequence never walks further than the tour the tour length is calculated for
+    assert walk_pick_sequence(sorted_batch) <= calculate_tour_length(batch, warehouse_layout)
+
+
+def test_pick_sequence_of_the_routing_strategies():
+    items = [(1, 5), (4, 0), (4, 3), (4, 7), (4, 9), (3, 1), (6, 3), (6, 7)]
+    batch = {'orders': [{'order_id': 'order-0', 'items': [
+        {'item_id': item_id, 'abs_x_position': x_position, 'abs_y_position': y_position, 'abs_z_position': 0}
+        for item_id, (x_position, y_position) in enumerate(items)
+    ]}]}
+    get_positions = lambda routing_strategy: [
+        (item['abs_x_position'], item['abs_y_position'])
+        for item in sort_and_transform_batch(batch, {'max_y_position': max_y_position, 'routing_strategy': routing_strategy})
+    ]
+    assert get_positions('S_SHAPE') == [(1, 5), (2, 9), (2, 7), (2, 3), (2, 1), (2, 0), (3, 3), (3, 7)]
+    assert get_positions('RETURN') == [(1, 5), (2, 0), (2, 1), (2, 3), (2, 7), (2, 9), (3, 3), (3, 7)]
+    # The back half of the aisle in between is picked on the way to the last aisle, the front half on the way back
+    assert get_positions('MIDPOINT') == [(1, 5), (2, 9), (2, 7), (3, 7), (3, 3), (2, 0), (2, 1), (2, 3)]
+    # Entering the aisle in between from the back skips the larger gap
+    assert get_positions('LARGEST_GAP') == [(1, 5), (2, 9), (2, 7), (2, 3), (2, 1), (2, 0), (3, 7), (3, 3)]
@@ -0,0 +1,86 @@
+import pytest
+
+from src.core.logic.clock import SystemClock, VirtualClock, set_clock
+from src.core.logic.picker_dispatcher import PickerDispatcher
+from src.core.logic_controller import is_dispatch_due
+
+
+def create_batch(batch_id, start_time, tour_time):
+    '''
+    Create a batch which has already been routed, as by picker_starts_tour
+
+    :param batch_id: ID of the batch
+    :param start_time: Start time of the tour
+    :param tour_time: Tour time of the batch
+    :return: The batch
+    '''
+    return {'batch_id': batch_id, 'orders': [], 'start_time': start_time, 'arrival_time': start_time + tour_time, 'tour_time': tour_time}
+
+
+def test_available_picker_waiting_longest_is_dispatched_first():
+    picker_dispatcher = PickerDispatcher(3)
+    # With equal waiting times, the picker with the lowest ID is dispatched first
+    first_picker = picker_dispatcher.get_available_picker(0.0)
+    assert first_picker.picker_id == 1
+    picker_dispatcher.start_tour(first_picker, create_batch('batch-1', 0.0, 50.0))
+    second_picker = picker_dispatcher.get_available_picker(0.0)
+    assert second_picker.picker_id == 2
+    picker_dispatcher.start_tour(second_picker, create_batch('batch-2', 0.0, 30.0))
+    picker_dispatcher.start_tour(picker_dispatcher.get_available_picker(0.0), create_batch('batch-3', 0.0, 40.0))
+
+    assert picker_dispatcher.get_available_picker(10.0) is None
+    assert picker_dispatcher.get_picker_states(10.0) == [False, False, False]
+    # Picker 2 returned first at 30 and has been waiting longer than picker 3, which returned at 40
+    assert picker_dispatcher.get_available_picker(45.0).picker_id == 2
+    assert picker_dispatcher.get_picker_states(45.0) == [False, True, True]
+
+
+def test_next_return_time_is_the_earliest_return_of_the_pickers_on_tour():
+    picker_dispatcher = PickerDispatcher(2)
+    assert picker_dispatcher.get_next_return_time(0.0) is None
+    picker_dispatcher.start_tour(picker_dispatcher.pickers[0], create_batch('batch-1', 0.0, 50.0))
+    picker_dispatcher.start_tour(picker_dispatcher.pickers[1], create_batch('batch-2', 10.0, 20.0))
+    assert picker_dispatcher.get_next_return_time(15.0) == 30.0
+    # The returned picker is not on tour anymore
+    assert picker_dispatcher.get_next_return_time(35.0) == 50.0
+    assert picker_dispatcher.get_next_return_time(60.0) is None
+    assert picker_dispatcher.get_last_arrival_time() == 50.0
+
+
+def test_schedule_batches_hands_every_batch_to_the_picker_available_first():
+    picker_dispatcher = PickerDispatcher(2, available_time=5.0)
+    batches = [{'batch_id': f'batch-{index}', 'orders': [], 'tour_time': tour_time} for index, tour_time in enumerate([10.0, 4.0, 3.0, 6.0])]
+    picker_dispatcher.schedule_batches(batches, 8.0)
+    # No tour starts before the current time, every following batch starts when the first picker returns
+    assert [(batch['picker_id'], batch['start_time'], batch['arrival_time']) for batch in batches] == [
+        (1, 8.0, 18.0),
+        (2, 8.0, 12.0),
+        (2, 12.0, 15.0),
+        (2, 15.0, 21.0),
+    ]
+    assert [picker.amount_of_tours for picker in picker_dispatcher.pickers] == [1, 3]
+    assert picker_dispatcher.get_last_arrival_time() == 21.0
+
+
+def test_amount_of_pickers_has_to_be_positive():
+    with pytest.raises(ValueError):
+        PickerDispatcher(0)
+
+
+@pytest.fixture
+def virtual_clock():
+    clock = VirtualClock(20.0)
+    set_clock(clock)
+    yield clock
+    set_clock(SystemClock())
+
+
+def test_dispatch_is_due_only_for_an_available_picker_and_a_released_batch(virtual_clock):
+    picker_dispatcher = PickerDispatcher(2)
+    picker_dispatcher.start_tour(picker_dispatcher.pickers[0], create_batch('batch-1', 0.0, 50.0))
+    # The second picker is available, the background optimization keeps running until the next batch is released
+    assert not is_dispatch_due([{'release_time': 30.0}], picker_dispatcher)
+    assert is_dispatch_due([{'release_time': 30.0}, {'release_time': 10.0}], picker_dispatcher)
+    # With every picker on tour, no batch can be handed out
+    picker_dispatcher.start_tour(picker_dispatcher.pickers[1], create_batch('batch-2', 0.0, 40.0))
+    assert not is_dispatch_due([{'release_time': 10.0}], picker_dispatcher)
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+import src.vars.shared_variables as shared_variables
+from src.core.logic.clock import SystemClock, get_clock
+from src.core.simulator import simulate
+
+order_path = 'tests/data/test_orders.json'
+variables = {
+    'warehouse_layout_path': 'tests/data/warehouse_positions.csv',
+    'max_batch_size': 15,
+    'tour_length_units_per_second': 20,
+    'rearrangement_parameter': 0.5,
+    'threshold_parameter': 0.5,
+    'release_parameter': 0.5,
+    'time_limit': 0.01,
+    'selection_rule': 'FIRST',
+    'routing_strategy': 'S_SHAPE',
+}
+
+
+def create_trace(amount_of_orders):
+    '''
+    Create an order trace out of the first test orders, arriving one second after another
+
+    :param amount_of_orders: Amount of orders
+    :return: List of orders with their arrival time
+    '''
+    with open(order_path, 'r') as file:
+        orders = json.load(file)[:amount_of_orders]
+    for arrival_time, order in enumerate(orders):
+        order['arrival_time'] = float(arrival_time)
+    return orders
+
+
+@pytest.mark.parametrize('amount_of_orders, initial_order_release', [(1, 1), (1, 0), (5, 0), (5, 10)])
+def test_simulate_picks_every_order(amount_of_orders, initial_order_release):
+    results = simulate(create_trace(amount_of_orders), {**variables, 'initial_order_release': initial_order_release})
+    assert len(results['order_completion_times']) == amount_of_orders
+    assert results['makespan'] > 0
+
+
+@pytest.fixture
+def shared_state():
+    saved_variables = dict(shared_variables.variables)
+    shared_variables.variables.clear()
+    shared_variables.variables.update({'routing_strategy': 'RETURN', 'neighborhood_size': 3})
+    shared_variables.picker_states = [True, False]
+    shared_variables.picker_state = True
+    yield
+    shared_variables.variables.clear()
+    shared_variables.variables.update(saved_variables)
+    shared_variables.picker_states = []
+    shared_variables.picker_state = False
+
+
+def test_simulate_restores_the_shared_state(shared_state):
+    shared_variables_dictionary = shared_variables.variables
+    simulate(create_trace(5), {**variables, 'initial_order_release': 2, 'amount_of_pickers': 2})
+    assert shared_variables.variables is shared_variables_dictionary
+    assert shared_variables.variables == {'routing_strategy': 'RETURN', 'neighborhood_size': 3}
+    assert (shared_variables.picker_state, shared_variables.picker_states) == (True, [True, False])
+    assert isinstance(get_clock(), SystemClock)
+
+
+def test_failed_simulation_restores_the_shared_state(shared_state):
+    # The missing selection rule fails after the variables have been stored
+    with pytest.raises(KeyError):
+        simulate(create_trace(2), {key: value for key, value in variables.items() if key != 'selection_rule'})
+    assert shared_variables.variables == {'routing_strategy': 'RETURN', 'neighborhood_size': 3}
+    assert isinstance(get_clock(), SystemClock)
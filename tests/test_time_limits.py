@@ -0,0 +1,38 @@
+import time
+
+import pytest
+
+from src.core.logic.batch_assignment_minimizer import iterated_local_search_array
+from src.core.logic.batch_tour_length_minimizer import iterated_local_search
+from src.core.logic.parallel_iterated_local_search import parallel_iterated_local_search, result_grace_period, shutdown_process_pool
+from tests.test_ils_engines import copy_batches, create_instance, get_order_ids, max_batch_size, warehouse_layout_path
+
+# Time allowed after a deadline for the work between two budget checks, e.g. copying the batches of an iteration
+overrun_allowance = 0.3
+
+
+@pytest.fixture(scope='module')
+def large_instance():
+    # Single order batches of eight copies of the test orders, a single local search phase over them takes several seconds
+    batches, warehouse_layout = create_instance(0, amount_of_batches=50, orders_per_batch=1)
+    return copy_batches(batches, 8), warehouse_layout
+
+
+@pytest.mark.parametrize('ils', [iterated_local_search, iterated_local_search_array])
+def test_iterated_local_search_keeps_the_deadline(ils, large_instance):
+    batches, warehouse_layout = large_instance
+    start_time = time.time()
+    improved_batches = ils(batches, max_batch_size, warehouse_layout, warehouse_layout_path, 0.5, 0.5, 0.3, deadline=start_time + 0.5)
+    assert time.time() - start_time < 0.5 + overrun_allowance
+    assert sorted(order_id for order_ids in get_order_ids(improved_batches) for order_id in order_ids) == sorted(order_id for order_ids in get_order_ids(batches) for order_id in order_ids)
+
+
+@pytest.mark.parametrize('ils_engine', ['DICT', 'ARRAY'])
+def test_parallel_iterated_local_search_keeps_the_time_limit(ils_engine, large_instance):
+    batches, warehouse_layout = large_instance
+    try:
+        start_time = time.time()
+        parallel_iterated_local_search(batches, max_batch_size, warehouse_layout, warehouse_layout_path, 0.5, 0.5, 1.0, 2, ils_engine=ils_engine)
+        assert time.time() - start_time < 1.0 + result_grace_period + overrun_allowance
+    finally:
+        shutdown_process_pool()
@@ -0,0 +1,54 @@
+from src.core.logic.batch_tour_length_calculator import calculate_tour_length
+from src.core.logic.tour_length_cache import TourLengthCache, create_cache_key
+from tests.test_ils_engines import create_instance
+
+
+def test_hits_and_misses_are_counted():
+    batches, warehouse_layout = create_instance(0, amount_of_batches=3)
+    tour_length_cache = TourLengthCache()
+    for batch in batches + batches:
+        assert tour_length_cache.get_tour_length(batch, warehouse_layout) == calculate_tour_length(batch, warehouse_layout)
+    # Batches with the same locations share their tour length, even if their orders are different objects
+    copied_batch = {'orders': [{**order, 'items': list(reversed(order['items']))} for order in batches[0]['orders']]}
+    assert tour_length_cache.get_tour_length(copied_batch, warehouse_layout) == calculate_tour_length(batches[0], warehouse_layout)
+
+    statistics = tour_length_cache.get_statistics()
+    assert (statistics['hits'], statistics['misses'], statistics['evictions'], statistics['size']) == (4, 3, 0, 3)
+    assert statistics['hit_rate'] == 4 / 7
+    tour_length_cache.clear()
+    assert (tour_length_cache.get_statistics()['hits'], tour_length_cache.get_statistics()['size']) == (0, 0)
+
+
+def test_least_recently_used_tour_length_is_evicted():
+    batches, warehouse_layout = create_instance(1, amount_of_batches=3)
+    tour_length_cache = TourLengthCache(max_size=2)
+    tour_length_cache.get_tour_length(batches[0], warehouse_layout)
+    tour_length_cache.get_tour_length(batches[1], warehouse_layout)
+    # Using the first batch again makes the second batch the least recently used one
+    tour_length_cache.get_tour_length(batches[0], warehouse_layout)
+    tour_length_cache.get_tour_length(batches[2], warehouse_layout)
+    assert list(tour_length_cache.tour_lengths) == [create_cache_key(batches[0], warehouse_layout), create_cache_key(batches[2], warehouse_layout)]
+    assert tour_length_cache.get_statistics()['evictions'] == 1
+
+    # The evicted batch is calculated again
+    tour_length_cache.get_tour_length(batches[1], warehouse_layout)
+    statistics = tour_length_cache.get_statistics()
+    assert (statistics['hits'], statistics['misses'], statistics['evictions'], statistics['size']) == (1, 4, 2, 2)
+
+
+def test_changed_layout_or_routing_strategy_is_never_a_stale_hit():
+    batches, warehouse_layout = create_instance(2, amount_of_batches=1)
+    batch = batches[0]
+    tour_length_cache = TourLengthCache()
+    tour_length_cache.get_tour_length(batch, warehouse_layout)
+
+    for changed_layout in [
+        {**warehouse_layout, 'max_y_position': warehouse_layout['max_y_position'] + 10},
+        {**warehouse_layout, 'routing_strategy': 'RETURN'},
+    ]:
+        assert create_cache_key(batch, changed_layout) != create_cache_key(batch, warehouse_layout)
+        assert tour_length_cache.get_tour_length(batch, changed_layout) == calculate_tour_length(batch, changed_layout)
+    # The tour length of the longer aisles differs from the cached one
+    assert tour_length_cache.get_tour_length(batch, {**warehouse_layout, 'max_y_position': warehouse_layout['max_y_position'] + 10}) != tour_length_cache.get_tour_length(batch, warehouse_layout)
+    statistics = tour_length_cache.get_statistics()
+    assert (statistics['hits'], statistics['misses']) == (2, 3)
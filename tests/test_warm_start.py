@@ -0,0 +1,36 @@
+import copy
+
+import pytest
+
+from src.core.logic.batch_selector import order_picking_decision_point_ab_warm_start
+from src.core.logic.batch_tour_length_minimizer import insert_order_at_cheapest_position, local_search_phase
+from src.core.logic.clock import SystemClock, VirtualClock, set_clock
+from tests.test_ils_engines import create_instance, max_batch_size
+
+
+def get_batch_order_ids(batches):
+    '''
+    Get the order IDs of every batch, independent of the order of the batches
+
+    :param batches: A list of batches
+    :return: Set containing a frozenset of the order IDs of every non-empty batch
+    '''
+    return {frozenset(order['order_id'] for order in batch['orders']) for batch in batches if batch['orders']}
+
+
+@pytest.fixture
+def virtual_clock():
+    # A virtual clock far behind the wall-clock time, as in the simulator
+    set_clock(VirtualClock(0.0))
+    yield
+    set_clock(SystemClock())
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_warm_start_local_search_is_bounded_by_wall_clock_time(virtual_clock, seed):
+    batches, warehouse_layout = create_instance(seed)
+    order = batches.pop()['orders'][0]
+    # The local search phase of the warm start ends long before its time limit, so it has to reach the same batches as an unbounded phase
+    expected_batches = local_search_phase(insert_order_at_cheapest_position(copy.deepcopy(batches), copy.deepcopy(order), max_batch_size, warehouse_layout), max_batch_size, warehouse_layout)
+    warm_start_batches = order_picking_decision_point_ab_warm_start(copy.deepcopy(order), copy.deepcopy(batches), max_batch_size, warehouse_layout, None, 5.0, 0.5, 'FIRST')
+    assert get_batch_order_ids(warm_start_batches) == get_batch_order_ids(expected_batches)